@@ -14,10 +14,13 @@ from typing import Dict, List, Any, Optional
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-# Load environment variables
-from dotenv import load_dotenv
-dotenv_path = project_root / '.env'
-load_dotenv(dotenv_path)
+# Load environment variables (skipped when a parent process already loaded .env)
+if not os.getenv('_DOTENV_LOADED'):
+    dotenv_path = os.path.join(str(project_root), '.env')
+    if os.path.isfile(dotenv_path):
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path)
+    os.environ['_DOTENV_LOADED'] = '1'
 
 # Configure logging to stderr ONLY
 logging.basicConfig(
@@ -506,118 +509,125 @@ class HubTools:
 hub_tools = HubTools()
 
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    """List available Hub management tools"""
-    return [
-        types.Tool(
-            name="hub_status",
-            description="Get comprehensive Hub status including all connected Spoke services (Market, Risk, Portfolio) and available tools. Shows operational state and health metrics.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="hub_list_spokes",
-            description="List all Spoke services (Market, Risk, Portfolio) with their health status, endpoints, and availability. Useful for checking which services are online.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="hub_get_spoke_tools",
-            description="Get list of all available tools from Spoke services. Can query all spokes or a specific one (market, risk, portfolio).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "spoke_name": {
-                        "type": "string",
-                        "enum": ["all", "market", "risk", "portfolio"],
-                        "default": "all",
-                        "description": "Spoke to query: 'all' for all spokes, or specific spoke name"
-                    }
+# Tool schemas are static, so build the Tool models once at import time
+_HUB_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="hub_status",
+        description="Get comprehensive Hub status including all connected Spoke services (Market, Risk, Portfolio) and available tools. Shows operational state and health metrics.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="hub_list_spokes",
+        description="List all Spoke services (Market, Risk, Portfolio) with their health status, endpoints, and availability. Useful for checking which services are online.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="hub_get_spoke_tools",
+        description="Get list of all available tools from Spoke services. Can query all spokes or a specific one (market, risk, portfolio).",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "spoke_name": {
+                    "type": "string",
+                    "enum": ["all", "market", "risk", "portfolio"],
+                    "default": "all",
+                    "description": "Spoke to query: 'all' for all spokes, or specific spoke name"
                 }
             }
-        ),
-        types.Tool(
-            name="hub_health_check",
-            description="Perform comprehensive health check on Hub and all Spoke services. Returns health score and identifies any offline or unhealthy services.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="hub_call_spoke_tool",
-            description="Route a tool call to a specific Spoke service. NOTE: For production use, connect directly to the Spoke's MCP server instead (fin-hub-market, fin-hub-risk, fin-hub-portfolio).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "spoke_name": {
-                        "type": "string",
-                        "enum": ["market", "risk", "portfolio"],
-                        "description": "Target Spoke service (market, risk, or portfolio)"
-                    },
-                    "tool_name": {
-                        "type": "string",
-                        "description": "Name of the tool to execute on the Spoke"
-                    },
-                    "tool_arguments": {
-                        "type": "object",
-                        "description": "Arguments to pass to the tool",
-                        "additionalProperties": True
-                    }
+        }
+    ),
+    types.Tool(
+        name="hub_health_check",
+        description="Perform comprehensive health check on Hub and all Spoke services. Returns health score and identifies any offline or unhealthy services.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="hub_call_spoke_tool",
+        description="Route a tool call to a specific Spoke service. NOTE: For production use, connect directly to the Spoke's MCP server instead (fin-hub-market, fin-hub-risk, fin-hub-portfolio).",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "spoke_name": {
+                    "type": "string",
+                    "enum": ["market", "risk", "portfolio"],
+                    "description": "Target Spoke service (market, risk, or portfolio)"
                 },
-                "required": ["spoke_name", "tool_name"]
-            }
-        ),
-        types.Tool(
-            name="hub_unified_dashboard",
-            description="Get unified dashboard with comprehensive overview of all Fin-Hub services, health status, and system recommendations",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="hub_search_tools",
-            description="Search for tools across all spokes by keyword. Find relevant tools for stock analysis, risk assessment, portfolio management, etc.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query (e.g. 'stock', 'risk', 'portfolio', 'backtest', 'crypto')"
-                    }
+                "tool_name": {
+                    "type": "string",
+                    "description": "Name of the tool to execute on the Spoke"
                 },
-                "required": ["query"]
-            }
-        ),
-        types.Tool(
-            name="hub_quick_actions",
-            description="Get ready-to-use quick actions and templates for common financial tasks",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        types.Tool(
-            name="hub_integration_guide",
-            description="Get step-by-step integration guides for common workflows (stock_analysis, portfolio_management, risk_assessment, crypto_tracking)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "use_case": {
-                        "type": "string",
-                        "enum": ["stock_analysis", "portfolio_management", "risk_assessment", "crypto_tracking"],
-                        "description": "Type of workflow guide to retrieve"
-                    }
+                "tool_arguments": {
+                    "type": "object",
+                    "description": "Arguments to pass to the tool",
+                    "additionalProperties": True
+                }
+            },
+            "required": ["spoke_name", "tool_name"]
+        }
+    ),
+    types.Tool(
+        name="hub_unified_dashboard",
+        description="Get unified dashboard with comprehensive overview of all Fin-Hub services, health status, and system recommendations",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="hub_search_tools",
+        description="Search for tools across all spokes by keyword. Find relevant tools for stock analysis, risk assessment, portfolio management, etc.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query (e.g. 'stock', 'risk', 'portfolio', 'backtest', 'crypto')"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    types.Tool(
+        name="hub_quick_actions",
+        description="Get ready-to-use quick actions and templates for common financial tasks",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    types.Tool(
+        name="hub_integration_guide",
+        description="Get step-by-step integration guides for common workflows (stock_analysis, portfolio_management, risk_assessment, crypto_tracking)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "use_case": {
+                    "type": "string",
+                    "enum": ["stock_analysis", "portfolio_management", "risk_assessment", "crypto_tracking"],
+                    "description": "Type of workflow guide to retrieve"
                 }
             }
-        )
-    ]
+        }
+    )
+]
+
+
+@server.list_tools()
+async def handle_list_tools() -> list[types.Tool]:
+    """List available Hub management tools"""
+    return _HUB_TOOLS
+
+
+_VALID_TOOL_NAMES = frozenset(tool.name for tool in _HUB_TOOLS)
 
 
 @server.call_tool()
@@ -628,6 +638,9 @@ async def handle_call_tool(
     arguments = arguments or {}
 
     try:
+        if name not in _VALID_TOOL_NAMES:
+            raise ValueError(f"Unknown tool: {name}")
+
         if name == "hub_status":
             result = await hub_tools.hub_status(arguments)
         elif name == "hub_list_spokes":
@@ -646,8 +659,6 @@ async def handle_call_tool(
             result = await hub_tools.get_quick_actions(arguments)
         elif name == "hub_integration_guide":
             result = await hub_tools.get_integration_guide(arguments)
-        else:
-            raise ValueError(f"Unknown tool: {name}")
 
         return [types.TextContent(
             type="text",
@@ -663,15 +674,6 @@ async def handle_call_tool(
 
 async def main():
     """Run the MCP server"""
-    # Import original stdout/stdin for MCP communication
-    import sys
-    original_stdin = sys.__stdin__
-    original_stdout = sys.__stdout__
-
-    # Temporarily restore stdout for MCP SDK
-    sys.stdin = original_stdin
-    sys.stdout = original_stdout
-
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -688,5 +690,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -30,10 +30,16 @@ if not risk_spoke.exists():
 if not portfolio_spoke.exists():
     sys.stderr.write(f"[ERROR] Portfolio spoke path does not exist: {portfolio_spoke}\n")
 
-# Load environment variables
-if not os.getenv('ENVIRONMENT'):
-    from dotenv import load_dotenv
-    load_dotenv(project_root / '.env')
+# Load environment variables (skipped when a parent process already loaded .env)
+if not os.getenv('ENVIRONMENT') and not os.getenv('_DOTENV_LOADED'):
+    dotenv_path = os.path.join(str(project_root), '.env')
+    if os.path.isfile(dotenv_path):
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path)
+    os.environ['_DOTENV_LOADED'] = '1'
+
+# Include tracebacks in logs and error responses (FIN_HUB_DEBUG=1)
+DEBUG = bool(os.getenv('FIN_HUB_DEBUG'))
 
 # Enhanced logging for monitoring
 import logging
@@ -76,7 +82,14 @@ logger.info("Heavy libraries loaded successfully")
 # MCP imports
 from mcp.server import NotificationOptions, Server
 import mcp.server.stdio
-import mcp.types as types
+from mcp.types import EmbeddedResource, ImageContent, TextContent, Tool
+
+# Optional fast JSON encoder for tool responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Create MCP server
 server = Server("fin-hub-integrated")
@@ -86,8 +99,13 @@ server = Server("fin-hub-integrated")
 # ============================================================================
 
 from typing import Dict, List, Any
-from datetime import datetime
 import asyncio
+import hashlib
+import importlib
+import json
+import time
+import traceback
+from collections import OrderedDict
 
 class HubTools:
     """Hub management and orchestration tools"""
@@ -246,691 +264,723 @@ hub_tools = HubTools()
 # Lazy Loading Tool Instances
 # ============================================================================
 
-_tool_instances = {}
-
-def get_market_tool(tool_name: str):
-    """Get market spoke tool instance (lazy loading)"""
-    if tool_name not in _tool_instances:
-        # Clean up other spokes from sys.path to avoid conflicts
-        for spoke_path in [str(risk_spoke), str(portfolio_spoke)]:
-            while spoke_path in sys.path:
-                sys.path.remove(spoke_path)
-
-        # Add market-spoke to sys.path[0] for import
-        market_spoke_str = str(market_spoke)
-        if market_spoke_str in sys.path:
-            sys.path.remove(market_spoke_str)
-        sys.path.insert(0, market_spoke_str)
-
-        # DEBUG: Log sys.path to diagnose import issues
-        logger.debug(f"sys.path at import time:")
-        for i, path in enumerate(sys.path[:5]):  # First 5 paths
-            logger.debug(f"  [{i}] {path}")
-
-        if tool_name == "unified_market_data":
-            from app.tools.unified_market_data import UnifiedMarketDataTool
-            _tool_instances[tool_name] = UnifiedMarketDataTool()
-        elif tool_name == "stock_quote":
-            from app.tools.unified_market_data import StockQuoteTool
-            _tool_instances[tool_name] = StockQuoteTool()
-        elif tool_name == "crypto_price":
-            from app.tools.unified_market_data import CryptoPriceTool
-            _tool_instances[tool_name] = CryptoPriceTool()
-        elif tool_name == "financial_news":
-            from app.tools.unified_market_data import FinancialNewsTool
-            _tool_instances[tool_name] = FinancialNewsTool()
-        elif tool_name == "economic_indicator":
-            from app.tools.unified_market_data import EconomicIndicatorTool
-            _tool_instances[tool_name] = EconomicIndicatorTool()
-        elif tool_name == "market_overview":
-            from app.tools.unified_market_data import MarketOverviewTool
-            _tool_instances[tool_name] = MarketOverviewTool()
-        elif tool_name == "api_status":
-            from app.tools.unified_market_data import APIStatusTool
-            _tool_instances[tool_name] = APIStatusTool()
-        elif tool_name == "technical_analysis":
-            from app.tools.technical_analysis import TechnicalAnalysisTool
-            _tool_instances[tool_name] = TechnicalAnalysisTool()
-        elif tool_name == "pattern_recognition":
-            from app.tools.pattern_recognition import PatternRecognitionTool
-            _tool_instances[tool_name] = PatternRecognitionTool()
-        elif tool_name == "anomaly_detection":
-            from app.tools.anomaly_detection import AnomalyDetectionTool
-            _tool_instances[tool_name] = AnomalyDetectionTool()
-        elif tool_name == "stock_comparison":
-            from app.tools.stock_comparison import StockComparisonTool
-            _tool_instances[tool_name] = StockComparisonTool()
-        elif tool_name == "sentiment_analysis":
-            from app.tools.sentiment_analysis import SentimentAnalysisTool
-            _tool_instances[tool_name] = SentimentAnalysisTool()
-        elif tool_name == "alert_system":
-            from app.tools.alert_system import AlertSystemTool
-            _tool_instances[tool_name] = AlertSystemTool()
-    return _tool_instances[tool_name]
-
-def get_risk_tool(tool_name: str):
-    """Get risk spoke tool instance (lazy loading)"""
-    if tool_name not in _tool_instances:
-        # Clean up other spokes from sys.path to avoid conflicts
-        for spoke_path in [str(market_spoke), str(portfolio_spoke)]:
-            while spoke_path in sys.path:
-                sys.path.remove(spoke_path)
-
-        # Add risk-spoke to sys.path[0] for import
-        risk_spoke_str = str(risk_spoke)
-        if risk_spoke_str in sys.path:
-            sys.path.remove(risk_spoke_str)
-        sys.path.insert(0, risk_spoke_str)
-
-        if tool_name == "risk_calculate_var":
-            from app.tools.var_calculator import VaRCalculatorTool
-            _tool_instances[tool_name] = VaRCalculatorTool()
-        elif tool_name == "risk_calculate_metrics":
-            from app.tools.risk_metrics import RiskMetricsTool
-            _tool_instances[tool_name] = RiskMetricsTool()
-        elif tool_name == "risk_analyze_portfolio":
-            from app.tools.portfolio_risk import PortfolioRiskTool
-            _tool_instances[tool_name] = PortfolioRiskTool()
-        elif tool_name == "risk_stress_test":
-            from app.tools.stress_testing import StressTestingTool
-            _tool_instances[tool_name] = StressTestingTool()
-        elif tool_name == "risk_analyze_tail_risk":
-            from app.tools.tail_risk import TailRiskTool
-            _tool_instances[tool_name] = TailRiskTool()
-        elif tool_name == "risk_calculate_greeks":
-            from app.tools.greeks_calculator import GreeksCalculatorTool
-            _tool_instances[tool_name] = GreeksCalculatorTool()
-        elif tool_name == "risk_check_compliance":
-            from app.tools.compliance_checker import ComplianceCheckerTool
-            _tool_instances[tool_name] = ComplianceCheckerTool()
-        elif tool_name == "risk_generate_dashboard":
-            from app.tools.risk_dashboard import RiskDashboardTool
-            _tool_instances[tool_name] = RiskDashboardTool()
-    return _tool_instances[tool_name]
-
-def get_portfolio_tool(tool_name: str):
-    """Get portfolio spoke tool instance (lazy loading)"""
-    if tool_name not in _tool_instances:
-        # Clean up other spokes from sys.path to avoid conflicts
-        for spoke_path in [str(market_spoke), str(risk_spoke)]:
-            while spoke_path in sys.path:
-                sys.path.remove(spoke_path)
-
-        # Add portfolio-spoke to sys.path[0] for import
-        portfolio_spoke_str = str(portfolio_spoke)
-        if portfolio_spoke_str in sys.path:
-            sys.path.remove(portfolio_spoke_str)
-        sys.path.insert(0, portfolio_spoke_str)
-
-        # DEBUG: Log sys.path
-        logger.debug(f"[Portfolio] sys.path at import time:")
-        for i, path in enumerate(sys.path[:5]):
-            logger.debug(f"  [{i}] {path}")
-
-        if tool_name == "portfolio_optimize":
-            from app.tools.portfolio_optimizer import portfolio_optimizer
-            _tool_instances[tool_name] = portfolio_optimizer
-        elif tool_name == "portfolio_rebalance":
-            from app.tools.portfolio_rebalancer import portfolio_rebalancer
-            _tool_instances[tool_name] = portfolio_rebalancer
-        elif tool_name == "portfolio_analyze_performance":
-            from app.tools.performance_analyzer import performance_analyzer
-            _tool_instances[tool_name] = performance_analyzer
-        elif tool_name == "portfolio_backtest":
-            from app.tools.backtester import backtester
-            _tool_instances[tool_name] = backtester
-        elif tool_name == "portfolio_analyze_factors":
-            from app.tools.factor_analyzer import factor_analyzer
-            _tool_instances[tool_name] = factor_analyzer
-        elif tool_name == "portfolio_allocate_assets":
-            from app.tools.asset_allocator import asset_allocator
-            _tool_instances[tool_name] = asset_allocator
-        elif tool_name == "portfolio_optimize_tax":
-            from app.tools.tax_optimizer import tax_optimizer
-            _tool_instances[tool_name] = tax_optimizer
-        elif tool_name == "portfolio_generate_dashboard":
-            from app.tools.portfolio_dashboard import portfolio_dashboard
-            _tool_instances[tool_name] = portfolio_dashboard
-    return _tool_instances[tool_name]
+# MCP tool name -> (spoke, module path, attribute). Market and Risk tools are
+# classes exposing ``execute(arguments)``; Portfolio tools are async functions
+# that take the arguments as keyword parameters.
+_TOOL_REGISTRY: Dict[str, tuple] = {
+    # Market Spoke Tools (13)
+    "unified_market_data": ("market", "app.tools.unified_market_data", "UnifiedMarketDataTool"),
+    "stock_quote": ("market", "app.tools.unified_market_data", "StockQuoteTool"),
+    "crypto_price": ("market", "app.tools.unified_market_data", "CryptoPriceTool"),
+    "financial_news": ("market", "app.tools.unified_market_data", "FinancialNewsTool"),
+    "economic_indicator": ("market", "app.tools.unified_market_data", "EconomicIndicatorTool"),
+    "market_overview": ("market", "app.tools.unified_market_data", "MarketOverviewTool"),
+    "api_status": ("market", "app.tools.unified_market_data", "APIStatusTool"),
+    "technical_analysis": ("market", "app.tools.technical_analysis", "TechnicalAnalysisTool"),
+    "pattern_recognition": ("market", "app.tools.pattern_recognition", "PatternRecognitionTool"),
+    "anomaly_detection": ("market", "app.tools.anomaly_detection", "AnomalyDetectionTool"),
+    "stock_comparison": ("market", "app.tools.stock_comparison", "StockComparisonTool"),
+    "sentiment_analysis": ("market", "app.tools.sentiment_analysis", "SentimentAnalysisTool"),
+    "alert_system": ("market", "app.tools.alert_system", "AlertSystemTool"),
+
+    # Risk Spoke Tools (8)
+    "risk_calculate_var": ("risk", "app.tools.var_calculator", "VaRCalculatorTool"),
+    "risk_calculate_metrics": ("risk", "app.tools.risk_metrics", "RiskMetricsTool"),
+    "risk_analyze_portfolio": ("risk", "app.tools.portfolio_risk", "PortfolioRiskTool"),
+    "risk_stress_test": ("risk", "app.tools.stress_testing", "StressTestingTool"),
+    "risk_analyze_tail_risk": ("risk", "app.tools.tail_risk", "TailRiskTool"),
+    "risk_calculate_greeks": ("risk", "app.tools.greeks_calculator", "GreeksCalculatorTool"),
+    "risk_check_compliance": ("risk", "app.tools.compliance_checker", "ComplianceCheckerTool"),
+    "risk_generate_dashboard": ("risk", "app.tools.risk_dashboard", "RiskDashboardTool"),
+
+    # Portfolio Spoke Tools (8)
+    "portfolio_optimize": ("portfolio", "app.tools.portfolio_optimizer", "portfolio_optimizer"),
+    "portfolio_rebalance": ("portfolio", "app.tools.portfolio_rebalancer", "portfolio_rebalancer"),
+    "portfolio_analyze_performance": ("portfolio", "app.tools.performance_analyzer", "performance_analyzer"),
+    "portfolio_backtest": ("portfolio", "app.tools.backtester", "backtester"),
+    "portfolio_analyze_factors": ("portfolio", "app.tools.factor_analyzer", "factor_analyzer"),
+    "portfolio_allocate_assets": ("portfolio", "app.tools.asset_allocator", "asset_allocator"),
+    "portfolio_optimize_tax": ("portfolio", "app.tools.tax_optimizer", "tax_optimizer"),
+    "portfolio_generate_dashboard": ("portfolio", "app.tools.portfolio_dashboard", "portfolio_dashboard"),
+}
+
+_SPOKE_PATHS = {
+    "market": str(market_spoke),
+    "risk": str(risk_spoke),
+    "portfolio": str(portfolio_spoke),
+}
+
+# Hub Management Tools (5)
+_HUB_HANDLERS = {
+    "hub_status": hub_tools.hub_status,
+    "hub_register_spoke": hub_tools.register_spoke,
+    "hub_unregister_spoke": hub_tools.unregister_spoke,
+    "hub_list_all_tools": hub_tools.list_all_tools,
+    "hub_search_tools": hub_tools.search_tools,
+}
+
+def _activate_spoke(spoke: str):
+    """Put the spoke directory at sys.path[0] and remove the other spokes to avoid conflicts"""
+    for spoke_path in _SPOKE_PATHS.values():
+        while spoke_path in sys.path:
+            sys.path.remove(spoke_path)
+    sys.path.insert(0, _SPOKE_PATHS[spoke])
+
+def _make_resolver(spoke: str, module_path: str, attr: str):
+    """Bind a spoke tool to a zero-arg getter returning its async ``run(arguments)`` callable"""
+    run = None
+
+    def resolve():
+        nonlocal run
+        if run is None:
+            _activate_spoke(spoke)
+
+            # DEBUG: Log sys.path to diagnose import issues
+            logger.debug(f"[{spoke}] sys.path at import time:")
+            for i, path in enumerate(sys.path[:5]):  # First 5 paths
+                logger.debug(f"  [{i}] {path}")
+
+            target = getattr(importlib.import_module(module_path), attr)
+            if isinstance(target, type):
+                # Market/Risk tools are classes exposing execute(arguments)
+                run = target().execute
+            else:
+                # Portfolio tools are functions taking the arguments as keywords
+                def run(arguments):
+                    return target(**arguments)
+        return run
+
+    return resolve
+
+def _make_hub_resolver(handler):
+    """Hub tools are bound methods that are always loaded"""
+    return lambda: handler
+
+# Tool name -> zero-arg resolver, specialized once so dispatch is a single lookup
+_TOOL_RESOLVERS = {
+    name: _make_resolver(*spec) for name, spec in _TOOL_REGISTRY.items()
+}
+_TOOL_RESOLVERS.update(
+    (name, _make_hub_resolver(handler)) for name, handler in _HUB_HANDLERS.items()
+)
+
+# Heavy third-party modules shared across spokes. The spoke ``app`` packages
+# all share one name and must stay lazily imported per spoke, but these can be
+# warmed in a background thread while the MCP handshake is still idle.
+_PREWARM_MODULES = (
+    "scipy.stats",
+    "scipy.signal",
+    "scipy.optimize",
+    "scipy.linalg",
+    "scipy.cluster.hierarchy",
+    "scipy.spatial.distance",
+    "sklearn.covariance",
+    "numba",
+)
+
+def _prewarm_modules():
+    """Import shared heavy dependencies ahead of the first tool call"""
+    start = time.time()
+    for module_name in _PREWARM_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            logger.debug(f"Prewarm skipped, {module_name} not installed")
+    logger.info(f"Prewarmed shared modules in {time.time() - start:.3f}s")
+
+# The event loop only holds weak references to tasks, so fire-and-forget
+# tasks are kept here until they finish
+_BACKGROUND_TASKS: set = set()
+
+def _on_background_task_done(task: asyncio.Task):
+    """Release a finished background task and surface its failure, if any"""
+    _BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background task failed: {task.exception()!r}")
+
+def _start_background_task(coro) -> asyncio.Task:
+    """Schedule coro without awaiting it, keeping the task alive until done"""
+    task = asyncio.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_on_background_task_done)
+    return task
+
+def _dumps(obj) -> str:
+    """Serialize a tool response as compact JSON (clients parse it, no need to pretty-print)"""
+    if ORJSON_AVAILABLE:
+        try:
+            # numpy scalars and arrays are encoded natively rather than failing
+            # over to the much slower stdlib path
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass  # e.g. non-str keys: fall back to the stdlib encoder
+    return json.dumps(obj, separators=(",", ":"))
+
+def _wrap_text(text: str) -> list[TextContent]:
+    """Wrap already-serialized JSON as the tool response, skipping pydantic validation"""
+    return [TextContent.model_construct(type="text", text=text)]
+
+# ============================================================================
+# Result Cache
+# ============================================================================
+
+# Deterministic tools whose responses may be memoized, with their TTL in
+# seconds. They still read market data up to "today", so entries expire.
+_CACHEABLE_TOOL_TTL = {
+    "portfolio_optimize": 300,
+    "portfolio_backtest": 300,
+    "portfolio_analyze_performance": 300,
+    "portfolio_analyze_factors": 300,
+    "portfolio_allocate_assets": 300,
+}
+_RESULT_CACHE_MAX_SIZE = 256
+
+# (tool name, argument digest) -> (monotonic timestamp, serialized response)
+_RESULT_CACHE: "OrderedDict[tuple[str, bytes], tuple[float, str]]" = OrderedDict()
+
+# Shared stand-in for calls without arguments; tools only read it, never mutate
+_EMPTY_ARGS: dict = {}
 
 # ============================================================================
 # MCP Server Handlers
 # ============================================================================
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    """List all available tools (Market 13 + Risk 8 + Portfolio 8 + Hub 5 = 34 tools)"""
-    return [
-        # === MARKET SPOKE TOOLS (13) ===
-        types.Tool(
-            name="unified_market_data",
-            description="[MARKET] Get comprehensive market data from multiple sources with automatic fallback",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query_type": {
-                        "type": "string",
-                        "enum": ["stock_quote", "crypto_price", "news", "economic", "overview"],
-                        "description": "Type of market data"
-                    },
-                    "symbol": {"type": "string", "description": "Stock/crypto symbol"},
-                    "query": {"type": "string", "description": "Search query for news"},
-                    "indicator": {"type": "string", "description": "Economic indicator code"}
-                },
-                "required": ["query_type"]
-            }
-        ),
-        types.Tool(
-            name="stock_quote",
-            description="[MARKET] Get real-time stock quote data",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string", "description": "Stock ticker (e.g., AAPL)"}
-                },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="crypto_price",
-            description="[MARKET] Get cryptocurrency price data",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string", "description": "Crypto symbol (e.g., BTC)"}
-                },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="financial_news",
-            description="[MARKET] Get latest financial news",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "News search query"},
-                    "limit": {"type": "integer", "description": "Number of articles (default: 10)"}
-                },
-                "required": ["query"]
-            }
-        ),
-        types.Tool(
-            name="economic_indicator",
-            description="[MARKET] Get economic indicators from FRED",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "series_id": {"type": "string", "description": "FRED series ID (e.g., GDP)"},
-                    "limit": {"type": "integer", "description": "Number of observations"}
-                },
-                "required": ["series_id"]
-            }
-        ),
-        types.Tool(
-            name="market_overview",
-            description="[MARKET] Get comprehensive market overview",
-            inputSchema={"type": "object", "properties": {}}
-        ),
-        types.Tool(
-            name="api_status",
-            description="[MARKET] Get status of all configured financial APIs",
-            inputSchema={"type": "object", "properties": {}}
-        ),
-        types.Tool(
-            name="technical_analysis",
-            description="[MARKET] Technical analysis with indicators (SMA, RSI, MACD, Bollinger Bands)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string", "description": "Stock symbol"},
-                    "period": {"type": "integer", "description": "Analysis period in days"},
-                    "indicators": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Indicators to calculate"
-                    }
+# Schema fragments shared by several tools, built once and referenced by identity
+_STRING_SCHEMA = {"type": "string"}
+_INTEGER_SCHEMA = {"type": "integer"}
+_NUMBER_SCHEMA = {"type": "number"}
+_ARRAY_SCHEMA = {"type": "array"}
+_START_DATE_SCHEMA = {"type": "string", "description": "Start date YYYY-MM-DD (optional)"}
+_END_DATE_SCHEMA = {"type": "string", "description": "End date YYYY-MM-DD (optional)"}
+_BENCHMARK_SCHEMA = {"type": "string", "description": "Benchmark symbol (default: SPY)"}
+
+# Tool schemas are static, so build the Tool models once at import time
+# instead of re-validating every schema on each list_tools request.
+# Market 13 + Risk 8 + Portfolio 8 + Hub 5 = 34 tools
+_TOOLS_LIST: list[Tool] = [
+    # === MARKET SPOKE TOOLS (13) ===
+    Tool(
+        name="unified_market_data",
+        description="[MARKET] Get comprehensive market data from multiple sources with automatic fallback",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query_type": {
+                    "type": "string",
+                    "enum": ["stock_quote", "crypto_price", "news", "economic", "overview"],
+                    "description": "Type of market data"
                 },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="pattern_recognition",
-            description="[MARKET] Recognize chart patterns (head and shoulders, double top/bottom, triangles)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "period": {"type": "integer"}
-                },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="anomaly_detection",
-            description="[MARKET] Detect price/volume anomalies",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "period": {"type": "integer"},
-                    "sensitivity": {"type": "string", "enum": ["low", "medium", "high"]}
-                },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="stock_comparison",
-            description="[MARKET] Compare multiple stocks",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbols": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "period": {"type": "integer"},
-                    "metrics": {"type": "array", "items": {"type": "string"}}
+                "symbol": {"type": "string", "description": "Stock/crypto symbol"},
+                "query": {"type": "string", "description": "Search query for news"},
+                "indicator": {"type": "string", "description": "Economic indicator code"}
+            },
+            "required": ["query_type"]
+        }
+    ),
+    Tool(
+        name="stock_quote",
+        description="[MARKET] Get real-time stock quote data",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string", "description": "Stock ticker (e.g., AAPL)"}
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="crypto_price",
+        description="[MARKET] Get cryptocurrency price data",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string", "description": "Crypto symbol (e.g., BTC)"}
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="financial_news",
+        description="[MARKET] Get latest financial news",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "News search query"},
+                "limit": {"type": "integer", "description": "Number of articles (default: 10)"}
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="economic_indicator",
+        description="[MARKET] Get economic indicators from FRED",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "series_id": {"type": "string", "description": "FRED series ID (e.g., GDP)"},
+                "limit": {"type": "integer", "description": "Number of observations"}
+            },
+            "required": ["series_id"]
+        }
+    ),
+    Tool(
+        name="market_overview",
+        description="[MARKET] Get comprehensive market overview",
+        inputSchema={"type": "object", "properties": {}}
+    ),
+    Tool(
+        name="api_status",
+        description="[MARKET] Get status of all configured financial APIs",
+        inputSchema={"type": "object", "properties": {}}
+    ),
+    Tool(
+        name="technical_analysis",
+        description="[MARKET] Technical analysis with indicators (SMA, RSI, MACD, Bollinger Bands)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string", "description": "Stock symbol"},
+                "period": {"type": "integer", "description": "Analysis period in days"},
+                "indicators": {
+                    "type": "array",
+                    "items": _STRING_SCHEMA,
+                    "description": "Indicators to calculate"
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="pattern_recognition",
+        description="[MARKET] Recognize chart patterns (head and shoulders, double top/bottom, triangles)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": _STRING_SCHEMA,
+                "period": _INTEGER_SCHEMA
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="anomaly_detection",
+        description="[MARKET] Detect price/volume anomalies",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": _STRING_SCHEMA,
+                "period": _INTEGER_SCHEMA,
+                "sensitivity": {"type": "string", "enum": ["low", "medium", "high"]}
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="stock_comparison",
+        description="[MARKET] Compare multiple stocks",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbols": {
+                    "type": "array",
+                    "items": _STRING_SCHEMA
                 },
-                "required": ["symbols"]
-            }
-        ),
-        types.Tool(
-            name="sentiment_analysis",
-            description="[MARKET] Analyze news sentiment for stocks",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "days": {"type": "integer"}
+                "period": _INTEGER_SCHEMA,
+                "metrics": {"type": "array", "items": _STRING_SCHEMA}
+            },
+            "required": ["symbols"]
+        }
+    ),
+    Tool(
+        name="sentiment_analysis",
+        description="[MARKET] Analyze news sentiment for stocks",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": _STRING_SCHEMA,
+                "days": _INTEGER_SCHEMA
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="alert_system",
+        description="[MARKET] Monitor stocks and create alerts",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": _STRING_SCHEMA,
+                "alert_type": {
+                    "type": "string",
+                    "enum": ["price_target", "percent_change", "volume_spike", "breakout"]
+                }
+            },
+            "required": ["symbol", "alert_type"]
+        }
+    ),
+
+    # === RISK SPOKE TOOLS (8) ===
+    Tool(
+        name="risk_calculate_var",
+        description="[RISK] Calculate Value at Risk using Historical, Parametric, or Monte Carlo methods",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": _STRING_SCHEMA,
+                "method": {
+                    "type": "string",
+                    "enum": ["historical", "parametric", "monte_carlo", "all"]
                 },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="alert_system",
-            description="[MARKET] Monitor stocks and create alerts",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "alert_type": {
-                        "type": "string",
-                        "enum": ["price_target", "percent_change", "volume_spike", "breakout"]
-                    }
+                "confidence_level": _NUMBER_SCHEMA,
+                "time_horizon": _INTEGER_SCHEMA,
+                "portfolio_value": _NUMBER_SCHEMA,
+                "period": _INTEGER_SCHEMA,
+                "simulations": _INTEGER_SCHEMA
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="risk_calculate_metrics",
+        description="[RISK] Calculate comprehensive risk metrics (volatility, beta, Sharpe ratio, etc.)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": _STRING_SCHEMA,
+                "period": _INTEGER_SCHEMA,
+                "benchmark": _STRING_SCHEMA
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="risk_analyze_portfolio",
+        description="[RISK] Analyze portfolio risk and diversification",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "portfolio": {
+                    "type": "array",
+                    "items": {"type": "object"}
                 },
-                "required": ["symbol", "alert_type"]
+                "portfolios": {
+                    "type": "array",
+                    "items": {"type": "array", "items": {"type": "object"}}
+                }
+            },
+            "anyOf": [{"required": ["portfolio"]}, {"required": ["portfolios"]}]
+        }
+    ),
+    Tool(
+        name="risk_stress_test",
+        description="[RISK] Perform stress testing on portfolio",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "portfolio": _ARRAY_SCHEMA,
+                "scenarios": _ARRAY_SCHEMA
+            },
+            "required": ["portfolio"]
+        }
+    ),
+    Tool(
+        name="risk_analyze_tail_risk",
+        description="[RISK] Analyze tail risk and extreme events",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": _STRING_SCHEMA,
+                "period": _INTEGER_SCHEMA
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="risk_calculate_greeks",
+        description="[RISK] Calculate option Greeks (Delta, Gamma, Vega, Theta, Rho)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": _STRING_SCHEMA,
+                "option_type": {"type": "string", "enum": ["call", "put", "both"]},
+                "strike": _NUMBER_SCHEMA,
+                "expiry_days": _INTEGER_SCHEMA
+            },
+            "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="risk_check_compliance",
+        description="[RISK] Check regulatory compliance (sanctions, position limits)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "entity_name": _STRING_SCHEMA,
+                "portfolio": _ARRAY_SCHEMA
             }
-        ),
-
-        # === RISK SPOKE TOOLS (8) ===
-        types.Tool(
-            name="risk_calculate_var",
-            description="[RISK] Calculate Value at Risk using Historical, Parametric, or Monte Carlo methods",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "method": {
-                        "type": "string",
-                        "enum": ["historical", "parametric", "monte_carlo", "all"]
-                    },
-                    "confidence_level": {"type": "number"},
-                    "portfolio_value": {"type": "number"}
-                },
-                "required": ["symbol"]
+        }
+    ),
+    Tool(
+        name="risk_generate_dashboard",
+        description="[RISK] Generate comprehensive risk dashboard",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": _STRING_SCHEMA,
+                "portfolio": _ARRAY_SCHEMA
             }
-        ),
-        types.Tool(
-            name="risk_calculate_metrics",
-            description="[RISK] Calculate comprehensive risk metrics (volatility, beta, Sharpe ratio, etc.)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "period": {"type": "integer"},
-                    "benchmark": {"type": "string"}
+        }
+    ),
+
+    # === PORTFOLIO SPOKE TOOLS (8) ===
+    Tool(
+        name="portfolio_optimize",
+        description="[PORTFOLIO] Optimize portfolio allocation (maximize Sharpe ratio, minimize variance)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tickers": {"type": "array", "items": _STRING_SCHEMA},
+                "method": {
+                    "type": "string",
+                    "enum": ["max_sharpe", "min_variance", "risk_parity", "equal_weight"]
+                }
+            },
+            "required": ["tickers"]
+        }
+    ),
+    Tool(
+        name="portfolio_rebalance",
+        description="[PORTFOLIO] Generate portfolio rebalancing recommendations",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "current_positions": {
+                    "type": "object",
+                    "description": "Current positions {symbol: {shares, price, value}}"
                 },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="risk_analyze_portfolio",
-            description="[RISK] Analyze portfolio risk and diversification",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "portfolio": {
-                        "type": "array",
-                        "items": {"type": "object"}
-                    }
+                "target_weights": {
+                    "type": "object",
+                    "description": "Target weights {symbol: weight}"
                 },
-                "required": ["portfolio"]
-            }
-        ),
-        types.Tool(
-            name="risk_stress_test",
-            description="[RISK] Perform stress testing on portfolio",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "portfolio": {"type": "array"},
-                    "scenarios": {"type": "array"}
+                "total_value": {
+                    "type": "number",
+                    "description": "Total portfolio value"
                 },
-                "required": ["portfolio"]
-            }
-        ),
-        types.Tool(
-            name="risk_analyze_tail_risk",
-            description="[RISK] Analyze tail risk and extreme events",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "period": {"type": "integer"}
+                "cash_available": {
+                    "type": "number",
+                    "description": "Available cash (default: 0.0)"
                 },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="risk_calculate_greeks",
-            description="[RISK] Calculate option Greeks (Delta, Gamma, Vega, Theta, Rho)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "option_type": {"type": "string", "enum": ["call", "put", "both"]},
-                    "strike": {"type": "number"},
-                    "expiry_days": {"type": "integer"}
+                "strategy": {
+                    "type": "string",
+                    "description": "Rebalancing strategy (default: threshold)"
                 },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="risk_check_compliance",
-            description="[RISK] Check regulatory compliance (sanctions, position limits)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "entity_name": {"type": "string"},
-                    "portfolio": {"type": "array"}
-                }
-            }
-        ),
-        types.Tool(
-            name="risk_generate_dashboard",
-            description="[RISK] Generate comprehensive risk dashboard",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {"type": "string"},
-                    "portfolio": {"type": "array"}
+                "threshold": {
+                    "type": "number",
+                    "description": "Rebalancing threshold (default: 0.05)"
                 }
-            }
-        ),
-
-        # === PORTFOLIO SPOKE TOOLS (8) ===
-        types.Tool(
-            name="portfolio_optimize",
-            description="[PORTFOLIO] Optimize portfolio allocation (maximize Sharpe ratio, minimize variance)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "tickers": {"type": "array", "items": {"type": "string"}},
-                    "method": {
-                        "type": "string",
-                        "enum": ["max_sharpe", "min_variance", "risk_parity", "equal_weight"]
-                    }
+            },
+            "required": ["current_positions", "target_weights", "total_value"]
+        }
+    ),
+    Tool(
+        name="portfolio_analyze_performance",
+        description="[PORTFOLIO] Analyze portfolio performance metrics",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "positions": {
+                    "type": "object",
+                    "description": "Positions {symbol: {shares, cost_basis, current_price}}"
                 },
-                "required": ["tickers"]
-            }
-        ),
-        types.Tool(
-            name="portfolio_rebalance",
-            description="[PORTFOLIO] Generate portfolio rebalancing recommendations",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "current_positions": {
-                        "type": "object",
-                        "description": "Current positions {symbol: {shares, price, value}}"
-                    },
-                    "target_weights": {
-                        "type": "object",
-                        "description": "Target weights {symbol: weight}"
-                    },
-                    "total_value": {
-                        "type": "number",
-                        "description": "Total portfolio value"
-                    },
-                    "cash_available": {
-                        "type": "number",
-                        "description": "Available cash (default: 0.0)"
-                    },
-                    "strategy": {
-                        "type": "string",
-                        "description": "Rebalancing strategy (default: threshold)"
-                    },
-                    "threshold": {
-                        "type": "number",
-                        "description": "Rebalancing threshold (default: 0.05)"
-                    }
+                "transactions": {
+                    "type": "array",
+                    "description": "Transaction history (optional)"
                 },
-                "required": ["current_positions", "target_weights", "total_value"]
-            }
-        ),
-        types.Tool(
-            name="portfolio_analyze_performance",
-            description="[PORTFOLIO] Analyze portfolio performance metrics",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "positions": {
-                        "type": "object",
-                        "description": "Positions {symbol: {shares, cost_basis, current_price}}"
-                    },
-                    "transactions": {
-                        "type": "array",
-                        "description": "Transaction history (optional)"
-                    },
-                    "benchmark": {
-                        "type": "string",
-                        "description": "Benchmark symbol (default: SPY)"
-                    },
-                    "start_date": {
-                        "type": "string",
-                        "description": "Start date YYYY-MM-DD (optional)"
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "End date YYYY-MM-DD (optional)"
-                    }
+                "benchmark": _BENCHMARK_SCHEMA,
+                "start_date": _START_DATE_SCHEMA,
+                "end_date": _END_DATE_SCHEMA
+            },
+            "required": ["positions"]
+        }
+    ),
+    Tool(
+        name="portfolio_backtest",
+        description="[PORTFOLIO] Backtest portfolio strategies",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "strategy": _STRING_SCHEMA,
+                "start_date": _STRING_SCHEMA,
+                "end_date": _STRING_SCHEMA,
+                "initial_capital": _NUMBER_SCHEMA
+            },
+            "required": ["strategy"]
+        }
+    ),
+    Tool(
+        name="portfolio_analyze_factors",
+        description="[PORTFOLIO] Analyze factor exposures (Fama-French, momentum, value)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "positions": {
+                    "type": "object",
+                    "description": "Positions {symbol: weight}"
                 },
-                "required": ["positions"]
-            }
-        ),
-        types.Tool(
-            name="portfolio_backtest",
-            description="[PORTFOLIO] Backtest portfolio strategies",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "strategy": {"type": "string"},
-                    "start_date": {"type": "string"},
-                    "end_date": {"type": "string"},
-                    "initial_capital": {"type": "number"}
+                "factors": {
+                    "type": "array",
+                    "description": "Factors to analyze (default: market, size, value, momentum, quality)",
+                    "items": _STRING_SCHEMA
                 },
-                "required": ["strategy"]
-            }
-        ),
-        types.Tool(
-            name="portfolio_analyze_factors",
-            description="[PORTFOLIO] Analyze factor exposures (Fama-French, momentum, value)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "positions": {
-                        "type": "object",
-                        "description": "Positions {symbol: weight}"
-                    },
-                    "factors": {
-                        "type": "array",
-                        "description": "Factors to analyze (default: market, size, value, momentum, quality)",
-                        "items": {"type": "string"}
-                    },
-                    "start_date": {
-                        "type": "string",
-                        "description": "Start date YYYY-MM-DD (optional)"
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "End date YYYY-MM-DD (optional)"
-                    },
-                    "benchmark": {
-                        "type": "string",
-                        "description": "Benchmark symbol (default: SPY)"
-                    }
+                "start_date": _START_DATE_SCHEMA,
+                "end_date": _END_DATE_SCHEMA,
+                "benchmark": _BENCHMARK_SCHEMA
+            },
+            "required": ["positions"]
+        }
+    ),
+    Tool(
+        name="portfolio_allocate_assets",
+        description="[PORTFOLIO] Strategic asset allocation",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "asset_classes": {
+                    "type": "object",
+                    "description": "Asset classes {class_name: [symbols]}"
                 },
-                "required": ["positions"]
-            }
-        ),
-        types.Tool(
-            name="portfolio_allocate_assets",
-            description="[PORTFOLIO] Strategic asset allocation",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "asset_classes": {
-                        "type": "object",
-                        "description": "Asset classes {class_name: [symbols]}"
-                    },
-                    "allocation_type": {
-                        "type": "string",
-                        "description": "Allocation type: strategic or tactical (default: strategic)"
-                    },
-                    "risk_tolerance": {
-                        "type": "string",
-                        "enum": ["conservative", "moderate", "aggressive"],
-                        "description": "Risk tolerance level (default: moderate)"
-                    },
-                    "constraints": {
-                        "type": "object",
-                        "description": "Allocation constraints (optional)"
-                    },
-                    "rebalancing_threshold": {
-                        "type": "number",
-                        "description": "Rebalancing threshold (default: 0.05)"
-                    }
+                "allocation_type": {
+                    "type": "string",
+                    "description": "Allocation type: strategic or tactical (default: strategic)"
                 },
-                "required": ["asset_classes"]
-            }
-        ),
-        types.Tool(
-            name="portfolio_optimize_tax",
-            description="[PORTFOLIO] Tax-loss harvesting and optimization",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "positions": {
-                        "type": "object",
-                        "description": "Positions {symbol: {shares, cost_basis, purchase_date}}"
-                    },
-                    "transactions": {
-                        "type": "array",
-                        "description": "Transaction history",
-                        "items": {"type": "object"}
-                    },
-                    "tax_bracket": {
-                        "type": "number",
-                        "description": "Tax bracket rate (default: 0.24)"
-                    },
-                    "ltcg_rate": {
-                        "type": "number",
-                        "description": "Long-term capital gains rate (default: 0.15)"
-                    },
-                    "current_date": {
-                        "type": "string",
-                        "description": "Current date YYYY-MM-DD (optional)"
-                    }
+                "risk_tolerance": {
+                    "type": "string",
+                    "enum": ["conservative", "moderate", "aggressive"],
+                    "description": "Risk tolerance level (default: moderate)"
                 },
-                "required": ["positions", "transactions"]
-            }
-        ),
-        types.Tool(
-            name="portfolio_generate_dashboard",
-            description="[PORTFOLIO] Generate comprehensive portfolio dashboard",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "portfolio": {"type": "array"}
+                "constraints": {
+                    "type": "object",
+                    "description": "Allocation constraints (optional)"
                 },
-                "required": ["portfolio"]
-            }
-        ),
-
-        # === HUB MANAGEMENT TOOLS (5) ===
-        types.Tool(
-            name="hub_status",
-            description="[HUB] Get comprehensive Hub status including builtin and external spokes",
-            inputSchema={"type": "object", "properties": {}}
-        ),
-        types.Tool(
-            name="hub_register_spoke",
-            description="[HUB] Register a new external Spoke service to Hub (HTTP endpoint)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "spoke_name": {"type": "string", "description": "Unique spoke name"},
-                    "endpoint": {"type": "string", "description": "HTTP endpoint (e.g., http://localhost:8004)"},
-                    "tool_count": {"type": "integer", "description": "Number of tools"},
-                    "description": {"type": "string", "description": "Spoke description"}
+                "rebalancing_threshold": {
+                    "type": "number",
+                    "description": "Rebalancing threshold (default: 0.05)"
+                }
+            },
+            "required": ["asset_classes"]
+        }
+    ),
+    Tool(
+        name="portfolio_optimize_tax",
+        description="[PORTFOLIO] Tax-loss harvesting and optimization",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "positions": {
+                    "type": "object",
+                    "description": "Positions {symbol: {shares, cost_basis, purchase_date}}"
                 },
-                "required": ["spoke_name", "endpoint"]
-            }
-        ),
-        types.Tool(
-            name="hub_unregister_spoke",
-            description="[HUB] Unregister an external Spoke service from Hub",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "spoke_name": {"type": "string", "description": "Spoke name to unregister"}
+                "transactions": {
+                    "type": "array",
+                    "description": "Transaction history",
+                    "items": {"type": "object"}
                 },
-                "required": ["spoke_name"]
-            }
-        ),
-        types.Tool(
-            name="hub_list_all_tools",
-            description="[HUB] List all available tools across all spokes (builtin + external)",
-            inputSchema={"type": "object", "properties": {}}
-        ),
-        types.Tool(
-            name="hub_search_tools",
-            description="[HUB] Search for tools by keyword across all spokes",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "Search keyword"},
-                    "category": {
-                        "type": "string",
-                        "enum": ["all", "market", "risk", "portfolio"],
-                        "description": "Filter by category"
-                    }
+                "tax_bracket": {
+                    "type": "number",
+                    "description": "Tax bracket rate (default: 0.24)"
                 },
-                "required": ["query"]
-            }
-        )
-    ]
+                "ltcg_rate": {
+                    "type": "number",
+                    "description": "Long-term capital gains rate (default: 0.15)"
+                },
+                "current_date": {
+                    "type": "string",
+                    "description": "Current date YYYY-MM-DD (optional)"
+                }
+            },
+            "required": ["positions", "transactions"]
+        }
+    ),
+    Tool(
+        name="portfolio_generate_dashboard",
+        description="[PORTFOLIO] Generate comprehensive portfolio dashboard",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "portfolio": _ARRAY_SCHEMA
+            },
+            "required": ["portfolio"]
+        }
+    ),
+
+    # === HUB MANAGEMENT TOOLS (5) ===
+    Tool(
+        name="hub_status",
+        description="[HUB] Get comprehensive Hub status including builtin and external spokes",
+        inputSchema={"type": "object", "properties": {}}
+    ),
+    Tool(
+        name="hub_register_spoke",
+        description="[HUB] Register a new external Spoke service to Hub (HTTP endpoint)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "spoke_name": {"type": "string", "description": "Unique spoke name"},
+                "endpoint": {"type": "string", "description": "HTTP endpoint (e.g., http://localhost:8004)"},
+                "tool_count": {"type": "integer", "description": "Number of tools"},
+                "description": {"type": "string", "description": "Spoke description"}
+            },
+            "required": ["spoke_name", "endpoint"]
+        }
+    ),
+    Tool(
+        name="hub_unregister_spoke",
+        description="[HUB] Unregister an external Spoke service from Hub",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "spoke_name": {"type": "string", "description": "Spoke name to unregister"}
+            },
+            "required": ["spoke_name"]
+        }
+    ),
+    Tool(
+        name="hub_list_all_tools",
+        description="[HUB] List all available tools across all spokes (builtin + external)",
+        inputSchema={"type": "object", "properties": {}}
+    ),
+    Tool(
+        name="hub_search_tools",
+        description="[HUB] Search for tools by keyword across all spokes",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search keyword"},
+                "category": {
+                    "type": "string",
+                    "enum": ["all", "market", "risk", "portfolio"],
+                    "description": "Filter by category"
+                }
+            },
+            "required": ["query"]
+        }
+    )
+]
+
+
+@server.list_tools()
+async def handle_list_tools() -> list[Tool]:
+    """List all available tools (Market 13 + Risk 8 + Portfolio 8 + Hub 5 = 34 tools)"""
+    return _TOOLS_LIST
 
 
 @server.call_tool()
 async def handle_call_tool(
     name: str, arguments: dict | None
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+) -> list[TextContent | ImageContent | EmbeddedResource]:
     """Handle tool execution - all 34 tools (29 Spoke + 5 Hub) with lazy loading"""
-    import json
-    import time
-
-    arguments = arguments or {}
+    if arguments is None:
+        arguments = _EMPTY_ARGS
 
     # === START MONITORING ===
     start_time = time.time()
@@ -940,89 +990,72 @@ async def handle_call_tool(
     logger.info(f"Timestamp: {datetime.now().isoformat()}")
 
     try:
-        # Market Spoke Tools (13)
-        if name in ["unified_market_data", "stock_quote", "crypto_price", "financial_news",
-                    "economic_indicator", "market_overview", "api_status", "technical_analysis",
-                    "pattern_recognition", "anomaly_detection", "stock_comparison",
-                    "sentiment_analysis", "alert_system"]:
-            logger.info(f"[1/3] Loading Market tool: {name}")
-            load_start = time.time()
-            tool = get_market_tool(name)
-            load_time = time.time() - load_start
-            logger.info(f"[2/3] Tool loaded in {load_time:.3f}s, executing...")
-            exec_start = time.time()
-            result = await tool.execute(arguments)
-            exec_time = time.time() - exec_start
-            logger.info(f"[3/3] Execution completed in {exec_time:.3f}s")
-
-        # Risk Spoke Tools (8)
-        elif name in ["risk_calculate_var", "risk_calculate_metrics", "risk_analyze_portfolio",
-                      "risk_stress_test", "risk_analyze_tail_risk", "risk_calculate_greeks",
-                      "risk_check_compliance", "risk_generate_dashboard"]:
-            tool = get_risk_tool(name)
-            result = await tool.execute(arguments)
-
-        # Portfolio Spoke Tools (8)
-        elif name in ["portfolio_optimize", "portfolio_rebalance", "portfolio_analyze_performance",
-                      "portfolio_backtest", "portfolio_analyze_factors", "portfolio_allocate_assets",
-                      "portfolio_optimize_tax", "portfolio_generate_dashboard"]:
-            tool = get_portfolio_tool(name)
-            # Portfolio tools are functions, not class instances
-            if callable(tool):
-                result = await tool(**arguments)  # Unpack dict as keyword arguments
-            else:
-                result = await tool.execute(arguments)
-
-        # Hub Management Tools (5)
-        elif name == "hub_status":
-            result = await hub_tools.hub_status(arguments)
-        elif name == "hub_register_spoke":
-            result = await hub_tools.register_spoke(arguments)
-        elif name == "hub_unregister_spoke":
-            result = await hub_tools.unregister_spoke(arguments)
-        elif name == "hub_list_all_tools":
-            result = await hub_tools.list_all_tools(arguments)
-        elif name == "hub_search_tools":
-            result = await hub_tools.search_tools(arguments)
-
-        else:
+        ttl = _CACHEABLE_TOOL_TTL.get(name)
+        if ttl is not None:
+            canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+            cache_key = (name, hashlib.blake2b(canonical.encode(), digest_size=16).digest())
+            cached = _RESULT_CACHE.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < ttl:
+                _RESULT_CACHE.move_to_end(cache_key)
+                logger.info(f"CACHE HIT: Total time {time.time() - start_time:.3f}s")
+                logger.info(f"=" * 60)
+                return _wrap_text(cached[1])
+
+        resolver = _TOOL_RESOLVERS.get(name)
+        if resolver is None:
             raise ValueError(f"Unknown tool: {name}")
 
+        logger.info(f"[1/3] Loading tool: {name}")
+        load_start = time.time()
+        run = resolver()
+        load_time = time.time() - load_start
+        logger.info(f"[2/3] Tool loaded in {load_time:.3f}s, executing...")
+        exec_start = time.time()
+        result = await run(arguments)
+        exec_time = time.time() - exec_start
+        logger.info(f"[3/3] Execution completed in {exec_time:.3f}s")
+
+        text = _dumps(result)
+
         # === END MONITORING (SUCCESS) ===
         total_time = time.time() - start_time
-        result_preview = str(result)[:200] if result else "None"
+        # Preview from the encoded text; str(result) would repr the whole result
+        result_preview = text[:200] if result else "None"
         logger.info(f"SUCCESS: Total time {total_time:.3f}s")
         logger.info(f"Result preview: {result_preview}...")
         logger.info(f"=" * 60)
 
-        return [types.TextContent(
-            type="text",
-            text=json.dumps(result, indent=2)
-        )]
+        # Only memoize successful results; tools report failures as {"error": ...}
+        if ttl is not None and not (isinstance(result, dict) and "error" in result):
+            _RESULT_CACHE[cache_key] = (time.monotonic(), text)
+            _RESULT_CACHE.move_to_end(cache_key)
+            if len(_RESULT_CACHE) > _RESULT_CACHE_MAX_SIZE:
+                _RESULT_CACHE.popitem(last=False)
+
+        return _wrap_text(text)
 
     except Exception as e:
         # === END MONITORING (ERROR) ===
         total_time = time.time() - start_time
-        import traceback
 
         logger.error(f"FAILED: Total time {total_time:.3f}s")
         logger.error(f"Error type: {type(e).__name__}")
         logger.error(f"Error message: {str(e)}")
-        logger.error(f"Traceback:\n{traceback.format_exc()}")
-        logger.info(f"=" * 60)
 
         error_detail = {
             "error": f"Tool execution failed: {str(e)}",
             "tool_name": name,
             "error_type": type(e).__name__,
-            "execution_time": f"{total_time:.3f}s",
-            "traceback": traceback.format_exc()
+            "execution_time": f"{total_time:.3f}s"
         }
+        # Formatting the traceback is only worth it when someone is debugging
+        if DEBUG:
+            tb = traceback.format_exc()
+            logger.error(f"Traceback:\n{tb}")
+            error_detail["traceback"] = tb
+        logger.info(f"=" * 60)
 
-        return [types.TextContent(
-            type="text",
-            text=json.dumps(error_detail, indent=2)
-        )]
+        return _wrap_text(_dumps(error_detail))
 
 
 async def main():
@@ -1042,17 +1075,11 @@ async def main():
         logger.info(f"  [{i}] {path}")
     logger.info("="*60)
 
-    # Import original stdout/stdin for MCP communication
-    original_stdin = sys.__stdin__
-    original_stdout = sys.__stdout__
-
-    sys.stdin = original_stdin
-    sys.stdout = original_stdout
-
     logger.info("Starting MCP stdio server...")
 
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
         logger.info("MCP server initialized, waiting for requests...")
+        _start_background_task(asyncio.to_thread(_prewarm_modules))
         await server.run(
             read_stream,
             write_stream,
@@ -1068,5 +1095,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
+    # uvloop's libuv core speeds up stdio stream I/O; not available on Windows
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -13,11 +13,13 @@ from pathlib import Path
 import json
 import logging
 
-# Load environment variables
+# Load environment variables (skipped when the hosting server already loaded .env)
 from dotenv import load_dotenv
 project_root = Path(__file__).parent.parent.parent.parent.parent
 dotenv_path = project_root / '.env'
-load_dotenv(dotenv_path)
+if not os.getenv('_DOTENV_LOADED'):
+    load_dotenv(dotenv_path)
+    os.environ['_DOTENV_LOADED'] = '1'
 
 logger = logging.getLogger(__name__)
 
@@ -11,14 +11,16 @@ Supports multiple optimization methods:
 Uses scipy.optimize for professional-grade optimization without external dependencies.
 """
 
+import asyncio
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 import logging
 
 # Portfolio optimization using scipy
 from scipy.optimize import minimize
+from scipy.linalg import LinAlgError, cho_factor, cho_solve, lu_factor, lu_solve
 from scipy.cluster.hierarchy import linkage, leaves_list
 from scipy.spatial.distance import squareform
 
@@ -91,98 +93,122 @@ async def portfolio_optimizer(
 
         logger.info(f"Optimizing portfolio: {len(tickers)} stocks, method={method}")
 
-        # Load price data
-        if not start_date:
-            start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
-
-        prices = load_stock_prices(tickers, start_date, end_date)
-
-        if len(prices) < 30:
-            raise ValueError(f"Insufficient data: only {len(prices)} days (need at least 30)")
-
-        # Calculate expected returns and covariance
-        returns = calculate_returns(prices, method="log")
-        mu = returns.mean() * 252  # Annualize
-        S = returns.cov() * 252    # Annualize
-
-        # Apply optimization method
-        if method in ["mean_variance", "max_sharpe", "min_volatility"]:
-            if method == "max_sharpe":
-                objective = "max_sharpe"
-            elif method == "min_volatility":
-                objective = "min_volatility"
+        # Data loading and SLSQP are CPU-bound; keep them off the event loop
+        return await asyncio.to_thread(
+            _portfolio_optimizer_sync,
+            tickers, method, objective, target_return, target_risk,
+            constraints, risk_free_rate, start_date, end_date
+        )
 
-            weights, perf = _optimize_mean_variance(
-                mu, S, tickers, objective, target_return, target_risk,
-                constraints, risk_free_rate
-            )
-            method_used = "mean_variance"
+    except Exception as e:
+        logger.error(f"Portfolio optimization failed: {str(e)}")
+        return {
+            "error": str(e),
+            "method": method,
+            "tickers": tickers
+        }
 
-        elif method == "hrp":
-            weights, perf = _optimize_hrp(returns, tickers)
-            method_used = "hrp"
 
-        elif method == "risk_parity":
-            weights, perf = _optimize_risk_parity(mu, S, tickers, risk_free_rate)
-            method_used = "risk_parity"
+def _portfolio_optimizer_sync(
+    tickers: List[str],
+    method: str,
+    objective: str,
+    target_return: Optional[float],
+    target_risk: Optional[float],
+    constraints: Optional[Dict],
+    risk_free_rate: float,
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Blocking implementation of portfolio_optimizer (runs in a worker thread).
+    """
+    # Load price data
+    if not start_date:
+        start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+
+    prices = load_stock_prices(tickers, start_date, end_date)
+
+    if len(prices) < 30:
+        raise ValueError(f"Insufficient data: only {len(prices)} days (need at least 30)")
+
+    # Calculate expected returns and covariance
+    returns = calculate_returns(prices, method="log")
+    mu = returns.mean() * 252  # Annualize
+    S = returns.cov() * 252    # Annualize
+
+    # Apply optimization method
+    if method in ["mean_variance", "max_sharpe", "min_volatility"]:
+        if method == "max_sharpe":
+            objective = "max_sharpe"
+        elif method == "min_volatility":
+            objective = "min_volatility"
+
+        # Only the mean-variance closed-form paths solve against S
+        cov_solver = _factor_covariance(S.values)
+        weights_array, perf = _optimize_mean_variance(
+            mu, S, tickers, objective, target_return, target_risk,
+            constraints, risk_free_rate, cov_solver
+        )
+        method_used = "mean_variance"
 
-        else:
-            raise ValueError(f"Unknown optimization method: {method}")
+    elif method == "hrp":
+        weights_array, perf = _optimize_hrp(returns, tickers)
+        method_used = "hrp"
 
-        # Calculate portfolio metrics
-        weights_array = np.array([weights[t] for t in tickers])
-        mu_array = mu.values
+    elif method == "risk_parity":
+        weights_array, perf = _optimize_risk_parity(mu, S, tickers, risk_free_rate)
+        method_used = "risk_parity"
 
-        expected_ret = portfolio_return(weights_array, mu_array)
-        expected_vol = portfolio_volatility(weights_array, S.values)
-        sharpe = sharpe_ratio(expected_ret, expected_vol, risk_free_rate)
+    else:
+        raise ValueError(f"Unknown optimization method: {method}")
 
-        # Diversification metrics
-        volatilities = np.sqrt(np.diag(S.values))
-        div_ratio = diversification_ratio(weights_array, volatilities, S.values)
-        hhi = herfindahl_index(weights_array)
-        eff_assets = effective_number_of_assets(weights_array)
+    # Calculate portfolio metrics
+    weights = {ticker: float(w) for ticker, w in zip(tickers, weights_array)}
+    mu_array = mu.values
 
-        # Generate efficient frontier (for mean-variance only)
-        ef_points = []
-        if method_used == "mean_variance":
-            try:
-                ef_points = _generate_efficient_frontier(mu, S, tickers, risk_free_rate)
-            except Exception as e:
-                logger.warning(f"Could not generate efficient frontier: {e}")
-
-        # Interpretation
-        interpretation = _generate_interpretation(
-            weights, expected_ret, expected_vol, sharpe,
-            method_used, objective, hhi, div_ratio
-        )
+    expected_ret = portfolio_return(weights_array, mu_array)
+    expected_vol = portfolio_volatility(weights_array, S.values)
+    sharpe = sharpe_ratio(expected_ret, expected_vol, risk_free_rate)
 
-        return {
-            "weights": weights,
-            "expected_return": round(expected_ret, 4),
-            "expected_risk": round(expected_vol, 4),
-            "sharpe_ratio": round(sharpe, 2),
-            "method_used": method_used,
-            "objective_used": objective if method_used == "mean_variance" else method_used,
-            "efficient_frontier": ef_points,
-            "metadata": {
-                "num_assets": len(tickers),
-                "hhi": round(hhi, 3),
-                "effective_assets": round(eff_assets, 2),
-                "diversification_ratio": round(div_ratio, 2),
-                "data_period_days": len(prices),
-                "risk_free_rate": risk_free_rate
-            },
-            "interpretation": interpretation
-        }
+    # Diversification metrics
+    volatilities = np.sqrt(np.diag(S.values))
+    div_ratio = diversification_ratio(weights_array, volatilities, S.values)
+    hhi = herfindahl_index(weights_array)
+    eff_assets = effective_number_of_assets(weights_array)
+
+    # Generate efficient frontier (for mean-variance only)
+    ef_points = []
+    if method_used == "mean_variance":
+        try:
+            ef_points = _generate_efficient_frontier(mu, S, tickers, risk_free_rate)
+        except Exception as e:
+            logger.warning(f"Could not generate efficient frontier: {e}")
+
+    # Interpretation
+    interpretation = _generate_interpretation(
+        weights, expected_ret, expected_vol, sharpe,
+        method_used, objective, hhi, div_ratio
+    )
 
-    except Exception as e:
-        logger.error(f"Portfolio optimization failed: {str(e)}")
-        return {
-            "error": str(e),
-            "method": method,
-            "tickers": tickers
-        }
+    return {
+        "weights": weights,
+        "expected_return": round(expected_ret, 4),
+        "expected_risk": round(expected_vol, 4),
+        "sharpe_ratio": round(sharpe, 2),
+        "method_used": method_used,
+        "objective_used": objective if method_used == "mean_variance" else method_used,
+        "efficient_frontier": ef_points,
+        "metadata": {
+            "num_assets": len(tickers),
+            "hhi": round(hhi, 3),
+            "effective_assets": round(eff_assets, 2),
+            "diversification_ratio": round(div_ratio, 2),
+            "data_period_days": len(prices),
+            "risk_free_rate": risk_free_rate
+        },
+        "interpretation": interpretation
+    }
 
 
 def _optimize_mean_variance(
@@ -193,13 +219,21 @@ def _optimize_mean_variance(
     target_return: Optional[float],
     target_risk: Optional[float],
     constraints_dict: Optional[Dict],
-    risk_free_rate: float
-) -> Tuple[Dict[str, float], Dict]:
+    risk_free_rate: float,
+    cov_solver: Optional[Callable[[np.ndarray], np.ndarray]] = None
+) -> Tuple[np.ndarray, Dict]:
     """
     Mean-Variance optimization using scipy.optimize.
+
+    cov_solver, if given, solves S x = b from a precomputed factorization
+    (see _factor_covariance) for the closed-form paths.
     """
     n = len(tickers)
 
+    # Plain ndarrays for the SLSQP callbacks (avoids pandas access per call)
+    mu_vec = np.ascontiguousarray(mu.values)
+    cov = np.ascontiguousarray(S.values)
+
     # Set weight bounds
     bounds = [(0, 1) for _ in range(n)]  # Long-only
     if constraints_dict:
@@ -214,23 +248,43 @@ def _optimize_mean_variance(
     if objective == "efficient_return" and target_return is not None:
         constraints.append({
             'type': 'eq',
-            'fun': lambda w: portfolio_return(w, mu.values) - target_return
+            'fun': lambda w: portfolio_return(w, mu_vec) - target_return
         })
     elif objective == "efficient_risk" and target_risk is not None:
         constraints.append({
             'type': 'eq',
-            'fun': lambda w: portfolio_volatility(w, S.values) - target_risk
+            'fun': lambda w: portfolio_volatility(w, cov) - target_risk
         })
 
     # Initial guess: equal weights
     w0 = np.ones(n) / n
 
+    # Closed form: the tangency / global minimum-variance portfolio is optimal
+    # whenever it already satisfies the weight bounds, so SLSQP can be skipped
+    if objective in ("max_sharpe", "min_volatility"):
+        if objective == "max_sharpe":
+            rhs = mu_vec - risk_free_rate
+        else:
+            rhs = np.ones(n)
+
+        if cov_solver is None:
+            cov_solver = _factor_covariance(cov)
+
+        w_analytic = _analytic_weights(cov_solver, rhs)
+        if w_analytic is not None:
+            min_w, max_w = bounds[0]
+            if np.all(w_analytic >= min_w) and np.all(w_analytic <= max_w):
+                return _mean_variance_result(w_analytic, mu, S, risk_free_rate)
+
+            # Otherwise warm-start SLSQP from the clipped analytic solution
+            w0 = normalize_weights(np.clip(w_analytic, min_w, max_w))
+
     # Objective function
     if objective == "max_sharpe":
         # Minimize negative Sharpe ratio
         def obj_func(w):
-            ret = portfolio_return(w, mu.values)
-            vol = portfolio_volatility(w, S.values)
+            ret = portfolio_return(w, mu_vec)
+            vol = portfolio_volatility(w, cov)
             if vol == 0:
                 return 1e10
             return -(ret - risk_free_rate) / vol
@@ -238,23 +292,23 @@ def _optimize_mean_variance(
     elif objective == "min_volatility":
         # Minimize volatility
         def obj_func(w):
-            return portfolio_volatility(w, S.values)
+            return portfolio_volatility(w, cov)
 
     elif objective == "efficient_return":
         # Minimize risk for target return
         def obj_func(w):
-            return portfolio_volatility(w, S.values)
+            return portfolio_volatility(w, cov)
 
     elif objective == "efficient_risk":
         # Maximize return for target risk
         def obj_func(w):
-            return -portfolio_return(w, mu.values)
+            return -portfolio_return(w, mu_vec)
 
     else:
         # Default to max Sharpe
         def obj_func(w):
-            ret = portfolio_return(w, mu.values)
-            vol = portfolio_volatility(w, S.values)
+            ret = portfolio_return(w, mu_vec)
+            vol = portfolio_volatility(w, cov)
             if vol == 0:
                 return 1e10
             return -(ret - risk_free_rate) / vol
@@ -272,23 +326,67 @@ def _optimize_mean_variance(
     if not result.success:
         logger.warning(f"Optimization did not converge: {result.message}")
 
-    # Get weights
-    weights_array = result.x
-    weights = {ticker: float(w) for ticker, w in zip(tickers, weights_array)}
+    return _mean_variance_result(result.x, mu, S, risk_free_rate)
+
+
+def _factor_covariance(cov: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Factor the covariance matrix once and return a solver for cov @ x = b.
+
+    Uses Cholesky, falling back to LU when the sample covariance is not
+    positive definite.
+    """
+    try:
+        factor = cho_factor(cov, lower=True, check_finite=False)
+        return lambda b: cho_solve(factor, b, check_finite=False)
+    except LinAlgError:
+        factor = lu_factor(cov, check_finite=False)
+        return lambda b: lu_solve(factor, b, check_finite=False)
+
+
+def _analytic_weights(
+    cov_solver: Callable[[np.ndarray], np.ndarray],
+    rhs: np.ndarray
+) -> Optional[np.ndarray]:
+    """
+    Solve cov @ w = rhs and rescale to sum to 1.
+
+    Returns None when the system is singular or the solution cannot be
+    normalized to a fully-invested portfolio.
+    """
+    try:
+        w = cov_solver(rhs)
+    except (LinAlgError, ValueError):
+        return None
+
+    total = np.sum(w)
+    if not np.isfinite(total) or total <= 0:
+        return None
+    return w / total
+
 
+def _mean_variance_result(
+    weights_array: np.ndarray,
+    mu: pd.Series,
+    S: pd.DataFrame,
+    risk_free_rate: float
+) -> Tuple[np.ndarray, Dict]:
+    """
+    Package mean-variance weights with their performance figures.
+    """
     # Calculate performance
     ret = portfolio_return(weights_array, mu.values)
     vol = portfolio_volatility(weights_array, S.values)
     sharpe = sharpe_ratio(ret, vol, risk_free_rate)
 
-    return weights, {
+    return weights_array, {
         "expected_return": ret,
         "volatility": vol,
         "sharpe_ratio": sharpe
     }
 
 
-def _optimize_hrp(returns: pd.DataFrame, tickers: List[str]) -> Tuple[Dict[str, float], Dict]:
+def _optimize_hrp(returns: pd.DataFrame, tickers: List[str]) -> Tuple[np.ndarray, Dict]:
     """
     Hierarchical Risk Parity optimization using scipy.
     """
@@ -306,8 +404,6 @@ def _optimize_hrp(returns: pd.DataFrame, tickers: List[str]) -> Tuple[Dict[str,
     # Calculate weights using inverse variance
     weights_array = _hrp_weights(returns, order)
 
-    weights = {ticker: float(w) for ticker, w in zip(tickers, weights_array)}
-
     # Calculate performance
     mu = returns.mean() * 252
     S = returns.cov() * 252
@@ -316,7 +412,7 @@ def _optimize_hrp(returns: pd.DataFrame, tickers: List[str]) -> Tuple[Dict[str,
     vol = portfolio_volatility(weights_array, S.values)
     sharpe = sharpe_ratio(ret, vol)
 
-    return weights, {
+    return weights_array, {
         "expected_return": ret,
         "volatility": vol,
         "sharpe_ratio": sharpe
@@ -396,7 +492,7 @@ def _optimize_risk_parity(
     S: pd.DataFrame,
     tickers: List[str],
     risk_free_rate: float
-) -> Tuple[Dict[str, float], Dict]:
+) -> Tuple[np.ndarray, Dict]:
     """
     Risk Parity optimization - inverse volatility weighting.
     """
@@ -407,14 +503,12 @@ def _optimize_risk_parity(
     inv_vol = 1 / volatilities
     weights_array = inv_vol / np.sum(inv_vol)
 
-    weights = {ticker: float(w) for ticker, w in zip(tickers, weights_array)}
-
     # Calculate performance
     ret = portfolio_return(weights_array, mu.values)
     vol = portfolio_volatility(weights_array, S.values)
     sharpe = sharpe_ratio(ret, vol, risk_free_rate)
 
-    return weights, {
+    return weights_array, {
         "expected_return": ret,
         "volatility": vol,
         "sharpe_ratio": sharpe
@@ -441,7 +535,7 @@ def _generate_efficient_frontier(
 
         for target in target_returns:
             try:
-                weights, perf = _optimize_mean_variance(
+                _, perf = _optimize_mean_variance(
                     mu, S, tickers,
                     objective="efficient_return",
                     target_return=target,
@@ -526,7 +620,6 @@ def _generate_interpretation(
 
 # Example usage
 if __name__ == "__main__":
-    import asyncio
     logging.basicConfig(level=logging.INFO)
 
     async def test():
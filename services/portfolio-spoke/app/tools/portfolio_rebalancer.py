@@ -11,17 +11,119 @@ Supports:
 - Transaction cost optimization
 """
 
+import asyncio
+import functools
+import time
+from dataclasses import dataclass
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime
 import logging
 
 from app.utils.data_loader import load_stock_prices
 from app.utils.portfolio_math import normalize_weights
 
+# Optional: JIT-compiled trade kernel for large universes
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Use the numba kernel (when installed) from this many tickers upward;
+# below that the NumPy path is already faster than the call overhead
+NUMBA_MIN_TICKERS = 64
+
+
+@dataclass
+class PositionsSoA:
+    """
+    Holdings as parallel arrays aligned with a sorted ticker index.
+
+    Built once from the current_positions dict so the rebalancing math
+    works on arrays; trade dicts are only produced at the API boundary.
+    """
+    tickers: Tuple[str, ...]
+    shares: np.ndarray
+    values: np.ndarray
+    prices: np.ndarray
+
+    @classmethod
+    def from_dict(
+        cls,
+        positions: Dict[str, Dict[str, float]],
+        tickers: Tuple[str, ...],
+        prices: Dict[str, float]
+    ) -> "PositionsSoA":
+        """
+        Convert {ticker: {"shares", "value", ...}} into aligned arrays.
+
+        Tickers without a position get zero shares/value; tickers without
+        a known price fall back to $100.
+        """
+        empty = {}
+        n = len(tickers)
+
+        # Resolve each ticker's position once; both arrays read from it
+        rows = [positions.get(t, empty) for t in tickers]
+
+        return cls(
+            tickers=tickers,
+            shares=np.fromiter(
+                (pos.get("shares", 0) for pos in rows), dtype=np.float64, count=n
+            ),
+            values=np.fromiter(
+                (pos.get("value", 0.0) for pos in rows), dtype=np.float64, count=n
+            ),
+            prices=np.fromiter(
+                (prices.get(t, 100.0) for t in tickers), dtype=np.float64, count=n
+            )
+        )
+
+    def to_trade_dicts(
+        self,
+        action: np.ndarray,
+        shares: np.ndarray,
+        trade_values: np.ndarray,
+        current_weights: np.ndarray,
+        targets: np.ndarray,
+        drift: np.ndarray
+    ) -> List[Dict]:
+        """
+        Build the public trade list, sells first (generate cash), then buys.
+        """
+        trades = []
+        for code, label in ((-1, "sell"), (1, "buy")):
+            for i in np.flatnonzero(action == code):
+                d = float(drift[i])
+                # Whole-share trades stay ints; only a sell of an entire
+                # fractional holding is fractional
+                n_shares = float(shares[i])
+                trades.append({
+                    "ticker": self.tickers[i],
+                    "action": label,
+                    "shares": int(n_shares) if n_shares.is_integer() else n_shares,
+                    "price": round(float(self.prices[i]), 2),
+                    "value": round(float(trade_values[i]), 2),
+                    "current_weight": round(float(current_weights[i]), 4),
+                    "target_weight": round(float(targets[i]), 4),
+                    "drift": round(d, 4),
+                    "reason": (
+                        f"overweight by {d:.1%}" if label == "sell"
+                        else f"underweight by {abs(d):.1%}"
+                    )
+                })
+        return trades
+
+# Fetched latest prices are reused for this many seconds
+PRICE_CACHE_TTL_SECONDS = 60
+
+# Concurrent price lookups arriving within this window share one fetch
+PRICE_BATCH_WINDOW_SECONDS = 0.005
+
 
 async def portfolio_rebalancer(
     current_positions: Dict[str, Dict[str, float]],
@@ -97,60 +199,86 @@ async def portfolio_rebalancer(
     try:
         logger.info(f"Rebalancing: {len(current_positions)} positions, strategy={strategy}")
 
-        # Get current prices for all tickers
-        all_tickers = list(set(list(current_positions.keys()) + list(target_weights.keys())))
-        current_prices = await _get_current_prices(all_tickers, current_positions)
-
-        # Calculate current weights
-        current_weights = _calculate_current_weights(current_positions, total_value)
-
-        # Calculate drift
-        drift_before = _calculate_drift(current_weights, target_weights)
+        # Canonical ticker index shared by all array computations
+        tickers = tuple(sorted(current_positions.keys() | target_weights.keys()))
 
-        # Determine if rebalancing is needed
-        needs_rebalancing, reason = _check_rebalancing_needed(
-            drift_before, strategy, threshold
+        # Get current prices for all tickers
+        current_prices = await _get_current_prices(tickers, current_positions)
+        positions = PositionsSoA.from_dict(current_positions, tickers, current_prices)
+        targets = np.fromiter(
+            (target_weights.get(t, 0.0) for t in tickers),
+            dtype=np.float64, count=len(tickers)
         )
 
-        if not needs_rebalancing:
-            return {
-                "rebalancing_needed": False,
-                "reason": reason,
-                "drift_before": drift_before,
-                "total_cost": 0,
-                "trades": [],
-                "interpretation": "No rebalancing needed. Portfolio is within target bands."
-            }
+        if strategy == "periodic" and not current_positions:
+            # Cold start: nothing is held, so drift is -target and every
+            # trade is a buy; the drift check and sell sizing are skipped
+            drift_before = -targets
+            max_drift_before = float(np.abs(targets).max())
+
+            trades, share_delta, trade_values, cash_required, cash_generated = (
+                _generate_initial_trades(positions, targets, total_value, minimize_trades, constraints)
+            )
 
-        # Generate trades
-        trades, cash_required, cash_generated = _generate_trades(
-            current_positions,
-            current_weights,
-            target_weights,
-            total_value,
-            cash_available,
-            current_prices,
-            strategy,
-            minimize_trades,
-            constraints
+        else:
+            # Calculate current weights
+            weights_arr = _calculate_current_weights(positions.values, total_value)
+
+            # Calculate drift
+            drift_before = _calculate_drift(weights_arr, targets)
+            max_drift_before = float(np.abs(drift_before).max())
+
+            # Determine if rebalancing is needed
+            needs_rebalancing, reason = _check_rebalancing_needed(
+                max_drift_before, strategy, threshold
+            )
+
+            if not needs_rebalancing:
+                return {
+                    "rebalancing_needed": False,
+                    "reason": reason,
+                    "drift_before": dict(zip(tickers, drift_before.tolist())),
+                    "total_cost": 0,
+                    "trades": [],
+                    "interpretation": "No rebalancing needed. Portfolio is within target bands."
+                }
+
+            # Generate trades
+            trades, share_delta, trade_values, cash_required, cash_generated = _generate_trades(
+                positions,
+                weights_arr,
+                targets,
+                total_value,
+                cash_available,
+                strategy,
+                minimize_trades,
+                constraints
+            )
+
+        num_buys = sum(1 for t in trades if t["action"] == "buy")
+        sell_tickers = {t["ticker"] for t in trades if t["action"] == "sell"}
+        num_sells = len(sell_tickers)
+        num_positions_after = num_buys + sum(
+            1 for p in current_positions if p not in sell_tickers
         )
 
         # Calculate transaction costs
         total_cost = _calculate_transaction_costs(
-            trades, transaction_cost_per_share, transaction_cost_pct
+            share_delta, trade_values, transaction_cost_per_share, transaction_cost_pct
         )
 
         # Calculate turnover
-        turnover = _calculate_turnover(trades, total_value)
+        turnover = _calculate_turnover(trade_values, total_value)
 
         # Calculate drift after rebalancing
         drift_after = _simulate_drift_after_trades(
-            current_positions, trades, target_weights, total_value, current_prices
+            positions, share_delta, targets, total_value
         )
 
         # Interpretation
         interpretation = _generate_interpretation(
-            trades, total_cost, turnover, drift_before, drift_after, strategy
+            trades, num_buys, num_sells, total_cost, turnover,
+            max_drift_before, drift_after, strategy
         )
 
         return {
@@ -158,16 +286,15 @@ async def portfolio_rebalancer(
             "trades": trades,
             "total_cost": round(total_cost, 2),
             "turnover": round(turnover, 4),
-            "drift_before": {k: round(v, 4) for k, v in drift_before.items()},
-            "drift_after": {k: round(v, 4) for k, v in drift_after.items()},
+            "drift_before": dict(zip(tickers, np.round(drift_before, 4).tolist())),
+            "drift_after": dict(zip(tickers, np.round(drift_after, 4).tolist())),
             "cash_required": round(cash_required, 2),
             "cash_generated": round(cash_generated, 2),
             "net_cash_flow": round(cash_generated - cash_required, 2),
             "metadata": {
                 "num_trades": len(trades),
                 "num_positions_before": len(current_positions),
-                "num_positions_after": len([t for t in trades if t["action"] == "buy"]) +
-                    len([p for p in current_positions if p not in [t["ticker"] for t in trades if t["action"] == "sell"]]),
+                "num_positions_after": num_positions_after,
                 "strategy": strategy,
                 "threshold": threshold
             },
@@ -184,7 +311,7 @@ async def portfolio_rebalancer(
 
 
 async def _get_current_prices(
-    tickers: List[str],
+    tickers: Tuple[str, ...],
     current_positions: Dict[str, Dict]
 ) -> Dict[str, float]:
     """
@@ -199,18 +326,16 @@ async def _get_current_prices(
     for ticker, pos in current_positions.items():
         if "price" in pos:
             prices[ticker] = pos["price"]
-        elif "value" in pos and "shares" in pos and pos["shares"] > 0:
-            prices[ticker] = pos["value"] / pos["shares"]
+        else:
+            shares = pos.get("shares", 0)
+            if shares > 0 and "value" in pos:
+                prices[ticker] = pos["value"] / shares
 
     # Fetch missing prices
     missing = [t for t in tickers if t not in prices]
     if missing:
         try:
-            price_data = load_stock_prices(missing, column="Close")
-            latest_prices = price_data.iloc[-1]
-            for ticker in missing:
-                if ticker in latest_prices.index:
-                    prices[ticker] = float(latest_prices[ticker])
+            prices.update(await _price_batcher.get(tuple(missing)))
         except Exception as e:
             logger.warning(f"Could not fetch prices for {missing}: {e}")
             # Use placeholder price
@@ -220,58 +345,126 @@ async def _get_current_prices(
     return prices
 
 
-def _calculate_current_weights(
-    positions: Dict[str, Dict],
-    total_value: float
-) -> Dict[str, float]:
+@functools.lru_cache(maxsize=256)
+def _fetch_latest_price(ticker: str, ttl_bucket: int) -> float:
+    """
+    Load the latest close for one ticker.
+
+    Cached per ticker; ttl_bucket is part of the key so entries expire
+    after PRICE_CACHE_TTL_SECONDS. Raises if the ticker has no data.
+    """
+    price_data = load_stock_prices([ticker], column="Close")
+    return float(price_data[ticker].iloc[-1])
+
+
+def _fetch_latest_prices(tickers: Tuple[str, ...], ttl_bucket: int) -> Dict[str, float]:
+    """
+    Load the latest close for each ticker (missing data is omitted).
+
+    Tickers are fetched independently so that one unknown or stale ticker
+    in a batch cannot fail the lookup for the others.
+    """
+    prices = {}
+    for ticker in tickers:
+        try:
+            prices[ticker] = _fetch_latest_price(ticker, ttl_bucket)
+        except Exception as e:
+            logger.warning(f"Could not fetch price for {ticker}: {e}")
+    return prices
+
+
+class _PriceFetchBatcher:
     """
-    Calculate current portfolio weights.
+    Coalesce concurrent missing-price lookups into one worker-thread fetch.
+
+    The first caller opens a batch and schedules a flush after the batch
+    window; callers arriving before the flush add their tickers to the
+    same batch and wait on the same future. Each caller only receives the
+    prices for its own tickers.
     """
-    weights = {}
 
-    for ticker, pos in positions.items():
-        position_value = pos.get("value", 0)
-        weights[ticker] = position_value / total_value if total_value > 0 else 0
+    def __init__(self, window: float = PRICE_BATCH_WINDOW_SECONDS):
+        self.window = window
+        self._pending: Set[str] = set()
+        self._future: Optional[asyncio.Future] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def get(self, tickers: Tuple[str, ...]) -> Dict[str, float]:
+        """
+        Return the latest prices for tickers (missing data is omitted).
+        """
+        loop = asyncio.get_running_loop()
+        if self._future is None or self._future.get_loop() is not loop:
+            self._pending = set()
+            self._future = loop.create_future()
+            self._flush_task = loop.create_task(self._flush(self._future))
+
+        future = self._future
+        self._pending.update(tickers)
+
+        prices = await future
+        return {ticker: prices[ticker] for ticker in tickers if ticker in prices}
+
+    async def _flush(self, future: asyncio.Future) -> None:
+        await asyncio.sleep(self.window)
+
+        # Close the batch before fetching so new callers start a fresh one
+        batch = tuple(sorted(self._pending))
+        self._pending = set()
+        self._future = None
+
+        try:
+            # CSV loading blocks; run it in a worker thread
+            ttl_bucket = int(time.monotonic() // PRICE_CACHE_TTL_SECONDS)
+            prices = await asyncio.to_thread(_fetch_latest_prices, batch, ttl_bucket)
+            future.set_result(prices)
+        except Exception as e:
+            future.set_exception(e)
+
 
-    return weights
+_price_batcher = _PriceFetchBatcher()
+
+
+def _calculate_current_weights(
+    values: np.ndarray,
+    total_value: float
+) -> np.ndarray:
+    """
+    Calculate current portfolio weights from position values.
+    """
+    if total_value > 0:
+        return values / total_value
+    return np.zeros_like(values)
 
 
 def _calculate_drift(
-    current_weights: Dict[str, float],
-    target_weights: Dict[str, float]
-) -> Dict[str, float]:
+    current_weights: np.ndarray,
+    targets: np.ndarray
+) -> np.ndarray:
     """
     Calculate drift from target weights.
 
     Drift = current_weight - target_weight
     Positive = overweight, Negative = underweight
     """
-    all_tickers = set(list(current_weights.keys()) + list(target_weights.keys()))
-
-    drift = {}
-    for ticker in all_tickers:
-        current = current_weights.get(ticker, 0)
-        target = target_weights.get(ticker, 0)
-        drift[ticker] = current - target
-
-    return drift
+    return current_weights - targets
 
 
 def _check_rebalancing_needed(
-    drift: Dict[str, float],
+    max_drift: float,
     strategy: str,
     threshold: float
 ) -> Tuple[bool, str]:
     """
     Determine if rebalancing is needed based on strategy.
+
+    max_drift is the largest absolute drift across all tickers.
     """
     if strategy == "periodic":
         return True, "Periodic rebalancing scheduled"
 
     elif strategy == "threshold" or strategy == "tax_aware":
         # Check if any position exceeds threshold
-        max_drift = max([abs(d) for d in drift.values()])
-
         if max_drift > threshold:
             return True, f"Max drift {max_drift:.1%} exceeds threshold {threshold:.1%}"
         else:
@@ -282,23 +475,26 @@ def _check_rebalancing_needed(
 
 
 def _generate_trades(
-    current_positions: Dict[str, Dict],
-    current_weights: Dict[str, float],
-    target_weights: Dict[str, float],
+    positions: PositionsSoA,
+    current_weights: np.ndarray,
+    targets: np.ndarray,
     total_value: float,
     cash_available: float,
-    current_prices: Dict[str, float],
     strategy: str,
     minimize_trades: bool,
     constraints: Optional[Dict]
-) -> Tuple[List[Dict], float, float]:
+) -> Tuple[List[Dict], np.ndarray, np.ndarray, float, float]:
     """
     Generate optimal trade list.
-    """
-    trades = []
-    cash_required = 0
-    cash_generated = 0
 
+    Weights and targets are aligned with positions.tickers; only tickers
+    that end up with a non-zero trade are turned into trade dicts.
+
+    Returns:
+        (trades, share_delta, trade_values, cash_required, cash_generated)
+        where share_delta is signed (+buy / -sell) and trade_values is the
+        absolute traded value, both aligned with positions.tickers.
+    """
     # Get constraints
     no_sell_list = []
     no_buy_list = []
@@ -306,108 +502,165 @@ def _generate_trades(
         no_sell_list = constraints.get("no_sell_list", [])
         no_buy_list = constraints.get("no_buy_list", [])
 
-    all_tickers = set(list(current_weights.keys()) + list(target_weights.keys()))
+    ticker_arr = np.asarray(positions.tickers, dtype=object)
+    no_buy_mask = np.isin(ticker_arr, list(no_buy_list))
+    no_sell_mask = np.isin(ticker_arr, list(no_sell_list))
+
+    drift = current_weights - targets
+    min_drift = 0.01 if minimize_trades else 0.0  # Skip drift below 1%
+
+    action, shares, trade_values = _compute_trade_shares(
+        current_weights, targets, positions.prices, positions.shares,
+        no_buy_mask, no_sell_mask, float(total_value), min_drift
+    )
+
+    cash_required = float(trade_values[action > 0].sum())
+    cash_generated = float(trade_values[action < 0].sum())
+
+    trades = positions.to_trade_dicts(
+        action, shares, trade_values, current_weights, targets, drift
+    )
+
+    return trades, action * shares, trade_values, cash_required, cash_generated
+
+
+def _generate_initial_trades(
+    positions: PositionsSoA,
+    targets: np.ndarray,
+    total_value: float,
+    minimize_trades: bool,
+    constraints: Optional[Dict]
+) -> Tuple[List[Dict], np.ndarray, np.ndarray, float, float]:
+    """
+    Buy-only trade list for allocating an empty portfolio.
+
+    Same result as _generate_trades with zero holdings, without the sell
+    path. Returns the same tuple as _generate_trades.
+    """
+    no_buy_list = constraints.get("no_buy_list", []) if constraints else []
+    no_buy_mask = np.isin(np.asarray(positions.tickers, dtype=object), list(no_buy_list))
+    min_drift = 0.01 if minimize_trades else 0.0  # Skip targets below 1%
+
+    prices = positions.prices
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw_shares = np.where(prices > 0, targets * total_value / prices, 0.0).astype(np.int64)
+
+    shares = np.maximum(raw_shares, 0) * ((np.abs(targets) >= min_drift) & ~no_buy_mask)
+    action = np.sign(shares).astype(np.int8)
+    trade_values = np.where(action != 0, shares * prices, 0.0)
+
+    trades = positions.to_trade_dicts(
+        action, shares, trade_values, np.zeros_like(targets), targets, -targets
+    )
+
+    return trades, shares, trade_values, float(trade_values[action > 0].sum()), 0.0
+
+
+def _compute_trade_shares(
+    weights: np.ndarray,
+    targets: np.ndarray,
+    prices: np.ndarray,
+    current_shares: np.ndarray,
+    no_buy_mask: np.ndarray,
+    no_sell_mask: np.ndarray,
+    total_value: float,
+    min_drift: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute per-ticker trades as (action, shares, value) arrays.
+
+    action is 1 for buy, -1 for sell and 0 for no trade. Dispatches to the
+    numba kernel for large universes when numba is installed.
+    """
+    if NUMBA_AVAILABLE and len(weights) >= NUMBA_MIN_TICKERS:
+        return _compute_trade_shares_jit(
+            weights, targets, prices, current_shares,
+            no_buy_mask, no_sell_mask, total_value, min_drift
+        )
+
+    drift = weights - targets
+    diff_value = targets * total_value - weights * total_value
+
+    # Whole shares needed to close the gap (truncated toward zero)
+    tradable = prices > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw_shares = np.where(tradable, diff_value / prices, 0.0).astype(np.int64)
 
-    for ticker in all_tickers:
-        current_weight = current_weights.get(ticker, 0)
-        target_weight = target_weights.get(ticker, 0)
-        drift = current_weight - target_weight
+    active = tradable & (np.abs(drift) >= min_drift)
 
-        # Skip if drift is negligible
-        if minimize_trades and abs(drift) < 0.01:  # 1% threshold
+    # Branchless buy/sell sizing; sells are capped at the shares held, so a
+    # fractional holding can be sold in full
+    held = np.maximum(current_shares, 0.0)
+    buy_shares = np.maximum(raw_shares, 0) * (active & ~no_buy_mask)
+    sell_shares = np.minimum(-np.minimum(raw_shares, 0), held) * (active & ~no_sell_mask)
+
+    # At most one of buy_shares / sell_shares is non-zero per ticker
+    shares = buy_shares + sell_shares
+    action = (np.sign(buy_shares) - np.sign(sell_shares)).astype(np.int8)
+    return action, shares, np.where(action != 0, shares * prices, 0.0)
+
+
+def _compute_trade_shares_loop(
+    weights: np.ndarray,
+    targets: np.ndarray,
+    prices: np.ndarray,
+    current_shares: np.ndarray,
+    no_buy_mask: np.ndarray,
+    no_sell_mask: np.ndarray,
+    total_value: float,
+    min_drift: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scalar-loop form of _compute_trade_shares, compiled with numba.
+    """
+    n = weights.shape[0]
+    action = np.zeros(n, dtype=np.int8)
+    shares = np.zeros(n, dtype=np.float64)
+    values = np.zeros(n, dtype=np.float64)
+
+    for i in range(n):
+        price = prices[i]
+        drift = weights[i] - targets[i]
+        if not price > 0 or abs(drift) < min_drift:
             continue
 
-        # Current position
-        current_value = current_weight * total_value
-        target_value = target_weight * total_value
-        diff_value = target_value - current_value
-
-        # Get current shares
-        current_shares = current_positions.get(ticker, {}).get("shares", 0)
-        price = current_prices.get(ticker, 100.0)
-
-        # Calculate required trade
-        if diff_value > 0:  # Need to buy
-            if ticker in no_buy_list:
-                continue
-
-            shares_to_buy = int(diff_value / price)
-            if shares_to_buy == 0:
-                continue
-
-            trade_value = shares_to_buy * price
-            cash_required += trade_value
-
-            trades.append({
-                "ticker": ticker,
-                "action": "buy",
-                "shares": shares_to_buy,
-                "price": round(price, 2),
-                "value": round(trade_value, 2),
-                "current_weight": round(current_weight, 4),
-                "target_weight": round(target_weight, 4),
-                "drift": round(drift, 4),
-                "reason": f"underweight by {abs(drift):.1%}"
-            })
-
-        elif diff_value < 0:  # Need to sell
-            if ticker in no_sell_list:
-                continue
-
-            if current_shares == 0:
-                continue
-
-            shares_to_sell = min(int(abs(diff_value) / price), current_shares)
-            if shares_to_sell == 0:
-                continue
-
-            trade_value = shares_to_sell * price
-            cash_generated += trade_value
-
-            trades.append({
-                "ticker": ticker,
-                "action": "sell",
-                "shares": shares_to_sell,
-                "price": round(price, 2),
-                "value": round(trade_value, 2),
-                "current_weight": round(current_weight, 4),
-                "target_weight": round(target_weight, 4),
-                "drift": round(drift, 4),
-                "reason": f"overweight by {drift:.1%}"
-            })
-
-    # Sort trades: sells first (generate cash), then buys
-    trades_sorted = sorted(trades, key=lambda x: 0 if x["action"] == "sell" else 1)
-
-    return trades_sorted, cash_required, cash_generated
+        diff_value = targets[i] * total_value - weights[i] * total_value
+        raw_shares = int(diff_value / price)
+
+        if raw_shares > 0 and not no_buy_mask[i]:
+            action[i] = 1
+            shares[i] = raw_shares
+        elif raw_shares < 0 and not no_sell_mask[i]:
+            held = max(current_shares[i], 0.0)
+            sell_shares = min(float(-raw_shares), held)
+            if sell_shares > 0:
+                action[i] = -1
+                shares[i] = sell_shares
+
+        values[i] = shares[i] * price
+
+    return action, shares, values
+
+
+if NUMBA_AVAILABLE:
+    _compute_trade_shares_jit = njit(cache=True)(_compute_trade_shares_loop)
 
 
 def _calculate_transaction_costs(
-    trades: List[Dict],
+    share_delta: np.ndarray,
+    trade_values: np.ndarray,
     cost_per_share: float,
     cost_pct: float
 ) -> float:
     """
     Calculate total transaction costs.
-    """
-    total_cost = 0
-
-    for trade in trades:
-        shares = trade["shares"]
-        value = trade["value"]
-
-        # Fixed cost per share
-        fixed_cost = shares * cost_per_share
 
-        # Percentage cost
-        pct_cost = value * cost_pct
-
-        total_cost += fixed_cost + pct_cost
-
-    return total_cost
+    Fixed cost per share traded plus a percentage of traded value.
+    """
+    return float(np.abs(share_delta).sum() * cost_per_share + trade_values.sum() * cost_pct)
 
 
-def _calculate_turnover(trades: List[Dict], total_value: float) -> float:
+def _calculate_turnover(trade_values: np.ndarray, total_value: float) -> float:
     """
     Calculate portfolio turnover.
 
@@ -416,65 +669,47 @@ def _calculate_turnover(trades: List[Dict], total_value: float) -> float:
     if total_value == 0:
         return 0
 
-    total_traded = sum([t["value"] for t in trades])
-    return total_traded / total_value
+    return float(trade_values.sum() / total_value)
 
 
 def _simulate_drift_after_trades(
-    current_positions: Dict[str, Dict],
-    trades: List[Dict],
-    target_weights: Dict[str, float],
-    total_value: float,
-    current_prices: Dict[str, float]
-) -> Dict[str, float]:
-    """
-    Simulate portfolio weights after executing trades.
+    positions: PositionsSoA,
+    share_delta: np.ndarray,
+    targets: np.ndarray,
+    total_value: float
+) -> np.ndarray:
     """
-    # Create new positions
-    new_positions = {ticker: pos.copy() for ticker, pos in current_positions.items()}
-
-    # Apply trades
-    for trade in trades:
-        ticker = trade["ticker"]
-        shares = trade["shares"]
-        action = trade["action"]
-
-        if ticker not in new_positions:
-            new_positions[ticker] = {"shares": 0, "value": 0}
-
-        if action == "buy":
-            new_positions[ticker]["shares"] = new_positions[ticker].get("shares", 0) + shares
-        elif action == "sell":
-            new_positions[ticker]["shares"] = new_positions[ticker].get("shares", 0) - shares
+    Simulate drift from target weights after executing trades.
 
-        # Update value
-        price = current_prices.get(ticker, trade["price"])
-        new_positions[ticker]["value"] = new_positions[ticker]["shares"] * price
-
-    # Calculate new weights
-    new_weights = _calculate_current_weights(new_positions, total_value)
+    Traded positions are revalued at the trade price; untouched positions
+    keep their reported value.
+    """
+    new_values = np.where(
+        share_delta != 0,
+        (positions.shares + share_delta) * positions.prices,
+        positions.values
+    )
 
-    # Calculate drift
-    return _calculate_drift(new_weights, target_weights)
+    new_weights = _calculate_current_weights(new_values, total_value)
+    return _calculate_drift(new_weights, targets)
 
 
 def _generate_interpretation(
     trades: List[Dict],
+    num_buys: int,
+    num_sells: int,
     total_cost: float,
     turnover: float,
-    drift_before: Dict[str, float],
-    drift_after: Dict[str, float],
+    max_drift_before: float,
+    drift_after: np.ndarray,
     strategy: str
 ) -> str:
     """
     Generate human-readable interpretation.
     """
     num_trades = len(trades)
-    num_buys = len([t for t in trades if t["action"] == "buy"])
-    num_sells = len([t for t in trades if t["action"] == "sell"])
 
-    max_drift_before = max([abs(d) for d in drift_before.values()])
-    max_drift_after = max([abs(d) for d in drift_after.values()]) if drift_after else 0
+    max_drift_after = float(np.abs(drift_after).max()) if drift_after.size else 0
 
     interpretation = (
         f"Rebalancing requires {num_trades} trades ({num_buys} buys, {num_sells} sells) "
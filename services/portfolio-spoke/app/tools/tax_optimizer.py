@@ -8,16 +8,103 @@ Provides tax optimization strategies including:
 - Tax Benefit Calculations
 """
 
+import asyncio
+import functools
+import operator
+import time
 import numpy as np
 import pandas as pd
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 
 from app.utils.data_loader import load_stock_prices
 
+# Optional: JIT-compiled harvesting kernel for large lot counts
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Loaded price windows are reused for this many seconds
+PRICE_CACHE_TTL_SECONDS = 60
+
+# Maximum number of per-ticker price loads in flight at once
+PRICE_FETCH_CONCURRENCY = 8
+
+# Use the numba kernel (when installed) from this many lots upward;
+# below that the NumPy path is already faster than the call overhead
+NUMBA_MIN_LOTS = 64
+
+# Fields every held lot is guaranteed to have (checked in TaxLotsSoA.from_dict)
+_get_shares = operator.itemgetter("shares")
+_get_purchase_date = operator.itemgetter("purchase_date")
+
+
+@dataclass(frozen=True, slots=True)
+class TaxLotsSoA:
+    """
+    Held positions as parallel arrays with their gain/loss and holding period.
+
+    Built once per call so the harvesting scan and the gains/losses summary
+    share the date parsing and arithmetic; result dicts echo the source lots.
+    """
+    tickers: Tuple[str, ...]
+    lots: Tuple[Dict[str, Any], ...]
+    shares: np.ndarray
+    cost_basis: np.ndarray
+    current_price: np.ndarray
+    total_cost: np.ndarray
+    unrealized_gl: np.ndarray
+    holding_days: np.ndarray
+    is_long_term: np.ndarray
+
+    @classmethod
+    def from_dict(
+        cls,
+        positions: Dict[str, Dict[str, Any]],
+        current_date: datetime
+    ) -> "TaxLotsSoA":
+        """
+        Convert {ticker: {"shares", "cost_basis", ...}} into aligned arrays.
+
+        Positions without a purchase date or shares are skipped.
+        """
+        held = [
+            (ticker, pos) for ticker, pos in positions.items()
+            if pos.get("purchase_date") and pos.get("shares", 0) > 0
+        ]
+        n = len(held)
+        lots = tuple(pos for _, pos in held)
+
+        shares = np.fromiter(map(_get_shares, lots), dtype=np.float64, count=n)
+        cost_basis = np.fromiter((pos.get("cost_basis", 0) for pos in lots), dtype=np.float64, count=n)
+        current_price = np.fromiter((pos.get("current_price", 0) for pos in lots), dtype=np.float64, count=n)
+        # Parse all purchase dates in one batch rather than one Timestamp each;
+        # "mixed" infers the format per element, as separate parses would
+        purchase_dt = pd.to_datetime(
+            list(map(_get_purchase_date, lots)), format="mixed"
+        ).values.astype("datetime64[ns]")
+
+        total_cost = shares * cost_basis
+        holding_days = (np.datetime64(current_date, "ns") - purchase_dt) // np.timedelta64(1, "D")
+
+        return cls(
+            tickers=tuple(ticker for ticker, _ in held),
+            lots=lots,
+            shares=shares,
+            cost_basis=cost_basis,
+            current_price=current_price,
+            total_cost=total_cost,
+            unrealized_gl=shares * current_price - total_cost,
+            holding_days=holding_days,
+            is_long_term=holding_days >= 365
+        )
+
 
 async def tax_optimizer(
     positions: Dict[str, Dict[str, Any]],
@@ -113,42 +200,58 @@ async def tax_optimizer(
         if stcg_rate is None:
             stcg_rate = tax_bracket
 
-        # Load current prices if not provided
-        tickers = list(positions.keys())
-        prices = load_stock_prices(tickers,
-                                   start_date=(current_dt - timedelta(days=5)).strftime("%Y-%m-%d"),
-                                   end_date=current_date)
-
-        # Update current prices
-        for ticker in positions.keys():
-            if ticker in prices.columns and "current_price" not in positions[ticker]:
-                ticker_prices = prices[ticker].dropna()
-                if len(ticker_prices) > 0:
-                    positions[ticker]["current_price"] = float(ticker_prices.iloc[-1])
-
-        # Analyze tax loss harvesting opportunities
-        tlh_opportunities = _find_tax_loss_harvest_opportunities(
-            positions, current_dt, stcg_rate, ltcg_rate, harvest_threshold
-        )
+        if positions:
+            # Load current prices only for positions that lack one
+            missing = [ticker for ticker, pos in positions.items() if "current_price" not in pos]
+            if missing:
+                latest_prices = await _load_latest_prices(
+                    missing,
+                    (current_dt - timedelta(days=5)).strftime("%Y-%m-%d"),
+                    current_date
+                )
+
+                # Update current prices
+                for ticker, price in latest_prices.items():
+                    positions[ticker]["current_price"] = price
+
+            # Gain/loss and holding period are shared by the analyses below
+            lots = TaxLotsSoA.from_dict(positions, current_dt)
+
+            # Analyze tax loss harvesting opportunities
+            tlh_opportunities = _find_tax_loss_harvest_opportunities(
+                lots, stcg_rate, ltcg_rate, harvest_threshold
+            )
+
+            # Calculate unrealized gains/losses
+            gains_losses = _calculate_gains_losses(
+                lots, ltcg_rate, stcg_rate
+            )
+
+        else:
+            # Nothing held: skip price loading and the position analyses
+            tlh_opportunities = []
+            gains_losses = dict.fromkeys(
+                ("lt_gains", "st_gains", "total_gains", "total_losses",
+                 "lt_tax", "st_tax", "total_tax", "potential_savings"),
+                0.0
+            )
 
         # Detect wash sales
         wash_sales = _detect_wash_sales(
             transactions, current_dt
         )
 
-        # Calculate unrealized gains/losses
-        gains_losses = _calculate_gains_losses(
-            positions, current_dt, ltcg_rate, stcg_rate
-        )
+        # Total harvestable benefit, shared by recommendations and interpretation
+        total_tlh_benefit = sum(opp["tax_benefit"] for opp in tlh_opportunities)
 
         # Generate recommendations
         recommendations = _generate_recommendations(
-            tlh_opportunities, wash_sales, gains_losses, tax_bracket
+            tlh_opportunities, wash_sales, gains_losses, tax_bracket, total_tlh_benefit
         )
 
         # Interpretation
         interpretation = _generate_interpretation(
-            tlh_opportunities, wash_sales, gains_losses, recommendations
+            tlh_opportunities, wash_sales, gains_losses, recommendations, total_tlh_benefit
         )
 
         return {
@@ -178,9 +281,61 @@ async def tax_optimizer(
         }
 
 
+@functools.lru_cache(maxsize=128)
+def _cached_load_prices(
+    tickers: Tuple[str, ...],
+    start_date: str,
+    end_date: str,
+    ttl_bucket: int
+) -> pd.DataFrame:
+    """
+    Load the price window used to fill in missing current prices.
+
+    Cached per (ticker set, window); ttl_bucket is part of the key so entries
+    expire after PRICE_CACHE_TTL_SECONDS. Callers must not mutate the result.
+    """
+    return load_stock_prices(list(tickers), start_date=start_date, end_date=end_date)
+
+
+async def _load_latest_prices(
+    tickers: List[str],
+    start_date: str,
+    end_date: str
+) -> Dict[str, float]:
+    """
+    Load the last close in the window for each ticker.
+
+    Tickers are loaded concurrently in worker threads, at most
+    PRICE_FETCH_CONCURRENCY at a time. Tickers without data are omitted.
+    """
+    ttl_bucket = int(time.monotonic() // PRICE_CACHE_TTL_SECONDS)
+    semaphore = asyncio.Semaphore(PRICE_FETCH_CONCURRENCY)
+
+    async def load(ticker: str) -> Optional[pd.DataFrame]:
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(
+                    _cached_load_prices, (ticker,), start_date, end_date, ttl_bucket
+                )
+            except ValueError:
+                # load_stock_prices raises when the ticker has no data
+                return None
+
+    frames = await asyncio.gather(*(load(ticker) for ticker in tickers))
+
+    latest = {}
+    for ticker, prices in zip(tickers, frames):
+        if prices is None or ticker not in prices.columns:
+            continue
+        ticker_prices = prices[ticker].dropna()
+        if len(ticker_prices) > 0:
+            latest[ticker] = float(ticker_prices.iloc[-1])
+
+    return latest
+
+
 def _find_tax_loss_harvest_opportunities(
-    positions: Dict[str, Dict],
-    current_date: datetime,
+    lots: TaxLotsSoA,
     stcg_rate: float,
     ltcg_rate: float,
     harvest_threshold: float
@@ -188,58 +343,102 @@ def _find_tax_loss_harvest_opportunities(
     """
     Find positions with unrealized losses suitable for harvesting.
     """
-    opportunities = []
+    unrealized_gl = lots.unrealized_gl
+    is_long_term = lots.is_long_term
 
-    for ticker, pos in positions.items():
-        shares = pos.get("shares", 0)
-        cost_basis = pos.get("cost_basis", 0)
-        current_price = pos.get("current_price", 0)
-        purchase_date = pos.get("purchase_date")
+    loss_pct, tax_benefit, harvestable = _compute_harvest_arrays(
+        unrealized_gl, lots.total_cost, is_long_term, stcg_rate, ltcg_rate, harvest_threshold
+    )
 
-        if not purchase_date or shares <= 0:
-            continue
+    # Pull the hits out as plain Python scalars before building dicts
+    hits = np.flatnonzero(harvestable)
 
-        purchase_dt = pd.to_datetime(purchase_date)
+    opportunities = [
+        {
+            "ticker": lots.tickers[i],
+            "shares": lots.lots[i]["shares"],
+            "cost_basis": lots.lots[i].get("cost_basis", 0),
+            "current_price": lots.lots[i].get("current_price", 0),
+            "unrealized_loss": round(gl, 2),
+            "loss_percentage": round(pct, 4),
+            "tax_benefit": round(benefit, 2),
+            "holding_period": "long" if long_term else "short",
+            "holding_days": days,
+            "purchase_date": lots.lots[i]["purchase_date"]
+        }
+        for i, gl, pct, benefit, long_term, days in zip(
+            hits.tolist(),
+            unrealized_gl[hits].tolist(),
+            loss_pct[hits].tolist(),
+            tax_benefit[hits].tolist(),
+            is_long_term[hits].tolist(),
+            lots.holding_days[hits].tolist()
+        )
+    ]
 
-        # Calculate gain/loss
-        total_cost = shares * cost_basis
-        current_value = shares * current_price
-        unrealized_gl = current_value - total_cost
+    # Sort by tax benefit (highest first)
+    opportunities.sort(key=lambda x: x["tax_benefit"], reverse=True)
 
-        # Only harvest losses
-        if unrealized_gl >= 0:
-            continue
+    return opportunities
+
+
+def _compute_harvest_arrays(
+    unrealized_gl: np.ndarray,
+    total_cost: np.ndarray,
+    is_long_term: np.ndarray,
+    stcg_rate: float,
+    ltcg_rate: float,
+    harvest_threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute loss percentage, tax benefit and the harvestable mask per lot.
 
-        # Check if loss exceeds threshold
+    Dispatches to the numba kernel for large lot counts when available.
+    """
+    if NUMBA_AVAILABLE and len(unrealized_gl) >= NUMBA_MIN_LOTS:
+        return _compute_harvest_arrays_jit(
+            unrealized_gl, total_cost, is_long_term, stcg_rate, ltcg_rate, harvest_threshold
+        )
+
+    # Only harvest losses that exceed the threshold
+    with np.errstate(divide="ignore", invalid="ignore"):
         loss_pct = unrealized_gl / total_cost
-        if abs(loss_pct) < harvest_threshold:
-            continue
+    harvestable = (unrealized_gl < 0) & (np.abs(loss_pct) >= harvest_threshold)
 
-        # Determine holding period
-        holding_days = (current_date - purchase_dt).days
-        holding_period = "long" if holding_days >= 365 else "short"
-
-        # Tax benefit calculation
-        tax_rate = ltcg_rate if holding_period == "long" else stcg_rate
-        tax_benefit = abs(unrealized_gl) * tax_rate
-
-        opportunities.append({
-            "ticker": ticker,
-            "shares": shares,
-            "cost_basis": cost_basis,
-            "current_price": current_price,
-            "unrealized_loss": round(unrealized_gl, 2),
-            "loss_percentage": round(loss_pct, 4),
-            "tax_benefit": round(tax_benefit, 2),
-            "holding_period": holding_period,
-            "holding_days": holding_days,
-            "purchase_date": purchase_date
-        })
+    # Tax benefit at the rate for each lot's holding period
+    tax_benefit = np.abs(unrealized_gl) * np.where(is_long_term, ltcg_rate, stcg_rate)
 
-    # Sort by tax benefit (highest first)
-    opportunities.sort(key=lambda x: x["tax_benefit"], reverse=True)
+    return loss_pct, tax_benefit, harvestable
 
-    return opportunities
+
+def _compute_harvest_arrays_loop(
+    unrealized_gl: np.ndarray,
+    total_cost: np.ndarray,
+    is_long_term: np.ndarray,
+    stcg_rate: float,
+    ltcg_rate: float,
+    harvest_threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scalar-loop form of _compute_harvest_arrays, compiled with numba.
+    """
+    n = unrealized_gl.shape[0]
+    loss_pct = np.empty(n, dtype=np.float64)
+    tax_benefit = np.empty(n, dtype=np.float64)
+    harvestable = np.zeros(n, dtype=np.bool_)
+
+    for i in range(n):
+        gl = unrealized_gl[i]
+        loss_pct[i] = gl / total_cost[i]
+        tax_benefit[i] = abs(gl) * (ltcg_rate if is_long_term[i] else stcg_rate)
+        harvestable[i] = gl < 0 and abs(loss_pct[i]) >= harvest_threshold
+
+    return loss_pct, tax_benefit, harvestable
+
+
+if NUMBA_AVAILABLE:
+    # error_model="numpy": zero-cost lots give inf/nan like the NumPy path
+    _compute_harvest_arrays_jit = njit(cache=True, error_model="numpy")(_compute_harvest_arrays_loop)
 
 
 def _detect_wash_sales(
@@ -252,111 +451,88 @@ def _detect_wash_sales(
     A wash sale occurs when you sell a security at a loss and repurchase
     the same or substantially identical security within 30 days before or after.
     """
-    if not transactions:
+    if not transactions or not any("date" in txn for txn in transactions):
         return []
 
     wash_sales = []
 
-    # Convert to DataFrame for easier analysis
-    df = pd.DataFrame(transactions)
-
-    if df.empty or "date" not in df.columns:
-        return []
-
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date")
-
-    # Group by ticker
-    for ticker in df["ticker"].unique():
-        ticker_txns = df[df["ticker"] == ticker].copy()
-
-        # Find sells with losses
-        for idx, sell_txn in ticker_txns.iterrows():
-            if sell_txn.get("action") != "sell":
-                continue
-
-            # Check if it's a loss (requires cost basis tracking)
-            # For simplicity, we'll check for repurchases within 30 days
-
-            sell_date = sell_txn["date"]
-
-            # Look for purchases within 30 days before or after
-            window_start = sell_date - timedelta(days=30)
-            window_end = sell_date + timedelta(days=30)
+    dates = pd.to_datetime([txn.get("date") for txn in transactions]).values
+    tickers = np.array([txn["ticker"] for txn in transactions], dtype=object)
+    actions = np.array([txn.get("action") for txn in transactions], dtype=object)
+    shares = [txn.get("shares", 0) for txn in transactions]
+    date_strs = np.datetime_as_string(dates, unit="D").tolist()
+
+    # Sort by date, then partition by ticker in order of first appearance;
+    # factorize numbers tickers in that order with a single hash pass
+    order = np.argsort(dates, kind="stable")
+    codes, _ = pd.factorize(tickers[order])
+    group_order = np.argsort(codes, kind="stable")
+    order = order[group_order]
+    bounds = np.flatnonzero(np.diff(codes[group_order])) + 1
+
+    window = np.timedelta64(30, "D")
+    one_day = np.timedelta64(1, "D")
+
+    for block in np.split(order, bounds):
+        block_actions = actions[block]
+        buys = block[block_actions == "buy"]
+        sells = block[block_actions == "sell"]
+        if len(buys) == 0 or len(sells) == 0:
+            continue
 
-            repurchases = ticker_txns[
-                (ticker_txns["action"] == "buy") &
-                (ticker_txns["date"] >= window_start) &
-                (ticker_txns["date"] <= window_end) &
-                (ticker_txns["date"] != sell_date)
-            ]
+        ticker = tickers[block[0]]
+        buy_dates = dates[buys]
 
-            for _, buy_txn in repurchases.iterrows():
-                days_apart = abs((buy_txn["date"] - sell_date).days)
+        # Look for purchases within 30 days before or after each sale
+        lo = np.searchsorted(buy_dates, dates[sells] - window, side="left")
+        hi = np.searchsorted(buy_dates, dates[sells] + window, side="right")
 
-                # Estimate disallowed loss (would need actual cost basis)
-                shares_sold = sell_txn.get("shares", 0)
-                shares_bought = buy_txn.get("shares", 0)
+        for sell_idx, start, stop in zip(sells.tolist(), lo.tolist(), hi.tolist()):
+            offsets = buy_dates[start:stop] - dates[sell_idx]
 
-                wash_shares = min(shares_sold, shares_bought)
+            # Same-day buys are not repurchases
+            repurchased = offsets != np.timedelta64(0)
+            shares_sold = shares[sell_idx]
 
-                # This is a simplified calculation
-                # Real wash sale requires tracking specific tax lots
-                wash_sales.append({
+            # Estimate disallowed loss (would need actual cost basis).
+            # This is a simplified calculation; real wash sale rules
+            # require tracking specific tax lots
+            wash_sales.extend([
+                {
                     "ticker": ticker,
-                    "sale_date": sell_date.strftime("%Y-%m-%d"),
-                    "repurchase_date": buy_txn["date"].strftime("%Y-%m-%d"),
-                    "days_apart": days_apart,
-                    "shares_affected": wash_shares,
+                    "sale_date": date_strs[sell_idx],
+                    "repurchase_date": date_strs[buy_idx],
+                    "days_apart": abs(days),
+                    "shares_affected": min(shares_sold, shares[buy_idx]),
                     "warning": "Potential wash sale - loss may be disallowed"
-                })
+                }
+                for buy_idx, days in zip(
+                    buys[start:stop][repurchased].tolist(),
+                    (offsets[repurchased] // one_day).tolist()
+                )
+            ])
 
     return wash_sales
 
 
 def _calculate_gains_losses(
-    positions: Dict[str, Dict],
-    current_date: datetime,
+    lots: TaxLotsSoA,
     ltcg_rate: float,
     stcg_rate: float
 ) -> Dict[str, float]:
     """
     Calculate total unrealized gains/losses and potential tax.
     """
-    lt_gains = 0  # Long-term gains
-    st_gains = 0  # Short-term gains
-    total_gains = 0
-    total_losses = 0
-
-    for ticker, pos in positions.items():
-        shares = pos.get("shares", 0)
-        cost_basis = pos.get("cost_basis", 0)
-        current_price = pos.get("current_price", 0)
-        purchase_date = pos.get("purchase_date")
-
-        if not purchase_date or shares <= 0:
-            continue
-
-        purchase_dt = pd.to_datetime(purchase_date)
+    unrealized_gl = lots.unrealized_gl
 
-        # Calculate gain/loss
-        total_cost = shares * cost_basis
-        current_value = shares * current_price
-        unrealized_gl = current_value - total_cost
-
-        # Determine holding period
-        holding_days = (current_date - purchase_dt).days
-        is_long_term = holding_days >= 365
-
-        if is_long_term:
-            lt_gains += unrealized_gl
-        else:
-            st_gains += unrealized_gl
+    # Split by holding period and by sign as dot products with 0/1 weights
+    is_long_term = lots.is_long_term.astype(np.float64)
+    is_gain = (unrealized_gl > 0).astype(np.float64)
 
-        if unrealized_gl > 0:
-            total_gains += unrealized_gl
-        else:
-            total_losses += unrealized_gl
+    lt_gains = float(np.vdot(unrealized_gl, is_long_term))  # Long-term gains
+    st_gains = float(np.vdot(unrealized_gl, 1.0 - is_long_term))  # Short-term gains
+    total_gains = float(np.vdot(unrealized_gl, is_gain))
+    total_losses = float(np.vdot(unrealized_gl, 1.0 - is_gain))
 
     # Potential tax on gains (or savings from losses)
     lt_tax = max(0, lt_gains) * ltcg_rate
@@ -384,7 +560,8 @@ def _generate_recommendations(
     tlh_opportunities: List[Dict],
     wash_sales: List[Dict],
     gains_losses: Dict,
-    tax_bracket: float
+    tax_bracket: float,
+    total_benefit: float
 ) -> List[str]:
     """
     Generate actionable tax optimization recommendations.
@@ -394,7 +571,6 @@ def _generate_recommendations(
     # Tax loss harvesting
     if tlh_opportunities:
         top_opportunity = tlh_opportunities[0]
-        total_benefit = sum(opp["tax_benefit"] for opp in tlh_opportunities)
 
         recommendations.append(
             f"Consider harvesting {len(tlh_opportunities)} positions with losses "
@@ -445,50 +621,68 @@ def _generate_interpretation(
     tlh_opportunities: List[Dict],
     wash_sales: List[Dict],
     gains_losses: Dict,
-    recommendations: List[str]
+    recommendations: List[str],
+    total_benefit: float
 ) -> str:
     """
     Generate human-readable interpretation.
     """
-    total_unrealized = gains_losses["total_gains"] + gains_losses["total_losses"]
-
-    interpretation = (
-        f"Portfolio has ${total_unrealized:.2f} in unrealized gains/losses. "
+    return _interpretation_cached(
+        len(tlh_opportunities),
+        len(wash_sales),
+        gains_losses["total_gains"] + gains_losses["total_losses"],
+        gains_losses["lt_gains"],
+        gains_losses["st_gains"],
+        total_benefit
     )
 
-    if tlh_opportunities:
-        total_benefit = sum(opp["tax_benefit"] for opp in tlh_opportunities)
-        interpretation += (
+
+@functools.lru_cache(maxsize=512)
+def _interpretation_cached(
+    num_tlh: int,
+    num_wash_sales: int,
+    total_unrealized: float,
+    lt_gains: float,
+    st_gains: float,
+    total_benefit: float
+) -> str:
+    """
+    Build the interpretation text from the figures it reports.
+
+    Keyed on exact values rather than the mutable result dicts, so
+    re-rendering the same portfolio reuses the string.
+    """
+    # Collect sentences and join once instead of growing a string
+    parts = [f"Portfolio has ${total_unrealized:.2f} in unrealized gains/losses. "]
+
+    if num_tlh:
+        parts.append(
             f"Tax loss harvesting could save ${total_benefit:.2f} in taxes "
-            f"by realizing {len(tlh_opportunities)} losing positions. "
+            f"by realizing {num_tlh} losing positions. "
         )
     else:
-        interpretation += "No tax loss harvesting opportunities identified. "
+        parts.append("No tax loss harvesting opportunities identified. ")
 
-    if wash_sales:
-        interpretation += (
-            f"Warning: {len(wash_sales)} potential wash sale violations may disallow losses. "
+    if num_wash_sales:
+        parts.append(
+            f"Warning: {num_wash_sales} potential wash sale violations may disallow losses. "
         )
 
-    lt_gains = gains_losses["lt_gains"]
-    st_gains = gains_losses["st_gains"]
-
     if lt_gains > st_gains:
-        interpretation += (
+        parts.append(
             f"Portfolio is tax-efficient with ${lt_gains:.2f} in long-term gains "
             f"vs ${st_gains:.2f} in short-term gains. "
         )
     elif st_gains > 0:
-        interpretation += (
+        parts.append(
             f"Portfolio has ${st_gains:.2f} in short-term gains subject to higher tax rates. "
         )
 
-    return interpretation
+    return "".join(parts)
 
 
 # Example usage
 if __name__ == "__main__":
-    import asyncio
     logging.basicConfig(level=logging.INFO)
 
     async def test():
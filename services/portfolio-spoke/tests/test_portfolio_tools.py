@@ -5,6 +5,7 @@ Tests for portfolio optimization and rebalancing tools.
 """
 
 import asyncio
+import importlib
 import sys
 from pathlib import Path
 import logging
@@ -13,8 +14,11 @@ import logging
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir / "app"))
 
-from tools.portfolio_optimizer import portfolio_optimizer
-from tools.portfolio_rebalancer import portfolio_rebalancer
+from tools.portfolio_optimizer import portfolio_optimizer, _optimize_mean_variance, _factor_covariance
+from tools.portfolio_rebalancer import portfolio_rebalancer, PositionsSoA
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
 
 # Configure logging
 logging.basicConfig(
@@ -167,9 +171,54 @@ async def test_portfolio_optimizer_risk_parity():
         return False
 
 
+async def test_portfolio_optimizer_closed_form():
+    """
+    Test 5: Portfolio Optimizer - Closed-Form Max Sharpe / Min Volatility
+
+    The analytic tangency and minimum-variance weights (and the clipped
+    warm start when a weight cap binds) must match a plain SLSQP solve.
+    """
+    print_test_header("Portfolio Optimizer - Closed Form vs SLSQP")
+
+    tickers = ["A", "B", "C", "D"]
+    vols = np.array([0.20, 0.25, 0.15, 0.30])
+    corr = np.full((4, 4), 0.3)
+    np.fill_diagonal(corr, 1.0)
+    S = pd.DataFrame(np.outer(vols, vols) * corr, index=tickers, columns=tickers)
+    mu = pd.Series([0.10, 0.12, 0.08, 0.15], index=tickers)
+    risk_free_rate = 0.02
+
+    objectives = {
+        "max_sharpe": lambda w: -(w @ mu.values - risk_free_rate) / np.sqrt(w @ S.values @ w),
+        "min_volatility": lambda w: np.sqrt(w @ S.values @ w),
+    }
+
+    for objective, func in objectives.items():
+        for constraints, max_w in ((None, 1.0), ({"max_weight": 0.3}, 0.3)):
+            weights, _ = _optimize_mean_variance(
+                mu, S, tickers, objective, None, None, constraints, risk_free_rate
+            )
+            reference = minimize(
+                func, np.ones(4) / 4, method="SLSQP",
+                bounds=[(0, max_w)] * 4,
+                constraints=[{"type": "eq", "fun": lambda w: np.sum(w) - 1}],
+                options={"maxiter": 1000, "ftol": 1e-12}
+            ).x
+            assert np.allclose(weights, reference, atol=1e-4), (
+                f"{objective} (max_weight={max_w}): {weights} != {reference}"
+            )
+
+    # Indefinite matrices fall back from Cholesky to LU
+    solve = _factor_covariance(np.array([[1.0, 2.0], [2.0, 1.0]]))
+    assert np.allclose(solve(np.array([3.0, 3.0])), [1.0, 1.0])
+
+    print_result(True, "Closed-form weights match SLSQP")
+    return True
+
+
 async def test_portfolio_rebalancer_threshold():
     """
-    Test 5: Portfolio Rebalancer - Threshold Strategy
+    Test 6: Portfolio Rebalancer - Threshold Strategy
     """
     print_test_header("Portfolio Rebalancer - Threshold Strategy")
 
@@ -222,7 +271,7 @@ async def test_portfolio_rebalancer_threshold():
 
 async def test_portfolio_rebalancer_no_rebalance():
     """
-    Test 6: Portfolio Rebalancer - No Rebalancing Needed
+    Test 7: Portfolio Rebalancer - No Rebalancing Needed
     """
     print_test_header("Portfolio Rebalancer - No Rebalancing Needed")
 
@@ -261,6 +310,131 @@ async def test_portfolio_rebalancer_no_rebalance():
         return False
 
 
+async def test_portfolio_rebalancer_expected_trades():
+    """
+    Test 8: Portfolio Rebalancer - Exact Trades
+
+    Pins the PositionsSoA-based trade list, cash flows and drift to the
+    values of the original per-ticker implementation.
+    """
+    print_test_header("Portfolio Rebalancer - Expected Trades")
+
+    current_positions = {
+        "AAPL": {"shares": 120, "value": 22200, "price": 185.00},
+        "MSFT": {"shares": 30, "value": 12600, "price": 420.00},
+        "GOOGL": {"shares": 40, "value": 6000, "price": 150.00},
+        "KO": {"shares": 50, "value": 3000, "price": 60.00}
+    }
+
+    result = await portfolio_rebalancer(
+        current_positions=current_positions,
+        target_weights={"AAPL": 0.25, "MSFT": 0.40, "GOOGL": 0.35},
+        total_value=43800,
+        constraints={"no_sell_list": ["KO"]}
+    )
+
+    trades = [(t["ticker"], t["action"], t["shares"], t["value"]) for t in result["trades"]]
+    # Sells come first, then buys
+    assert trades == [
+        ("AAPL", "sell", 60, 11100.0),
+        ("GOOGL", "buy", 62, 9300.0),
+        ("MSFT", "buy", 11, 4620.0),
+    ], f"Unexpected trades: {trades}"
+    assert result["cash_required"] == 13920.0
+    assert result["cash_generated"] == 11100.0
+    assert result["total_cost"] == 25.02
+    assert result["turnover"] == 0.5712
+    assert result["drift_after"] == {"AAPL": 0.0034, "GOOGL": -0.0007, "KO": 0.0685, "MSFT": -0.0068}
+
+    # Tickers without a position hold nothing and fall back to a $100 price
+    positions = PositionsSoA.from_dict(
+        current_positions, ("AAPL", "JNJ", "KO"), {"AAPL": 185.0, "KO": 60.0}
+    )
+    assert positions.shares.tolist() == [120.0, 0.0, 50.0]
+    assert positions.values.tolist() == [22200.0, 0.0, 3000.0]
+    assert positions.prices.tolist() == [185.0, 100.0, 60.0]
+
+    print_result(True, "Trades match")
+    return True
+
+
+async def test_portfolio_rebalancer_fractional_sell():
+    """
+    Test 9: Portfolio Rebalancer - Selling a Fractional Holding
+
+    Sells are capped at the shares actually held, so a fractional holding
+    can be sold in full rather than leaving a remainder behind.
+    """
+    print_test_header("Portfolio Rebalancer - Fractional Sell")
+
+    result = await portfolio_rebalancer(
+        current_positions={
+            "AAPL": {"shares": 9.7, "value": 1050.0, "price": 100.00},
+            "MSFT": {"shares": 10, "value": 1000.0, "price": 100.00}
+        },
+        target_weights={"AAPL": 0.01, "MSFT": 0.99},
+        total_value=2050
+    )
+
+    sells = [t for t in result["trades"] if t["action"] == "sell"]
+    assert len(sells) == 1 and sells[0]["ticker"] == "AAPL", f"Expected an AAPL sell: {sells}"
+    assert sells[0]["shares"] == 9.7, f"Should sell the whole 9.7 shares, got {sells[0]['shares']}"
+    assert sells[0]["value"] == 970.0
+
+    print_result(True, "Fractional holding sold in full")
+    return True
+
+
+async def test_portfolio_rebalancer_concurrent_bad_ticker():
+    """
+    Test 10: Portfolio Rebalancer - Concurrent Requests With a Bad Ticker
+
+    Price lookups from concurrent requests share one batch; an unknown
+    ticker in one request must not push the other onto placeholder prices.
+    """
+    print_test_header("Portfolio Rebalancer - Concurrent Bad Ticker")
+
+    rebalancer_module = importlib.import_module("tools.portfolio_rebalancer")
+    latest_closes = {"AAPL": 190.0, "MSFT": 410.0}
+
+    def fake_load_stock_prices(tickers, column="Close", **kwargs):
+        # Same contract as the CSV loader: unknown tickers are skipped and
+        # a request with no known tickers raises
+        data = {t: [latest_closes[t]] for t in tickers if t in latest_closes}
+        if not data:
+            raise ValueError("No valid stock data loaded. Check ticker symbols and CSV files.")
+        return pd.DataFrame(data)
+
+    original_loader = rebalancer_module.load_stock_prices
+    rebalancer_module.load_stock_prices = fake_load_stock_prices
+    rebalancer_module._fetch_latest_price.cache_clear()
+    try:
+        bad_request, good_request = await asyncio.gather(
+            portfolio_rebalancer(
+                current_positions={"NOPE": {"shares": 10}},
+                target_weights={"NOPE": 0.5, "AAPL": 0.5},
+                total_value=10000
+            ),
+            portfolio_rebalancer(
+                current_positions={"AAPL": {"shares": 10}},
+                target_weights={"AAPL": 0.5, "MSFT": 0.5},
+                total_value=10000
+            )
+        )
+    finally:
+        rebalancer_module.load_stock_prices = original_loader
+        rebalancer_module._fetch_latest_price.cache_clear()
+
+    good_prices = {t["ticker"]: t["price"] for t in good_request["trades"]}
+    assert good_prices == latest_closes, f"Good request got wrong prices: {good_prices}"
+
+    bad_prices = {t["ticker"]: t["price"] for t in bad_request["trades"]}
+    assert bad_prices == {"AAPL": 190.0, "NOPE": 100.0}, f"Unexpected prices: {bad_prices}"
+
+    print_result(True, "Bad ticker isolated to its own request")
+    return True
+
+
 async def run_all_tests():
     """
     Run all tests.
@@ -274,8 +448,12 @@ async def run_all_tests():
         ("Portfolio Optimizer - Min Volatility", test_portfolio_optimizer_min_volatility),
         ("Portfolio Optimizer - HRP", test_portfolio_optimizer_hrp),
         ("Portfolio Optimizer - Risk Parity", test_portfolio_optimizer_risk_parity),
+        ("Portfolio Optimizer - Closed Form", test_portfolio_optimizer_closed_form),
         ("Portfolio Rebalancer - Threshold", test_portfolio_rebalancer_threshold),
         ("Portfolio Rebalancer - No Rebalance", test_portfolio_rebalancer_no_rebalance),
+        ("Portfolio Rebalancer - Expected Trades", test_portfolio_rebalancer_expected_trades),
+        ("Portfolio Rebalancer - Fractional Sell", test_portfolio_rebalancer_fractional_sell),
+        ("Portfolio Rebalancer - Concurrent Bad Ticker", test_portfolio_rebalancer_concurrent_bad_ticker),
     ]
 
     results = []
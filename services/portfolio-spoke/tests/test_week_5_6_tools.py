@@ -8,13 +8,14 @@ import asyncio
 import sys
 from pathlib import Path
 import logging
+from datetime import datetime
 
 # Add parent directory to path
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir / "app"))
 
 from tools.asset_allocator import asset_allocator
-from tools.tax_optimizer import tax_optimizer
+from tools.tax_optimizer import tax_optimizer, TaxLotsSoA
 from tools.portfolio_dashboard import portfolio_dashboard
 
 # Configure logging
@@ -157,6 +158,100 @@ async def test_tax_optimizer():
         return False
 
 
+async def test_tax_optimizer_mixed_date_formats():
+    """
+    Test 2b: Tax Optimizer with purchase dates in different formats
+
+    Lots are parsed in one batch, so every format must still be accepted.
+    """
+    print_test_header("Tax Optimizer - Mixed Date Formats")
+
+    positions = {
+        "AAPL": {"shares": 10, "cost_basis": 100, "current_price": 120, "purchase_date": "2023-06-15"},
+        "MSFT": {"shares": 10, "cost_basis": 300, "current_price": 250, "purchase_date": "2023-06-15 10:30"},
+        "TSLA": {"shares": 5, "cost_basis": 200, "current_price": 260, "purchase_date": "06/15/2023"},
+    }
+
+    result = await tax_optimizer(
+        positions=positions,
+        transactions=[],
+        current_date="2024-06-15"
+    )
+
+    assert "error" not in result, f"Unexpected error: {result.get('error')}"
+    assert result["total_unrealized_gains"] == 500.0, "AAPL and TSLA gains should both count"
+
+    harvest = result["tax_loss_harvest_opportunities"]
+    assert [opp["ticker"] for opp in harvest] == ["MSFT"], "MSFT loss should be harvestable"
+    assert harvest[0]["holding_days"] == 365, "Time of day should not change holding days"
+    assert harvest[0]["holding_period"] == "long", "365 days counts as long-term"
+
+    print_result(True, "Mixed date formats parsed")
+    return True
+
+
+async def test_tax_optimizer_expected_values():
+    """
+    Test 2c: Tax Optimizer - Exact Figures
+
+    Pins the array-based harvesting, gains/losses and wash-sale results to
+    the values of the original per-position implementation.
+    """
+    print_test_header("Tax Optimizer - Expected Values")
+
+    positions = {
+        "AAPL": {"shares": 100, "cost_basis": 150, "current_price": 185, "purchase_date": "2023-01-15"},
+        "TSLA": {"shares": 50, "cost_basis": 250, "current_price": 200, "purchase_date": "2024-03-01"},
+        "MSFT": {"shares": 75, "cost_basis": 300, "current_price": 420, "purchase_date": "2022-06-01"},
+        "NFLX": {"shares": 20, "cost_basis": 600, "current_price": 450, "purchase_date": "2022-01-10"},
+    }
+    transactions = [
+        {"date": "2024-01-15", "ticker": "AAPL", "shares": 50, "price": 160, "action": "sell"},
+        {"date": "2024-01-20", "ticker": "AAPL", "shares": 50, "price": 155, "action": "buy"},
+        {"date": "2024-05-20", "ticker": "TSLA", "shares": 10, "price": 210, "action": "buy"},
+    ]
+
+    result = await tax_optimizer(
+        positions=positions,
+        transactions=transactions,
+        current_date="2024-06-01"
+    )
+
+    assert result["long_term_gains"] == 9500.0
+    assert result["short_term_gains"] == -2500.0
+    assert result["total_unrealized_gains"] == 12500.0
+    assert result["total_unrealized_losses"] == -5500.0
+    assert result["potential_tax_savings"] == 600.0
+
+    harvest = [
+        (o["ticker"], o["holding_period"], o["holding_days"], o["unrealized_loss"], o["tax_benefit"])
+        for o in result["tax_loss_harvest_opportunities"]
+    ]
+    assert harvest == [
+        ("TSLA", "short", 92, -2500.0, 600.0),
+        ("NFLX", "long", 873, -3000.0, 450.0),
+    ], f"Unexpected harvest list: {harvest}"
+
+    warnings = [(w["ticker"], w["days_apart"], w["shares_affected"]) for w in result["wash_sale_warnings"]]
+    assert warnings == [("AAPL", 5, 50)], f"Unexpected wash sales: {warnings}"
+
+    # Lots without a purchase date or with no shares are skipped
+    lots = TaxLotsSoA.from_dict(
+        {
+            **positions,
+            "NODATE": {"shares": 10, "cost_basis": 10, "current_price": 5},
+            "EMPTY": {"shares": 0, "cost_basis": 10, "current_price": 5, "purchase_date": "2023-01-01"},
+        },
+        datetime(2024, 6, 1)
+    )
+    assert lots.tickers == ("AAPL", "TSLA", "MSFT", "NFLX")
+    assert lots.unrealized_gl.tolist() == [3500.0, -2500.0, 9000.0, -3000.0]
+    assert lots.is_long_term.tolist() == [True, False, True, True]
+
+    print_result(True, "Tax figures match")
+    return True
+
+
 async def test_portfolio_dashboard():
     """
     Test 3: Portfolio Dashboard
@@ -237,6 +332,8 @@ async def run_all_tests():
     tests = [
         ("Asset Allocator", test_asset_allocator),
         ("Tax Optimizer", test_tax_optimizer),
+        ("Tax Optimizer - Mixed Date Formats", test_tax_optimizer_mixed_date_formats),
+        ("Tax Optimizer - Expected Values", test_tax_optimizer_expected_values),
         ("Portfolio Dashboard", test_portfolio_dashboard),
     ]
 
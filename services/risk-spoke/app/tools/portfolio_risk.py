@@ -3,13 +3,150 @@ Portfolio Risk Analysis Tool
 Analyzes risk for a portfolio of multiple assets
 """
 
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Any, List
-from scipy import stats
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+# Optional: JIT-compiled drawdown kernel for long return histories
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Use the numba kernel (when installed) from this many observations upward;
+# below that the NumPy path is already faster than the call overhead
+NUMBA_MIN_OBSERVATIONS = 2048
+
+# Lower-tail standard normal quantiles, norm.ppf(1 - confidence), for the
+# usual VaR confidence levels; other levels fall back to scipy
+_NORMAL_QUANTILES = {
+    0.90: -1.2815515655446004,
+    0.95: -1.6448536269514722,
+    0.975: -1.959963984540054,
+    0.99: -2.3263478740408408,
+}
+
+# Shared pool for concurrent CSV parses; threads are only spawned on first use
+PRICE_LOAD_WORKERS = 8
+_price_load_pool = ThreadPoolExecutor(max_workers=PRICE_LOAD_WORKERS, thread_name_prefix="price-load")
+
+
+@functools.lru_cache(maxsize=64)
+def _load_close_prices(path: str, mtime_ns: int) -> Optional[pd.Series]:
+    """
+    Parse the Close column of a stock CSV, memoized per file.
+
+    The file's mtime is part of the key, so a refreshed CSV is parsed again.
+    Returns None when the file has no usable Close data. Callers must not
+    mutate the result.
+    """
+    df = pd.read_csv(
+        path, index_col=0, parse_dates=True, usecols=lambda col: col in ("Date", "Close")
+    )
+    if df.empty or 'Close' not in df.columns:
+        return None
+    return df['Close']
+
+
+def _align_closes(price_data: Dict[str, pd.Series]) -> pd.DataFrame:
+    """
+    Date-align close series into one price frame, one column per symbol.
+
+    Intersects the date indexes up front and stacks the columns directly
+    instead of outer-joining a dict of Series; rows with any gap are dropped.
+    """
+    closes = list(price_data.values())
+    common_idx = closes[0].index
+    for close in closes[1:]:
+        if not close.index.equals(common_idx):
+            common_idx = common_idx.intersection(close.index).sort_values()
+    prices = np.column_stack([
+        close.to_numpy() if close.index.equals(common_idx)
+        else close.reindex(common_idx).to_numpy()
+        for close in closes
+    ])
+    complete = ~np.isnan(prices).any(axis=1)
+    return pd.DataFrame(
+        prices[complete], index=common_idx[complete], columns=list(price_data)
+    )
+
+
+def _covariance_moments(asset_returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Covariance once; volatilities and correlations are derived from it"""
+    if asset_returns.shape[1] == 1:
+        # Single asset: the covariance is just the sample variance and
+        # there are no pairwise correlations to derive
+        cov_daily = np.array([[asset_returns[:, 0].var(ddof=1)]])
+        return cov_daily, np.sqrt(cov_daily[0]), np.ones((1, 1))
+
+    cov_daily = np.cov(asset_returns, rowvar=False)
+    sigma = np.sqrt(np.diag(cov_daily))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov_daily / np.outer(sigma, sigma)
+    return cov_daily, sigma, corr
+
+
+@functools.lru_cache(maxsize=16)
+def _universe_moments(sources: Tuple[Tuple[str, str, int], ...], period: int) -> Tuple[Optional[tuple], Optional[str]]:
+    """
+    Aligned prices, daily returns and covariance moments of a symbol universe.
+
+    `sources` holds one (symbol, path, mtime_ns) entry per symbol, so batches
+    over the same universe reuse the covariance until one of the CSVs
+    changes. Returns ((price_df, prices, asset_returns, cov_daily, sigma,
+    corr), None) or (None, error). Callers must not mutate the result.
+    """
+    price_df = _align_closes({
+        symbol: _load_close_prices(path, mtime_ns).tail(period)
+        for symbol, path, mtime_ns in sources
+    })
+    if len(price_df) < 30:
+        return None, f"Insufficient overlapping data: only {len(price_df)} days"
+
+    prices = price_df.to_numpy()
+    asset_returns = prices[1:] / prices[:-1] - 1
+    return (price_df, prices, asset_returns, *_covariance_moments(asset_returns)), None
+
+
+def _max_drawdown(returns: np.ndarray) -> float:
+    """
+    Largest peak-to-trough decline of the compounded return path (<= 0).
+
+    Dispatches to the numba kernel for long histories when numba is installed.
+    """
+    if NUMBA_AVAILABLE and len(returns) >= NUMBA_MIN_OBSERVATIONS:
+        return _max_drawdown_jit(returns)
+
+    cumulative = np.cumprod(1 + returns)
+    running_max = np.maximum.accumulate(cumulative)
+    return float(((cumulative - running_max) / running_max).min())
+
+
+def _max_drawdown_loop(returns: np.ndarray) -> float:
+    """
+    Single-pass, allocation-free form of _max_drawdown, compiled with numba.
+    """
+    cumulative = 1.0
+    peak = 0.0
+    max_dd = 0.0
+    for r in returns:
+        cumulative *= 1.0 + r
+        if cumulative > peak:
+            peak = cumulative
+        drawdown = (cumulative - peak) / peak
+        if drawdown < max_dd:
+            max_dd = drawdown
+    return max_dd
+
+
+if NUMBA_AVAILABLE:
+    _max_drawdown_jit = njit(cache=True)(_max_drawdown_loop)
+
 
 class PortfolioRiskTool:
     """Analyze risk for multi-asset portfolios"""
@@ -37,6 +174,11 @@ class PortfolioRiskTool:
                         },
                         "description": "Array of {symbol, weight} objects. Weights should sum to 1.0"
                     },
+                    "portfolios": {
+                        "type": "array",
+                        "items": {"type": "array", "items": {"type": "object"}},
+                        "description": "Several portfolios (each an array of {symbol, weight}) to analyze in one batch over a shared price history; used instead of portfolio"
+                    },
                     "period": {
                         "type": "integer",
                         "description": "Analysis period in days (default: 252)"
@@ -54,12 +196,15 @@ class PortfolioRiskTool:
                         "description": "Whether to rebalance portfolio periodically (default: false)"
                     }
                 },
-                "required": ["portfolio"]
+                "anyOf": [{"required": ["portfolio"]}, {"required": ["portfolios"]}]
             }
         }
 
     async def execute(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Execute portfolio risk analysis"""
+        if "portfolios" in arguments and "portfolio" not in arguments:
+            return await self.execute_batch(arguments)
+
         try:
             portfolio = arguments.get("portfolio", [])
             period = arguments.get("period", 252)
@@ -67,156 +212,305 @@ class PortfolioRiskTool:
             rf_rate = arguments.get("risk_free_rate", self.risk_free_rate)
             rebalance = arguments.get("rebalance", False)
 
-            # Validation
-            if not portfolio:
-                return {"error": "Portfolio must contain at least one asset"}
-
-            if len(portfolio) > 50:
-                return {"error": "Portfolio size limited to 50 assets"}
-
-            # Extract symbols and weights
-            symbols = [p.get("symbol", "").upper() for p in portfolio]
-            weights = np.array([p.get("weight", 0) for p in portfolio])
-
-            # Validate weights
-            if not np.isclose(weights.sum(), 1.0, atol=0.01):
-                return {"error": f"Weights must sum to 1.0 (currently: {weights.sum()})"}
-
-            if np.any(weights < 0):
-                return {"error": "Weights cannot be negative"}
-
-            if not all(symbols):
-                return {"error": "All portfolio items must have a symbol"}
-
-            # Load data for all symbols
-            price_data = {}
-            missing_symbols = []
-
-            for symbol in symbols:
-                data_file = self.data_dir / f"{symbol}.csv"
-                if not data_file.exists():
-                    missing_symbols.append(symbol)
-                    continue
-
-                df = pd.read_csv(data_file, index_col=0, parse_dates=True)
-                if df.empty or 'Close' not in df.columns:
-                    missing_symbols.append(symbol)
-                    continue
-
-                price_data[symbol] = df['Close'].tail(period)
-
-            if missing_symbols:
-                return {"error": f"Data not available for: {', '.join(missing_symbols)}"}
+            parsed = self._parse_portfolio(portfolio)
+            if "error" in parsed:
+                return parsed
+            symbols, weights = parsed["symbols"], parsed["weights"]
 
-            if len(price_data) < len(symbols):
-                return {"error": "Could not load all portfolio data"}
+            price_df, error = self._load_price_frame(symbols, period)
+            if error:
+                return {"error": error}
 
-            # Create aligned price matrix
-            price_df = pd.DataFrame(price_data)
-            price_df = price_df.dropna()
+            # All numeric work below runs on plain float64 arrays; pandas is only
+            # kept for the date index
+            prices = price_df.to_numpy()
+            first_prices, last_prices = prices[0], prices[-1]
 
-            if len(price_df) < 30:
-                return {"error": f"Insufficient overlapping data: only {len(price_df)} days"}
+            # Calculate returns matrix (same formula as pct_change, minus the
+            # leading NaN row)
+            asset_returns = prices[1:] / prices[:-1] - 1
 
-            # Calculate returns matrix
-            returns_df = price_df.pct_change().dropna()
-
-            # Calculate portfolio metrics
-            result = {
-                "portfolio": portfolio,
-                "period_days": len(price_df),
-                "start_date": price_df.index.min().isoformat(),
-                "end_date": price_df.index.max().isoformat(),
-                "rebalanced": rebalance,
-                "metrics": {}
-            }
+            cov_daily, sigma, corr = _covariance_moments(asset_returns)
 
             # Portfolio returns
             if rebalance:
                 # Rebalance daily - use weighted average of returns
-                portfolio_returns = (returns_df * weights).sum(axis=1)
+                portfolio_returns = asset_returns @ weights
             else:
                 # Buy and hold - calculate actual portfolio value changes
-                portfolio_value = (price_df / price_df.iloc[0] * weights).sum(axis=1)
-                portfolio_returns = portfolio_value.pct_change().dropna()
+                portfolio_value = (prices / first_prices) @ weights
+                portfolio_returns = portfolio_value[1:] / portfolio_value[:-1] - 1
 
-            # Basic return metrics
-            result["metrics"]["returns"] = self._calculate_portfolio_returns(
-                portfolio_returns, price_df, weights
+            return self._build_result(
+                portfolio, weights, list(price_df.columns), price_df.index, first_prices,
+                last_prices, portfolio_returns, cov_daily, sigma, corr, confidence, rf_rate, rebalance
             )
 
-            # Risk metrics
-            result["metrics"]["risk"] = self._calculate_portfolio_risk(
-                returns_df, weights, portfolio_returns
-            )
+        except Exception as e:
+            return {"error": f"Portfolio analysis failed: {str(e)}"}
 
-            # VaR calculation
-            result["metrics"]["var"] = self._calculate_portfolio_var(
-                portfolio_returns, confidence
-            )
+    async def execute_batch(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze several candidate portfolios over one shared price history.
+
+        Accepts the same options as execute() plus a "portfolios" list of
+        portfolio specs. Every unique symbol is loaded once, the covariance is
+        computed once for the whole universe (and cached until a CSV changes),
+        and the return series of all portfolios come from a single
+        returns x weights matrix product. Portfolios that are invalid or use a
+        symbol without data get their own error entry. All other portfolios
+        are evaluated on the dates common to their combined universe, so
+        results can differ from separate execute() calls when symbol histories
+        differ in length.
+        """
+        try:
+            portfolios = arguments.get("portfolios", [])
+            period = arguments.get("period", 252)
+            confidence = arguments.get("confidence_level", 0.95)
+            rf_rate = arguments.get("risk_free_rate", self.risk_free_rate)
+            rebalance = arguments.get("rebalance", False)
 
-            # Diversification metrics
-            result["metrics"]["diversification"] = self._calculate_diversification(
-                returns_df, weights
+            if not portfolios:
+                return {"error": "At least one portfolio is required"}
+
+            parsed = []
+            for portfolio in portfolios:
+                entry = self._parse_portfolio(portfolio)
+                if "error" not in entry:
+                    duplicates = sorted({s for s in entry["symbols"] if entry["symbols"].count(s) > 1})
+                    if duplicates:
+                        entry = {"error": f"Duplicate symbols in portfolio: {', '.join(duplicates)}"}
+                parsed.append(entry)
+
+            sources, missing = self._resolve_price_sources(sorted({
+                symbol for entry in parsed if "error" not in entry for symbol in entry["symbols"]
+            }))
+
+            # Only the portfolios that use a symbol without data fail on it
+            for i, entry in enumerate(parsed):
+                if "error" not in entry:
+                    unavailable = [s for s in entry["symbols"] if s in missing]
+                    if unavailable:
+                        parsed[i] = {"error": f"Data not available for: {', '.join(unavailable)}"}
+
+            # Invalid portfolios report their own error; the rest are filled in below
+            valid = [i for i, entry in enumerate(parsed) if "error" not in entry]
+            results = [entry if "error" in entry else None for entry in parsed]
+            if not valid:
+                return {"results": results}
+
+            universe = sorted({symbol for i in valid for symbol in parsed[i]["symbols"]})
+            moments, error = _universe_moments(
+                tuple((symbol, *sources[symbol]) for symbol in universe), period
             )
+            if error:
+                return {"error": error}
+            price_df, prices, asset_returns, cov_daily, sigma, corr = moments
+            first_prices, last_prices = prices[0], prices[-1]
+
+            # Zero-padded N x M weight matrix, one column per valid portfolio
+            column = {symbol: j for j, symbol in enumerate(universe)}
+            positions = [np.array([column[s] for s in parsed[i]["symbols"]]) for i in valid]
+            weight_matrix = np.zeros((len(universe), len(valid)))
+            for m, (i, idx) in enumerate(zip(valid, positions)):
+                weight_matrix[idx, m] = parsed[i]["weights"]
 
-            # Correlation analysis
-            result["metrics"]["correlation"] = self._calculate_correlation_metrics(
-                returns_df
-            )
+            if rebalance:
+                portfolio_returns = asset_returns @ weight_matrix
+            else:
+                portfolio_value = (prices / first_prices) @ weight_matrix
+                portfolio_returns = portfolio_value[1:] / portfolio_value[:-1] - 1
 
-            # Performance metrics
-            result["metrics"]["performance"] = self._calculate_performance_metrics(
-                portfolio_returns, rf_rate
-            )
+            for m, (i, idx) in enumerate(zip(valid, positions)):
+                block = np.ix_(idx, idx)
+                results[i] = self._build_result(
+                    portfolios[i], parsed[i]["weights"], parsed[i]["symbols"], price_df.index,
+                    first_prices[idx], last_prices[idx], np.ascontiguousarray(portfolio_returns[:, m]),
+                    cov_daily[block], sigma[idx], corr[block], confidence, rf_rate, rebalance
+                )
 
-            # Concentration risk
-            result["metrics"]["concentration"] = self._calculate_concentration_risk(
-                portfolio, weights
-            )
+            return {"results": results}
 
-            # Interpretation
-            result["interpretation"] = self._generate_portfolio_interpretation(
-                result["metrics"], weights
-            )
+        except Exception as e:
+            return {"error": f"Portfolio batch analysis failed: {str(e)}"}
+
+    def _parse_portfolio(self, portfolio: List[Dict]) -> Dict[str, Any]:
+        """Validate a portfolio spec and extract its symbols and weights"""
+        # Validation
+        if not portfolio:
+            return {"error": "Portfolio must contain at least one asset"}
+
+        if len(portfolio) > 50:
+            return {"error": "Portfolio size limited to 50 assets"}
+
+        # Extract symbols and weights
+        symbols = [p.get("symbol", "").upper() for p in portfolio]
+        weights = np.array([p.get("weight", 0) for p in portfolio])
+
+        # Validate weights
+        if not np.isclose(weights.sum(), 1.0, atol=0.01):
+            return {"error": f"Weights must sum to 1.0 (currently: {weights.sum()})"}
+
+        if np.any(weights < 0):
+            return {"error": "Weights cannot be negative"}
+
+        if not all(symbols):
+            return {"error": "All portfolio items must have a symbol"}
+
+        return {"symbols": symbols, "weights": weights}
+
+    def _resolve_price_sources(
+        self, symbols: List[str]
+    ) -> Tuple[Dict[str, Tuple[str, int]], List[str]]:
+        """
+        Locate and parse each symbol's CSV; returns (sources, missing_symbols).
+
+        `sources` maps every symbol with usable close data to the
+        (path, mtime_ns) key of its parsed series in _load_close_prices.
+        """
+        cache_keys = []
+        for symbol in symbols:
+            data_file = self.data_dir / f"{symbol}.csv"
+            try:
+                cache_keys.append((str(data_file), data_file.stat().st_mtime_ns))
+            except OSError:
+                cache_keys.append(None)
+
+        # The C parser releases the GIL, so cold CSV reads overlap across threads
+        existing = [key for key in cache_keys if key is not None]
+        if len(existing) > 1:
+            loaded = dict(zip(existing, _price_load_pool.map(lambda key: _load_close_prices(*key), existing)))
+        else:
+            loaded = {key: _load_close_prices(*key) for key in existing}
 
-            return result
+        sources = {}
+        missing_symbols = []
+        for symbol, key in zip(symbols, cache_keys):
+            if key is None or loaded.get(key) is None:
+                missing_symbols.append(symbol)
+            else:
+                sources[symbol] = key
+        return sources, missing_symbols
+
+    def _load_price_frame(
+        self, symbols: List[str], period: int
+    ) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """Load and date-align close prices; returns (price_df, error)"""
+        # Load data for all symbols
+        sources, missing_symbols = self._resolve_price_sources(symbols)
+        if missing_symbols:
+            return None, f"Data not available for: {', '.join(missing_symbols)}"
+
+        price_data = {symbol: _load_close_prices(*sources[symbol]).tail(period) for symbol in symbols}
+        if len(price_data) < len(symbols):
+            return None, "Could not load all portfolio data"
+
+        price_df = _align_closes(price_data)
+        if len(price_df) < 30:
+            return None, f"Insufficient overlapping data: only {len(price_df)} days"
+
+        return price_df, None
+
+    def _build_result(
+        self, portfolio: List[Dict], weights: np.ndarray, symbols: List[str], dates: pd.Index,
+        first_prices: np.ndarray, last_prices: np.ndarray, portfolio_returns: np.ndarray,
+        cov_daily: np.ndarray, sigma: np.ndarray, corr: np.ndarray, confidence: float,
+        rf_rate: float, rebalance: bool
+    ) -> Dict[str, Any]:
+        """Assemble all metric sections for one portfolio"""
+        # Calculate portfolio metrics
+        result = {
+            "portfolio": portfolio,
+            "period_days": len(dates),
+            "start_date": dates.min().isoformat(),
+            "end_date": dates.max().isoformat(),
+            "rebalanced": rebalance,
+            "metrics": {}
+        }
 
-        except Exception as e:
-            return {"error": f"Portfolio analysis failed: {str(e)}"}
+        # First two moments of the portfolio returns, shared by the helpers below
+        mean_return = portfolio_returns.mean()
+        std_return = portfolio_returns.std(ddof=1)
+
+        # Ex-ante (covariance-implied) annual volatility sqrt(w'Σw), fused
+        # into one pass over Σ and scaled to annual as a scalar
+        ex_ante_vol = np.sqrt(np.einsum('i,ij,j->', weights, cov_daily, weights) * 252)
+
+        # Basic return metrics
+        result["metrics"]["returns"] = self._calculate_portfolio_returns(
+            portfolio_returns, first_prices, last_prices, weights, symbols
+        )
+
+        # Risk metrics
+        result["metrics"]["risk"] = self._calculate_portfolio_risk(
+            sigma, weights, std_return, symbols
+        )
+
+        # VaR calculation
+        result["metrics"]["var"] = self._calculate_portfolio_var(
+            portfolio_returns, mean_return, std_return, confidence
+        )
+
+        # Diversification metrics
+        result["metrics"]["diversification"] = self._calculate_diversification(
+            ex_ante_vol, corr, sigma, weights
+        )
+
+        # Correlation analysis
+        result["metrics"]["correlation"] = self._calculate_correlation_metrics(
+            corr, symbols
+        )
+
+        # Performance metrics
+        result["metrics"]["performance"] = self._calculate_performance_metrics(
+            portfolio_returns, mean_return, std_return, rf_rate
+        )
+
+        # Concentration risk
+        result["metrics"]["concentration"] = self._calculate_concentration_risk(
+            portfolio, weights
+        )
+
+        # Interpretation
+        result["interpretation"] = self._generate_portfolio_interpretation(
+            result["metrics"], weights
+        )
+
+        return result
 
     def _calculate_portfolio_returns(
-        self, portfolio_returns: pd.Series, price_df: pd.DataFrame, weights: np.ndarray
+        self, portfolio_returns: np.ndarray, first_prices: np.ndarray, last_prices: np.ndarray,
+        weights: np.ndarray, symbols: List[str]
     ) -> Dict:
         """Calculate portfolio return metrics"""
-        total_return = (1 + portfolio_returns).prod() - 1
+        total_return = np.prod(1 + portfolio_returns) - 1
         days = len(portfolio_returns)
         years = days / 252
         annual_return = (1 + total_return) ** (1 / years) - 1 if years > 0 else 0
 
         # Calculate individual asset contributions
-        individual_returns = (price_df.iloc[-1] / price_df.iloc[0] - 1) * weights
-        contribution = individual_returns / individual_returns.sum() * 100 if individual_returns.sum() != 0 else np.zeros_like(weights)
+        individual_returns = (last_prices / first_prices - 1) * weights
+        total_individual = individual_returns.sum()
+        contribution = individual_returns / total_individual * 100 if total_individual != 0 else np.zeros_like(weights)
 
         return {
             "total_percent": round(total_return * 100, 2),
             "annualized_percent": round(annual_return * 100, 2),
             "cumulative_return": round(total_return, 4),
-            "asset_contributions": {
-                symbol: round(contrib, 2)
-                for symbol, contrib in zip(price_df.columns, contribution)
-            }
+            "asset_contributions": dict(
+                zip(symbols, np.round(contribution, 2).tolist())
+            )
         }
 
     def _calculate_portfolio_risk(
-        self, returns_df: pd.DataFrame, weights: np.ndarray, portfolio_returns: pd.Series
+        self, sigma: np.ndarray, weights: np.ndarray, std_return: float, symbols: List[str]
     ) -> Dict:
         """Calculate portfolio risk metrics"""
         # Portfolio volatility from actual returns
-        portfolio_vol = portfolio_returns.std() * np.sqrt(252)
+        portfolio_vol = std_return * np.sqrt(252)
 
         # Individual asset volatilities
-        asset_vols = returns_df.std() * np.sqrt(252)
+        asset_vols = sigma * np.sqrt(252)
 
         # Weighted average volatility (undiversified)
         weighted_avg_vol = (asset_vols * weights).sum()
@@ -229,26 +523,30 @@ class PortfolioRiskTool:
             "weighted_avg_volatility": round(weighted_avg_vol * 100, 2),
             "diversification_benefit": round(diversification_benefit * 100, 2),
             "volatility_reduction": round((diversification_benefit / weighted_avg_vol * 100), 2) if weighted_avg_vol > 0 else 0,
-            "asset_volatilities": {
-                symbol: round(vol * 100, 2)
-                for symbol, vol in zip(returns_df.columns, asset_vols)
-            }
+            "asset_volatilities": dict(
+                zip(symbols, np.round(asset_vols * 100, 2).tolist())
+            )
         }
 
-    def _calculate_portfolio_var(self, portfolio_returns: pd.Series, confidence: float) -> Dict:
+    def _calculate_portfolio_var(
+        self, returns: np.ndarray, mean_return: float, std_return: float, confidence: float
+    ) -> Dict:
         """Calculate portfolio VaR"""
-        # Historical VaR
-        sorted_returns = np.sort(portfolio_returns)
-        index = int((1 - confidence) * len(sorted_returns))
-        var_return = sorted_returns[index]
+        # Historical VaR: only the index-th order statistic and the tail below
+        # it are needed, so partition instead of fully sorting
+        index = int((1 - confidence) * len(returns))
+        partitioned = np.partition(returns, index)
+        var_return = partitioned[index]
 
         # CVaR
-        cvar_return = sorted_returns[:index].mean()
+        cvar_return = partitioned[:index].mean()
 
         # Parametric VaR
-        mean_return = portfolio_returns.mean()
-        std_return = portfolio_returns.std()
-        z_score = stats.norm.ppf(1 - confidence)
+        z_score = _NORMAL_QUANTILES.get(confidence)
+        if z_score is None:
+            # Deferred so importing this module does not pull in scipy.stats
+            from scipy.stats import norm
+            z_score = norm.ppf(1 - confidence)
         param_var = mean_return + z_score * std_return
 
         return {
@@ -259,32 +557,22 @@ class PortfolioRiskTool:
             "interpretation": f"With {confidence*100}% confidence, portfolio will not lose more than {abs(var_return)*100:.2f}% in one day"
         }
 
-    def _calculate_diversification(self, returns_df: pd.DataFrame, weights: np.ndarray) -> Dict:
+    def _calculate_diversification(
+        self, portfolio_vol: float, corr_values: np.ndarray, sigma: np.ndarray, weights: np.ndarray
+    ) -> Dict:
         """Calculate diversification metrics"""
-        # Correlation matrix
-        corr_matrix = returns_df.corr()
-
-        # Weighted average correlation
-        weighted_corr = 0
-        total_weight = 0
-        n = len(weights)
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                weight_product = weights[i] * weights[j]
-                weighted_corr += corr_matrix.iloc[i, j] * weight_product
-                total_weight += weight_product
+        # Weighted average correlation over distinct pairs (i < j): the full
+        # quadratic form w'Cw minus its diagonal counts each pair twice
+        w_sq = weights * weights
+        weighted_corr = (weights @ corr_values @ weights - w_sq @ np.diag(corr_values)) / 2
+        total_weight = (weights.sum() ** 2 - w_sq.sum()) / 2
 
         avg_correlation = weighted_corr / total_weight if total_weight > 0 else 0
 
         # Diversification ratio (Choueifaty)
-        asset_vols = returns_df.std() * np.sqrt(252)
+        asset_vols = sigma * np.sqrt(252)
         weighted_vol = (asset_vols * weights).sum()
 
-        cov_matrix = returns_df.cov() * 252
-        portfolio_var = np.dot(weights, np.dot(cov_matrix, weights))
-        portfolio_vol = np.sqrt(portfolio_var)
-
         div_ratio = weighted_vol / portfolio_vol if portfolio_vol > 0 else 1
 
         # Effective number of assets (inverse HHI of weights)
@@ -319,21 +607,10 @@ class PortfolioRiskTool:
 
         return f"{corr_msg}. {eff_msg} ({effective_n:.1f} effective assets from {actual_n} holdings)"
 
-    def _calculate_correlation_metrics(self, returns_df: pd.DataFrame) -> Dict:
+    def _calculate_correlation_metrics(self, corr_matrix: np.ndarray, symbols: List[str]) -> Dict:
         """Calculate correlation metrics"""
-        corr_matrix = returns_df.corr()
-
-        # Get all pairwise correlations
-        correlations = []
-        pairs = []
-
-        for i in range(len(corr_matrix)):
-            for j in range(i + 1, len(corr_matrix)):
-                correlations.append(corr_matrix.iloc[i, j])
-                pairs.append(f"{corr_matrix.index[i]}-{corr_matrix.columns[j]}")
-
         # Handle single-asset portfolio (no pairwise correlations)
-        if len(correlations) == 0:
+        if len(corr_matrix) < 2:
             return {
                 "average_correlation": None,
                 "median_correlation": None,
@@ -343,48 +620,53 @@ class PortfolioRiskTool:
                 "note": "Single-asset portfolio - no correlation data"
             }
 
-        correlations = np.array(correlations)
+        # Upper-triangle pairwise correlations; pair labels are only built for
+        # the handful of entries that end up in the output
+        rows, cols = np.triu_indices(len(corr_matrix), k=1)
+        correlations = corr_matrix[rows, cols]
+
+        def pair_label(k: int) -> str:
+            return f"{symbols[rows[k]]}-{symbols[cols[k]]}"
 
         # Find highest and lowest correlations
         max_idx = np.argmax(correlations)
         min_idx = np.argmin(correlations)
+        high_idx = np.flatnonzero(correlations > 0.7)[:5]  # Top 5
 
         return {
             "average_correlation": round(np.mean(correlations), 4),
             "median_correlation": round(np.median(correlations), 4),
             "max_correlation": {
                 "value": round(correlations[max_idx], 4),
-                "pair": pairs[max_idx]
+                "pair": pair_label(max_idx)
             },
             "min_correlation": {
                 "value": round(correlations[min_idx], 4),
-                "pair": pairs[min_idx]
+                "pair": pair_label(min_idx)
             },
             "high_correlation_pairs": [
-                {"pair": pair, "correlation": round(corr, 4)}
-                for pair, corr in zip(pairs, correlations)
-                if corr > 0.7
-            ][:5]  # Top 5
+                {"pair": pair_label(k), "correlation": round(correlations[k], 4)}
+                for k in high_idx
+            ]
         }
 
-    def _calculate_performance_metrics(self, portfolio_returns: pd.Series, rf_rate: float) -> Dict:
+    def _calculate_performance_metrics(
+        self, portfolio_returns: np.ndarray, mean_return: float, std_return: float, rf_rate: float
+    ) -> Dict:
         """Calculate portfolio performance metrics"""
-        annual_return = portfolio_returns.mean() * 252
-        annual_vol = portfolio_returns.std() * np.sqrt(252)
+        annual_return = mean_return * 252
+        annual_vol = std_return * np.sqrt(252)
 
         # Sharpe Ratio
         sharpe = (annual_return - rf_rate) / annual_vol if annual_vol > 0 else 0
 
         # Sortino Ratio
         downside_returns = portfolio_returns[portfolio_returns < 0]
-        downside_vol = downside_returns.std() * np.sqrt(252) if len(downside_returns) > 0 else annual_vol
+        downside_vol = downside_returns.std(ddof=1) * np.sqrt(252) if len(downside_returns) > 0 else annual_vol
         sortino = (annual_return - rf_rate) / downside_vol if downside_vol > 0 else 0
 
         # Maximum Drawdown
-        cumulative = (1 + portfolio_returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
-        max_dd = drawdown.min()
+        max_dd = _max_drawdown(portfolio_returns)
 
         # Calmar Ratio
         calmar = annual_return / abs(max_dd) if max_dd != 0 else 0
@@ -416,10 +698,14 @@ class PortfolioRiskTool:
         # Number of assets needed to have equal weight for same HHI
         equivalent_n = 1 / hhi if hhi > 0 else len(weights)
 
-        # Top N concentration
-        sorted_indices = np.argsort(weights)[::-1]
-        top3_weight = weights[sorted_indices[:min(3, len(weights))]].sum()
-        top5_weight = weights[sorted_indices[:min(5, len(weights))]].sum()
+        # Top N concentration: select the 5 largest in O(n), then order just those
+        k = min(5, len(weights))
+        top_indices = np.argpartition(weights, -k)[-k:]
+        sorted_indices = top_indices[np.argsort(weights[top_indices])[::-1]]
+        top3_weight = weights[sorted_indices[:3]].sum()
+        top5_weight = weights[sorted_indices].sum()
+
+        top_weights_pct = np.round(weights[sorted_indices] * 100, 2).tolist()
 
         return {
             "herfindahl_index": round(hhi, 4),
@@ -429,9 +715,9 @@ class PortfolioRiskTool:
             "largest_positions": [
                 {
                     "symbol": portfolio[i]["symbol"],
-                    "weight_percent": round(weights[i] * 100, 2)
+                    "weight_percent": weight_pct
                 }
-                for i in sorted_indices[:5]
+                for i, weight_pct in zip(sorted_indices, top_weights_pct)
             ],
             "interpretation": self._interpret_concentration(hhi, top3_weight)
         }
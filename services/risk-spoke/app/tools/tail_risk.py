@@ -3,19 +3,285 @@ Tail Risk Analyzer Tool
 Analyzes extreme losses and black swan events using Extreme Value Theory
 """
 
+import asyncio
+import bisect
+import copy
+import functools
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from scipy import stats
+from scipy.optimize import brentq
 from datetime import datetime
 
+# Optional: JIT-compiled loss statistics kernel
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Loss percentiles compared against the normal distribution in the fat-tail
+# analysis, and the sigma levels counted by the black swan analysis. Their
+# standard normal reference values are constants, so evaluate them once.
+_FAT_TAIL_PERCENTILES = [90, 95, 99, 99.5, 99.9]
+_FAT_TAIL_NORMAL_Z = stats.norm.ppf(np.array(_FAT_TAIL_PERCENTILES) / 100)
+_FAT_TAIL_LABELS = [f"{p}%" for p in _FAT_TAIL_PERCENTILES]
+_SIGMA_LEVELS = np.array([3, 4, 5])
+_SIGMA_TAIL_PROBS = stats.norm.sf(_SIGMA_LEVELS)  # P(Z > k), accurate in the far tail
+
+# Interpretation ladders: (upper bounds, messages). A value below bounds[i]
+# (and not below any earlier bound) maps to messages[i]; values at or above
+# the last bound map to the final message.
+_EVT_BANDS = (
+    (-0.5, 0, 0.5),
+    (
+        "Short-tailed distribution - extreme events unlikely",
+        "Light-tailed distribution - moderate tail risk",
+        "Heavy-tailed distribution - significant tail risk",
+        "Extremely heavy-tailed - high black swan risk",
+    ),
+)
+_FAT_TAIL_BANDS = (
+    (1.1, 1.5, 2.0),
+    (
+        "Normal-like tails - low tail risk",
+        "Moderately fat tails - elevated tail risk",
+        "Fat tails - significant tail risk",
+        "Extremely fat tails - severe tail risk",
+    ),
+)
+_SKEWNESS_BANDS = (
+    (-0.5, -0.1, 0.1, 0.5),
+    (
+        "Strong negative skew - frequent small gains, rare large losses (HIGH TAIL RISK)",
+        "Moderate negative skew - asymmetric downside risk",
+        "Approximately symmetric",
+        "Moderate positive skew - frequent small losses, rare large gains",
+        "Strong positive skew - rare large gains dominate",
+    ),
+)
+_KURTOSIS_BANDS = (
+    (0, 1, 3, 5),
+    (
+        "Light tails (platykurtic) - fewer extremes than normal",
+        "Near normal tail thickness",
+        "Moderately heavy tails (leptokurtic) - more extremes than normal",
+        "Heavy tails - significantly more extremes than normal",
+        "Extremely heavy tails - very high frequency of extreme events",
+    ),
+)
+_WORST_EVENT_BANDS = (
+    (2, 3, 4, 5),
+    (
+        "Within 2σ - normal market volatility",
+        "2-3σ event - uncommon but expected",
+        "3-4σ event - rare, significant stress",
+        "4-5σ event - very rare, extreme stress",
+        "Beyond 5σ - BLACK SWAN event",
+    ),
+)
+_RISK_LEVEL_BANDS = (
+    (20, 40, 60, 80),
+    ("LOW", "MODERATE", "HIGH", "SEVERE", "CRITICAL"),
+)
+
+
+def _band(bands: Tuple[Tuple[float, ...], Tuple[str, ...]], value: float) -> str:
+    """Look up the message for value in an interpretation ladder"""
+    bounds, messages = bands
+    return messages[bisect.bisect_right(bounds, value)]
+
+
+# Completed analyses kept per tool instance, keyed by request parameters and
+# the CSV's mtime so a refreshed file is recomputed
+RESULT_CACHE_MAX_SIZE = 128
+
+# Minimum number of price rows the analyses accept
+MIN_HISTORY_DAYS = 100
+
+
+@functools.lru_cache(maxsize=256)
+def _short_history_rows(path: str, mtime_ns: int) -> Optional[int]:
+    """
+    Data row count of a CSV shorter than MIN_HISTORY_DAYS, else None.
+
+    Reads at most MIN_HISTORY_DAYS + 1 lines, so thin histories are rejected
+    without parsing the file.
+    """
+    rows = -1  # header line
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                rows += 1
+                if rows >= MIN_HISTORY_DAYS:
+                    return None
+    return max(rows, 0)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_price_history(path: str, mtime_ns: int) -> Optional[Tuple[pd.DatetimeIndex, np.ndarray]]:
+    """
+    Parse the Date and Close columns of a stock CSV, memoized per file.
+
+    Returns the dates and a float64 array of closes (None if the file has no
+    Close column or no rows); the analyses never need the DataFrame itself.
+    The file's mtime is part of the key, so a refreshed CSV is parsed again.
+    Callers must not mutate the result.
+    """
+    df = pd.read_csv(
+        path, index_col=0, parse_dates=True, usecols=lambda col: col in ("Date", "Close")
+    )
+    if df.empty or 'Close' not in df.columns:
+        return None
+    return df.index, df['Close'].to_numpy(dtype=np.float64)
+
+
+def _gpd_profile(theta: float, exceedances: np.ndarray) -> Tuple[float, float, float]:
+    """
+    GPD parameters and log-likelihood profiled on theta = xi / beta.
+
+    For fixed theta the likelihood maximizer is xi = mean(log(1 + theta * x))
+    and beta = xi / theta, which reduces the fit to a one-dimensional search.
+    """
+    n = len(exceedances)
+    if theta == 0:
+        beta = exceedances.mean()
+        return 0.0, beta, -n * np.log(beta) - n
+    xi = np.log1p(theta * exceedances).mean()
+    beta = xi / theta
+    return xi, beta, -n * np.log(beta) - n * (1 + xi)
+
+
+def _fit_gpd_mle(exceedances: np.ndarray) -> Optional[Tuple[float, float]]:
+    """
+    Maximum likelihood (xi, beta) of a GPD fitted to threshold exceedances.
+
+    Uses Grimshaw's reduction: the score equations collapse to a single
+    equation in theta = xi / beta whose non-zero roots are bracketed on each
+    side of zero. Every root is compared with the exponential (theta = 0)
+    limit and the highest-likelihood candidate wins. Returns None when no
+    valid fit is found so callers can fall back to the method of moments.
+    """
+    x_max = exceedances.max()
+    x_min = exceedances.min()
+    x_mean = exceedances.mean()
+    if x_max <= 0 or x_mean <= 0:
+        return None
+
+    def score(theta: float) -> float:
+        return (1 + np.log1p(theta * exceedances).mean()) * (1 / (1 + theta * exceedances)).mean() - 1
+
+    eps = 1e-6 / x_mean
+    brackets = [(-1 / x_max + eps, -eps)]
+    if x_min > 0:
+        brackets.append((eps, 2 * (x_mean - x_min) / x_min ** 2))
+
+    candidates = [_gpd_profile(0.0, exceedances)]
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for low, high in brackets:
+            if not low < high:
+                continue
+            f_low, f_high = score(low), score(high)
+            if not (np.isfinite(f_low) and np.isfinite(f_high)) or f_low * f_high > 0:
+                continue
+            try:
+                theta = brentq(score, low, high)
+            except (ValueError, RuntimeError):
+                continue
+            candidates.append(_gpd_profile(theta, exceedances))
+
+    candidates = [c for c in candidates if np.isfinite(c[2]) and c[1] > 0]
+    if not candidates:
+        return None
+
+    xi, beta, _ = max(candidates, key=lambda c: c[2])
+    return float(xi), float(beta)
+
+
+def _sorted_percentile(sorted_values: np.ndarray, percentiles) -> np.ndarray:
+    """
+    np.percentile (linear method) read off an already sorted array.
+
+    Mirrors NumPy's virtual-index and lerp arithmetic so results are
+    bit-identical, without re-partitioning the data for every call.
+    """
+    n = sorted_values.shape[0]
+    virtual = (n - 1) * (np.asarray(percentiles, dtype=float) / 100)
+    lower = np.floor(virtual)
+    gamma = virtual - lower
+    lower = np.minimum(lower.astype(np.intp), n - 1)
+    upper = np.minimum(lower + 1, n - 1)
+
+    below = sorted_values[lower]
+    above = sorted_values[upper]
+    diff = above - below
+    return np.where(gamma >= 0.5, above - diff * (1 - gamma), below + diff * gamma)
+
+
+def _loss_stats(losses: np.ndarray) -> Tuple[float, float, int, int, int, float]:
+    """
+    Mean, sample std, 3/4/5-sigma exceedance counts and maximum of the losses.
+
+    Dispatches to the fused numba kernel when numba is installed; unlike the
+    NumPy path it needs no n x 3 comparison temporary, so it is faster at every
+    history length the tool accepts.
+    """
+    if NUMBA_AVAILABLE:
+        return _loss_stats_jit(losses)
+
+    mean_loss = losses.mean()
+    std_loss = losses.std(ddof=1)
+    count_3, count_4, count_5 = np.count_nonzero(
+        losses[:, None] > mean_loss + _SIGMA_LEVELS * std_loss, axis=0
+    )
+    return mean_loss, std_loss, count_3, count_4, count_5, losses.max()
+
+
+def _loss_stats_loop(losses: np.ndarray) -> Tuple[float, float, int, int, int, float]:
+    """
+    Fused form of _loss_stats (three passes, no temporaries), compiled with numba.
+    """
+    n = len(losses)
+    total = 0.0
+    max_loss = -np.inf
+    for x in losses:
+        total += x
+        if x > max_loss:
+            max_loss = x
+    mean_loss = total / n
+
+    sq_dev = 0.0
+    for x in losses:
+        sq_dev += (x - mean_loss) * (x - mean_loss)
+    std_loss = np.sqrt(sq_dev / (n - 1))
+
+    threshold_3 = mean_loss + 3 * std_loss
+    threshold_4 = mean_loss + 4 * std_loss
+    threshold_5 = mean_loss + 5 * std_loss
+    count_3 = count_4 = count_5 = 0
+    for x in losses:
+        if x > threshold_3:
+            count_3 += 1
+            if x > threshold_4:
+                count_4 += 1
+                if x > threshold_5:
+                    count_5 += 1
+    return mean_loss, std_loss, count_3, count_4, count_5, max_loss
+
+
+if NUMBA_AVAILABLE:
+    _loss_stats_jit = njit(cache=True)(_loss_stats_loop)
+
 
 class TailRiskTool:
     """Advanced tail risk analysis using Extreme Value Theory"""
 
     def __init__(self):
         self.data_dir = Path(__file__).parent.parent.parent.parent.parent / "data" / "stock-data"
+        self._result_cache: OrderedDict = OrderedDict()
 
     async def get_tool_info(self) -> Dict:
         """Get tool information for MCP protocol"""
@@ -61,90 +327,145 @@ class TailRiskTool:
 
             # Load data
             data_file = self.data_dir / f"{symbol}.csv"
-            if not data_file.exists():
+            try:
+                mtime_ns = data_file.stat().st_mtime_ns
+            except OSError:
                 return {"error": f"No data available for {symbol}"}
 
-            df = pd.read_csv(data_file, index_col=0, parse_dates=True)
-            if df.empty or 'Close' not in df.columns:
-                return {"error": f"Invalid data for {symbol}"}
+            cache_key = (
+                symbol, mtime_ns, period, threshold_pct,
+                tuple(sorted(analysis_types)) if isinstance(analysis_types, list) else analysis_types
+            )
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                return copy.deepcopy(cached)
+
+            # CSV parsing and the analyses are CPU-bound; keep them off the event
+            # loop. The result cache is only touched here, on the loop thread.
+            result = await asyncio.to_thread(
+                self._execute_sync, symbol, data_file, mtime_ns, period, threshold_pct, analysis_types
+            )
+            if "error" in result:
+                return result
+
+            self._result_cache[cache_key] = copy.deepcopy(result)
+            if len(self._result_cache) > RESULT_CACHE_MAX_SIZE:
+                self._result_cache.popitem(last=False)
 
-            # Get sufficient data
-            df = df.tail(min(period, len(df)))
+            return result
 
-            if len(df) < 100:
-                return {"error": f"Insufficient data: only {len(df)} days available"}
+        except Exception as e:
+            return {"error": f"Tail risk analysis failed: {str(e)}"}
 
-            # Calculate returns
-            returns = df['Close'].pct_change().dropna()
+    def _execute_sync(
+        self, symbol: str, data_file: Path, mtime_ns: int, period: int,
+        threshold_pct: float, analysis_types: List[str]
+    ) -> Dict[str, Any]:
+        """Load the price history and run the requested analyses"""
+        # Fail fast on histories that can never reach the minimum
+        rows = _short_history_rows(str(data_file), mtime_ns)
+        if rows is not None or period < MIN_HISTORY_DAYS:
+            days = period if rows is None else min(period, rows)
+            if days < MIN_HISTORY_DAYS:
+                return {"error": f"Insufficient data: only {days} days available"}
+
+        history = _load_price_history(str(data_file), mtime_ns)
+        if history is None:
+            return {"error": f"Invalid data for {symbol}"}
+
+        # Get sufficient data
+        dates, close = history
+        days = min(period, len(close))
+        dates, close = dates[-days:], close[-days:]
+
+        if days < MIN_HISTORY_DAYS:
+            return {"error": f"Insufficient data: only {days} days available"}
+
+        # Calculate returns (same arithmetic as pct_change, missing closes dropped)
+        returns = close[1:] / close[:-1] - 1
+        returns = returns[~np.isnan(returns)]
+
+        result = {
+            "symbol": symbol,
+            "period_days": days,
+            "start_date": dates.min().isoformat(),
+            "end_date": dates.max().isoformat(),
+            "analyses": {}
+        }
 
-            result = {
-                "symbol": symbol,
-                "period_days": len(df),
-                "start_date": df.index.min().isoformat(),
-                "end_date": df.index.max().isoformat(),
-                "analyses": {}
-            }
+        # Determine analyses to run
+        if "all" in analysis_types:
+            analysis_types = ["extreme_value", "fat_tail", "skewness_kurtosis", "black_swan"]
 
-            # Determine analyses to run
-            if "all" in analysis_types:
-                analysis_types = ["extreme_value", "fat_tail", "skewness_kurtosis", "black_swan"]
+        # Run analyses. Losses are sorted once and every percentile is read off
+        # the sorted copy instead of re-partitioning the array per call
+        losses = -returns
+        if "extreme_value" in analysis_types or "fat_tail" in analysis_types:
+            sorted_losses = np.sort(losses)
 
-            # Run analyses
-            if "extreme_value" in analysis_types:
-                result["analyses"]["extreme_value_theory"] = self._extreme_value_analysis(
-                    returns, threshold_pct
-                )
+        if "extreme_value" in analysis_types:
+            result["analyses"]["extreme_value_theory"] = self._extreme_value_analysis(
+                losses, sorted_losses, threshold_pct
+            )
 
-            if "fat_tail" in analysis_types:
-                result["analyses"]["fat_tail"] = self._fat_tail_analysis(returns)
+        # Loss moments and 3/4/5-sigma counts, computed in one sweep for both
+        # the fat tail and black swan analyses
+        if "fat_tail" in analysis_types or "black_swan" in analysis_types:
+            loss_stats = _loss_stats(losses)
 
-            if "skewness_kurtosis" in analysis_types:
-                result["analyses"]["skewness_kurtosis"] = self._skewness_kurtosis_analysis(returns)
+        if "fat_tail" in analysis_types:
+            result["analyses"]["fat_tail"] = self._fat_tail_analysis(sorted_losses, loss_stats)
 
-            if "black_swan" in analysis_types:
-                result["analyses"]["black_swan"] = self._black_swan_analysis(returns)
+        if "skewness_kurtosis" in analysis_types:
+            result["analyses"]["skewness_kurtosis"] = self._skewness_kurtosis_analysis(returns)
 
-            # Overall tail risk assessment
-            result["assessment"] = self._generate_tail_risk_assessment(result["analyses"])
+        if "black_swan" in analysis_types:
+            result["analyses"]["black_swan"] = self._black_swan_analysis(losses, loss_stats)
 
-            return result
+        # Overall tail risk assessment
+        result["assessment"] = self._generate_tail_risk_assessment(result["analyses"])
 
-        except Exception as e:
-            return {"error": f"Tail risk analysis failed: {str(e)}"}
+        return result
 
-    def _extreme_value_analysis(self, returns: pd.Series, threshold_pct: float) -> Dict:
+    def _extreme_value_analysis(
+        self, losses: np.ndarray, sorted_losses: np.ndarray, threshold_pct: float
+    ) -> Dict:
         """Extreme Value Theory (EVT) analysis using Peaks Over Threshold (POT) method"""
-        # Focus on left tail (losses)
-        losses = -returns
+        n = len(losses)
 
-        # Determine threshold (e.g., 95th percentile)
-        threshold = np.percentile(losses, threshold_pct * 100)
+        # Determine threshold on the left tail (e.g., 95th percentile of losses)
+        threshold = float(_sorted_percentile(sorted_losses, threshold_pct * 100))
 
         # Extract exceedances (losses beyond threshold)
         exceedances = losses[losses > threshold] - threshold
+        n_exceedances = len(exceedances)
 
-        if len(exceedances) < 10:
+        if n_exceedances < 10:
             return {
                 "error": "Insufficient extreme events for EVT analysis",
                 "threshold_percentile": threshold_pct * 100,
-                "events_found": len(exceedances)
+                "events_found": n_exceedances
             }
 
-        # Fit Generalized Pareto Distribution (GPD)
-        # Using method of moments for simplicity
-        mean_excess = exceedances.mean()
-        var_excess = exceedances.var()
+        # Fit Generalized Pareto Distribution (GPD) by maximum likelihood,
+        # falling back to the method of moments if no valid MLE is found
+        fit = _fit_gpd_mle(exceedances)
+        if fit is not None:
+            xi, beta = fit
+            fit_method = "maximum_likelihood"
+        else:
+            mean_excess = exceedances.mean()
+            var_excess = exceedances.var(ddof=1)
 
-        # Shape parameter (xi) estimation
-        xi = 0.5 * (1 - (mean_excess ** 2) / var_excess)
+            # Shape parameter (xi) estimation
+            xi = 0.5 * (1 - (mean_excess ** 2) / var_excess)
 
-        # Scale parameter (beta) estimation
-        beta = 0.5 * mean_excess * ((mean_excess ** 2) / var_excess + 1)
+            # Scale parameter (beta) estimation
+            beta = 0.5 * mean_excess * ((mean_excess ** 2) / var_excess + 1)
+            fit_method = "method_of_moments"
 
         # Calculate extreme VaR and CVaR
-        n = len(losses)
-        n_exceedances = len(exceedances)
-
         # Probability of exceeding threshold
         prob_exceed = n_exceedances / n
 
@@ -154,7 +475,7 @@ class TailRiskTool:
             if abs(xi) < 1e-6:  # xi ≈ 0
                 var = threshold + beta * np.log(prob_exceed / q)
             else:
-                var = threshold + (beta / xi) * ((prob_exceed / q) ** (-xi) - 1)
+                var = threshold + (beta / xi) * ((q / prob_exceed) ** (-xi) - 1)
             return var
 
         var_99 = calculate_extreme_var(0.99)
@@ -166,8 +487,9 @@ class TailRiskTool:
 
         return {
             "method": "Generalized Pareto Distribution (GPD)",
+            "fit_method": fit_method,
             "threshold": float(round(threshold * 100, 4)),
-            "exceedances_count": int(len(exceedances)),
+            "exceedances_count": n_exceedances,
             "exceedances_percent": float(round((n_exceedances / n) * 100, 2)),
             "parameters": {
                 "shape_xi": float(round(xi, 4)),
@@ -183,44 +505,33 @@ class TailRiskTool:
 
     def _interpret_evt(self, xi: float, tail_index: Optional[float]) -> str:
         """Interpret EVT results"""
-        if xi < -0.5:
-            return "Short-tailed distribution - extreme events unlikely"
-        elif xi < 0:
-            return "Light-tailed distribution - moderate tail risk"
-        elif xi < 0.5:
-            return "Heavy-tailed distribution - significant tail risk"
-        else:
-            return "Extremely heavy-tailed - high black swan risk"
+        return _band(_EVT_BANDS, xi)
 
-    def _fat_tail_analysis(self, returns: pd.Series) -> Dict:
+    def _fat_tail_analysis(self, sorted_losses: np.ndarray, loss_stats: Tuple) -> Dict:
         """Analyze fat tail characteristics"""
-        # Compare actual distribution to normal distribution
-        losses = -returns
+        n = len(sorted_losses)
 
-        # Calculate percentiles
-        percentiles = [90, 95, 99, 99.5, 99.9]
-        actual_percentiles = {}
-        normal_percentiles = {}
+        # Compare actual distribution to normal distribution; extreme_count is
+        # the number of losses beyond 3 standard deviations
+        mean_loss, std_loss, extreme_count = loss_stats[:3]
 
-        mean_loss = losses.mean()
-        std_loss = losses.std()
+        # Calculate percentiles
+        actual_values = _sorted_percentile(sorted_losses, _FAT_TAIL_PERCENTILES)
+        normal_values = mean_loss + _FAT_TAIL_NORMAL_Z * std_loss
 
-        for p in percentiles:
-            actual_percentiles[f"{p}%"] = float(round(np.percentile(losses, p) * 100, 4))
-            normal_percentiles[f"{p}%"] = float(round((mean_loss + stats.norm.ppf(p/100) * std_loss) * 100, 4))
+        actual_percentiles = dict(zip(_FAT_TAIL_LABELS, np.round(actual_values * 100, 4).tolist()))
+        normal_percentiles = dict(zip(_FAT_TAIL_LABELS, np.round(normal_values * 100, 4).tolist()))
 
         # Fat tail ratio (actual vs normal at 99%)
-        actual_99 = np.percentile(losses, 99)
-        normal_99 = mean_loss + stats.norm.ppf(0.99) * std_loss
+        actual_99 = actual_values[2]
+        normal_99 = normal_values[2]
         fat_tail_ratio = actual_99 / normal_99 if normal_99 > 0 else 1.0
 
-        # Count of extreme events (beyond 3 standard deviations)
-        threshold_3std = mean_loss + 3 * std_loss
-        extreme_events = losses[losses > threshold_3std]
-        extreme_count = len(extreme_events)
-
         # Expected vs actual under normality
-        expected_extreme = len(losses) * (1 - stats.norm.cdf(3))
+        expected_extreme = n * _SIGMA_TAIL_PROBS[0]
+
+        # Five largest losses
+        largest = sorted_losses[:-6:-1]
 
         return {
             "fat_tail_ratio": float(round(fat_tail_ratio, 4)),
@@ -232,31 +543,33 @@ class TailRiskTool:
                 "expected_under_normality": float(round(expected_extreme, 2)),
                 "multiplier": float(round(extreme_count / expected_extreme, 2)) if expected_extreme > 0 else "N/A"
             },
-            "largest_losses": [float(round(x * 100, 4)) for x in sorted(losses, reverse=True)[:5]]
+            "largest_losses": np.round(largest * 100, 4).tolist()
         }
 
     def _interpret_fat_tail(self, ratio: float) -> str:
         """Interpret fat tail ratio"""
-        if ratio < 1.1:
-            return "Normal-like tails - low tail risk"
-        elif ratio < 1.5:
-            return "Moderately fat tails - elevated tail risk"
-        elif ratio < 2.0:
-            return "Fat tails - significant tail risk"
-        else:
-            return "Extremely fat tails - severe tail risk"
+        return _band(_FAT_TAIL_BANDS, ratio)
 
-    def _skewness_kurtosis_analysis(self, returns: pd.Series) -> Dict:
+    def _skewness_kurtosis_analysis(self, returns: np.ndarray) -> Dict:
         """Analyze skewness and kurtosis"""
+        # Central moments from one set of deviations (biased, as scipy.stats)
+        deviations = returns - returns.mean()
+        sq_deviations = deviations * deviations
+        m2 = sq_deviations.mean()
+        m3 = (sq_deviations * deviations).mean()
+        m4 = (sq_deviations * sq_deviations).mean()
+
         # Calculate skewness (asymmetry)
-        skewness = stats.skew(returns)
+        skewness = m3 / m2 ** 1.5
 
         # Calculate kurtosis (tail thickness)
         # Using excess kurtosis (subtract 3 for normal distribution baseline)
-        kurtosis_excess = stats.kurtosis(returns)
+        kurtosis_excess = m4 / m2 ** 2 - 3
 
-        # Jarque-Bera test for normality
-        jb_stat, jb_pvalue = stats.jarque_bera(returns)
+        # Jarque-Bera test for normality, from the moments above; the chi-square
+        # survival function with 2 degrees of freedom is exactly exp(-x / 2)
+        jb_stat = len(returns) / 6 * (skewness ** 2 + kurtosis_excess ** 2 / 4)
+        jb_pvalue = np.exp(-jb_stat / 2)
 
         return {
             "skewness": float(round(skewness, 4)),
@@ -274,29 +587,11 @@ class TailRiskTool:
 
     def _interpret_skewness(self, skewness: float) -> str:
         """Interpret skewness value"""
-        if skewness < -0.5:
-            return "Strong negative skew - frequent small gains, rare large losses (HIGH TAIL RISK)"
-        elif skewness < -0.1:
-            return "Moderate negative skew - asymmetric downside risk"
-        elif skewness < 0.1:
-            return "Approximately symmetric"
-        elif skewness < 0.5:
-            return "Moderate positive skew - frequent small losses, rare large gains"
-        else:
-            return "Strong positive skew - rare large gains dominate"
+        return _band(_SKEWNESS_BANDS, skewness)
 
     def _interpret_kurtosis(self, kurtosis: float) -> str:
         """Interpret excess kurtosis"""
-        if kurtosis < 0:
-            return f"Light tails (platykurtic) - fewer extremes than normal"
-        elif kurtosis < 1:
-            return f"Near normal tail thickness"
-        elif kurtosis < 3:
-            return f"Moderately heavy tails (leptokurtic) - more extremes than normal"
-        elif kurtosis < 5:
-            return f"Heavy tails - significantly more extremes than normal"
-        else:
-            return f"Extremely heavy tails - very high frequency of extreme events"
+        return _band(_KURTOSIS_BANDS, kurtosis)
 
     def _assess_distribution_shape(self, skewness: float, kurtosis: float) -> str:
         """Overall assessment of distribution shape"""
@@ -311,41 +606,23 @@ class TailRiskTool:
         else:
             return "Non-normal distribution - use robust risk measures"
 
-    def _black_swan_analysis(self, returns: pd.Series) -> Dict:
+    def _black_swan_analysis(self, losses: np.ndarray, loss_stats: Tuple) -> Dict:
         """Analyze black swan event probability"""
-        losses = -returns
-        mean_loss = losses.mean()
-        std_loss = losses.std()
-
-        # Define black swan thresholds
-        thresholds = {
-            "3_sigma": mean_loss + 3 * std_loss,
-            "4_sigma": mean_loss + 4 * std_loss,
-            "5_sigma": mean_loss + 5 * std_loss
-        }
-
-        # Count actual events
-        events_3sigma = len(losses[losses > thresholds["3_sigma"]])
-        events_4sigma = len(losses[losses > thresholds["4_sigma"]])
-        events_5sigma = len(losses[losses > thresholds["5_sigma"]])
+        # Moments, 3/4/5-sigma event counts and the worst loss, shared with the
+        # fat tail analysis
+        mean_loss, std_loss, events_3sigma, events_4sigma, events_5sigma, worst_loss = loss_stats
 
         # Expected frequencies under normality
         n = len(losses)
-        expected_3sigma = n * (1 - stats.norm.cdf(3))
-        expected_4sigma = n * (1 - stats.norm.cdf(4))
-        expected_5sigma = n * (1 - stats.norm.cdf(5))
+        expected_3sigma, expected_4sigma, expected_5sigma = n * _SIGMA_TAIL_PROBS
 
         # Black swan probability estimation
-        # Using empirical frequency for extreme events
-        if events_5sigma > 0:
-            black_swan_prob = events_5sigma / n
-            black_swan_expected_years = 252 / events_5sigma if events_5sigma > 0 else float('inf')
-        else:
-            black_swan_prob = 1 / n  # Use 1 event as minimum
-            black_swan_expected_years = n / 252
+        # Using empirical frequency for extreme events (1 event as minimum)
+        effective_events = max(events_5sigma, 1)
+        black_swan_prob = effective_events / n
+        black_swan_expected_years = (n / 252) / effective_events
 
         # Worst observed event
-        worst_loss = losses.max()
         worst_loss_sigma = (worst_loss - mean_loss) / std_loss if std_loss > 0 else 0
 
         return {
@@ -380,16 +657,7 @@ class TailRiskTool:
 
     def _interpret_worst_event(self, sigma: float) -> str:
         """Interpret worst event severity"""
-        if sigma < 2:
-            return "Within 2σ - normal market volatility"
-        elif sigma < 3:
-            return "2-3σ event - uncommon but expected"
-        elif sigma < 4:
-            return "3-4σ event - rare, significant stress"
-        elif sigma < 5:
-            return "4-5σ event - very rare, extreme stress"
-        else:
-            return "Beyond 5σ - BLACK SWAN event"
+        return _band(_WORST_EVENT_BANDS, sigma)
 
     def _generate_tail_risk_alert(
         self, events_3sigma: int, expected_3sigma: float, events_5sigma: int
@@ -495,13 +763,4 @@ class TailRiskTool:
 
     def _risk_level(self, score: float) -> str:
         """Determine risk level from score"""
-        if score < 20:
-            return "LOW"
-        elif score < 40:
-            return "MODERATE"
-        elif score < 60:
-            return "HIGH"
-        elif score < 80:
-            return "SEVERE"
-        else:
-            return "CRITICAL"
+        return _band(_RISK_LEVEL_BANDS, score)
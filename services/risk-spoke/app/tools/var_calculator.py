@@ -3,61 +3,246 @@ Value at Risk (VaR) Calculator Tool
 Implements Historical, Parametric, and Monte Carlo VaR methods
 """
 
+import functools
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Any, List
-from scipy import stats
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+# Optional: JIT-compiled tail selection for historical VaR
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Use the numba heap kernel (when installed) up to this VaR index; for larger
+# tails np.partition's linear-time selection is faster than the heap
+NUMBA_MAX_TAIL_SIZE = 64
+
+
+@functools.lru_cache(maxsize=64)
+def _load_closes(path: str, mtime_ns: int) -> Optional[np.ndarray]:
+    """
+    Parse the Close column of a stock CSV into a read-only float64 array,
+    memoized per file.
+
+    Only closes are used, so the other columns and date parsing are skipped.
+    The file's mtime is part of the key, so a refreshed CSV is parsed again.
+    Returns None when the file has no usable Close data.
+    """
+    df = pd.read_csv(path, usecols=lambda col: col == "Close")
+    if df.empty or 'Close' not in df.columns:
+        return None
+    close = df['Close'].to_numpy(dtype=np.float64)
+    close.flags.writeable = False
+    return close
+
+
+def _historical_tail(returns: np.ndarray, index: int) -> Tuple[float, float]:
+    """
+    The index-th smallest return (0-based) and the sum of the index returns
+    below it.
+
+    Dispatches to the numba heap kernel for small tails when numba is installed.
+    """
+    if NUMBA_AVAILABLE and index <= NUMBA_MAX_TAIL_SIZE:
+        return _historical_tail_jit(returns, index)
+
+    partitioned = np.partition(returns, index)
+    return partitioned[index], partitioned[:index].sum()
+
+
+def _historical_tail_loop(returns: np.ndarray, index: int) -> Tuple[float, float]:
+    """
+    Single-pass form of _historical_tail, compiled with numba. Keeps the
+    index + 1 smallest returns in a max-heap, so the root ends as the VaR.
+    """
+    heap = np.empty(index + 1)
+    size = 0
+    for x in returns:
+        if size <= index:
+            # Fill phase: sift the new value up
+            i = size
+            heap[i] = x
+            size += 1
+            while i > 0:
+                parent = (i - 1) // 2
+                if heap[parent] >= heap[i]:
+                    break
+                heap[parent], heap[i] = heap[i], heap[parent]
+                i = parent
+        elif x < heap[0]:
+            # Replace the largest kept value and sift it down
+            heap[0] = x
+            i = 0
+            while True:
+                left = 2 * i + 1
+                right = left + 1
+                largest = i
+                if left < size and heap[left] > heap[largest]:
+                    largest = left
+                if right < size and heap[right] > heap[largest]:
+                    largest = right
+                if largest == i:
+                    break
+                heap[largest], heap[i] = heap[i], heap[largest]
+                i = largest
+    return heap[0], heap[1:].sum()
+
+
+if NUMBA_AVAILABLE:
+    _historical_tail_jit = njit(cache=True)(_historical_tail_loop)
+
+
+@functools.lru_cache(maxsize=32)
+def _norm_ppf_pdf(confidence: float) -> Tuple[float, float]:
+    """
+    Standard normal z-score for the lower 1 - confidence tail and its density.
+
+    Requests use a handful of confidence levels, so each pair is computed once.
+    """
+    from scipy import stats  # lazy: scipy.stats costs ~0.6 s to import
+
+    z_score = float(stats.norm.ppf(1 - confidence))
+    return z_score, float(stats.norm.pdf(z_score))
+
+
+def _normality_pvalue(returns: np.ndarray, mean_return: float) -> float:
+    """
+    p-value of D'Agostino and Pearson's omnibus normality test.
+
+    Same statistic as scipy.stats.normaltest (skewtest and kurtosistest
+    combined), computed from one set of central moments without scipy's
+    per-call validation. The chi-square survival function with 2 degrees of
+    freedom is exactly exp(-x / 2).
+    """
+    n = float(len(returns))
+    deviations = returns - mean_return
+    sq_deviations = deviations * deviations
+    m2 = sq_deviations.mean()
+    m3 = (sq_deviations * deviations).mean()
+    m4 = (sq_deviations * sq_deviations).mean()
+
+    # Skewness test
+    y = m3 / m2 ** 1.5 * np.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+    beta2 = (3.0 * (n**2 + 27*n - 70) * (n+1) * (n+3) /
+             ((n-2.0) * (n+5) * (n+7) * (n+9)))
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2.0 / (w2 - 1))
+    if y == 0:
+        y = 1.0
+    z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha)**2 + 1))
+
+    # Kurtosis test
+    e = 3.0 * (n-1) / (n+1)
+    var_b2 = 24.0*n*(n-2)*(n-3) / ((n+1)*(n+1.)*(n+3)*(n+5))
+    x = (m4 / m2 ** 2 - e) / var_b2**0.5
+    sqrt_beta1 = 6.0*(n*n-5*n+2)/((n+7)*(n+9)) * ((6.0*(n+3)*(n+5)) / (n*(n-2)*(n-3)))**0.5
+    a = 6.0 + 8.0/sqrt_beta1 * (2.0/sqrt_beta1 + (1+4.0/(sqrt_beta1**2))**0.5)
+    term1 = 1 - 2/(9.0*a)
+    denom = 1 + x * (2/(a-4.0))**0.5
+    term2 = np.sign(denom) * ((1-2.0/a)/abs(denom))**(1/3) if denom != 0 else np.nan
+    z_kurt = (term1 - term2) / (2/(9.0*a))**0.5
+
+    return float(np.exp(-(z_skew * z_skew + z_kurt * z_kurt) / 2))
+
+
+# Lower-tail percentiles reported for the Monte Carlo scenarios
+MC_RISK_PERCENTILES = np.array([5.0, 1.0, 0.1])
+
+# Size of the scenario buffer kept between Monte Carlo calls (the default
+# simulation count); larger runs allocate their own buffer for that call only
+MC_BUFFER_SIZE = 10000
+
+
+def _lower_tail_statistics(scenarios: np.ndarray, index: int, percentiles: np.ndarray):
+    """
+    VaR, CVaR and lower-tail percentiles of simulated returns.
+
+    Every statistic lives in the worst few returns, so those are selected with
+    one partition and sorted on their own. Percentiles follow np.percentile's
+    linear interpolation exactly, read off the sorted head.
+    """
+    n = len(scenarios)
+    virtual = (n - 1) * (percentiles / 100)
+    lower = np.floor(virtual)
+    gamma = virtual - lower
+    lower = lower.astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+
+    head_size = min(max(index, upper.max()) + 1, n)
+    head = np.sort(np.partition(scenarios, head_size - 1)[:head_size])
+
+    below = head[lower]
+    above = head[upper]
+    diff = above - below
+    values = np.where(gamma >= 0.5, above - diff * (1 - gamma), below + diff * gamma)
+    tail_mean = head[:index].sum() / index if index > 0 else head[index]
+    return head[index], tail_mean, values
+
+
+# MCP tool description; static, so built once and shared by every instance.
+# The hub's integrated server keeps a compact copy of this schema.
+TOOL_SCHEMA: Dict[str, Any] = {
+    "name": "risk_calculate_var",
+    "description": "Calculate Value at Risk (VaR) using Historical, Parametric, or Monte Carlo methods",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "symbol": {
+                "type": "string",
+                "description": "Stock symbol (e.g., AAPL, MSFT)"
+            },
+            "method": {
+                "type": "string",
+                "enum": ["historical", "parametric", "monte_carlo", "all"],
+                "description": "VaR calculation method (default: all)"
+            },
+            "confidence_level": {
+                "type": "number",
+                "description": "Confidence level (e.g., 0.95, 0.99) - default: 0.95"
+            },
+            "time_horizon": {
+                "type": "integer",
+                "description": "Time horizon in days (default: 1)"
+            },
+            "portfolio_value": {
+                "type": "number",
+                "description": "Portfolio value in USD (default: 10000)"
+            },
+            "period": {
+                "type": "integer",
+                "description": "Historical data period in days (default: 252 = 1 year)"
+            },
+            "simulations": {
+                "type": "integer",
+                "description": "Number of Monte Carlo simulations (default: 10000)"
+            }
+        },
+        "required": ["symbol"]
+    }
+}
+
 
 class VaRCalculatorTool:
     """Calculate Value at Risk using multiple methods"""
 
     def __init__(self):
         self.data_dir = Path(__file__).parent.parent.parent.parent.parent / "data" / "stock-data"
+        # Monte Carlo sampler state reused across calls: the generator is
+        # rewound to its seeded state per call (cheaper than reseeding), and
+        # scenarios are written into a fixed-size scratch buffer whenever they
+        # fit. Calls run on the event loop thread only.
+        self._mc_rng = np.random.default_rng(42)
+        self._mc_rng_state = self._mc_rng.bit_generator.state
+        self._mc_buffer = np.empty(MC_BUFFER_SIZE)
 
     async def get_tool_info(self) -> Dict:
         """Get tool information for MCP protocol"""
-        return {
-            "name": "risk_calculate_var",
-            "description": "Calculate Value at Risk (VaR) using Historical, Parametric, or Monte Carlo methods",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock symbol (e.g., AAPL, MSFT)"
-                    },
-                    "method": {
-                        "type": "string",
-                        "enum": ["historical", "parametric", "monte_carlo", "all"],
-                        "description": "VaR calculation method (default: all)"
-                    },
-                    "confidence_level": {
-                        "type": "number",
-                        "description": "Confidence level (e.g., 0.95, 0.99) - default: 0.95"
-                    },
-                    "time_horizon": {
-                        "type": "integer",
-                        "description": "Time horizon in days (default: 1)"
-                    },
-                    "portfolio_value": {
-                        "type": "number",
-                        "description": "Portfolio value in USD (default: 10000)"
-                    },
-                    "period": {
-                        "type": "integer",
-                        "description": "Historical data period in days (default: 252 = 1 year)"
-                    },
-                    "simulations": {
-                        "type": "integer",
-                        "description": "Number of Monte Carlo simulations (default: 10000)"
-                    }
-                },
-                "required": ["symbol"]
-            }
-        }
+        return TOOL_SCHEMA
 
     async def execute(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Execute VaR calculation"""
@@ -82,22 +267,24 @@ class VaRCalculatorTool:
 
             # Load stock data
             data_file = self.data_dir / f"{symbol}.csv"
-            if not data_file.exists():
+            try:
+                mtime_ns = data_file.stat().st_mtime_ns
+            except OSError:
                 return {"error": f"No data available for {symbol}"}
 
-            df = pd.read_csv(data_file, index_col=0, parse_dates=True)
-
-            if df.empty or 'Close' not in df.columns:
+            close = _load_closes(str(data_file), mtime_ns)
+            if close is None:
                 return {"error": f"Invalid data for {symbol}"}
 
             # Get recent data
-            df = df.tail(period)
+            close = close[max(len(close) - period, 0):]
 
-            if len(df) < 30:
-                return {"error": f"Insufficient data: only {len(df)} days available"}
+            if len(close) < 30:
+                return {"error": f"Insufficient data: only {len(close)} days available"}
 
-            # Calculate returns
-            returns = df['Close'].pct_change().dropna()
+            # Calculate returns (same arithmetic as pct_change, missing closes dropped)
+            returns = close[1:] / close[:-1] - 1
+            returns = returns[~np.isnan(returns)]
 
             if len(returns) < 2:
                 return {"error": "Not enough return data"}
@@ -108,11 +295,16 @@ class VaRCalculatorTool:
                 "portfolio_value": portfolio_value,
                 "confidence_level": confidence,
                 "time_horizon": time_horizon,
-                "data_period_days": len(df),
+                "data_period_days": len(close),
                 "calculation_date": datetime.now().isoformat(),
                 "methods": {}
             }
 
+            # Moments shared by the parametric and Monte Carlo methods
+            if method in ("parametric", "monte_carlo", "all"):
+                mean_return = returns.mean()
+                std_return = returns.std(ddof=1)
+
             if method == "historical" or method == "all":
                 var_hist = self._calculate_historical_var(
                     returns, confidence, time_horizon, portfolio_value
@@ -121,13 +313,13 @@ class VaRCalculatorTool:
 
             if method == "parametric" or method == "all":
                 var_param = self._calculate_parametric_var(
-                    returns, confidence, time_horizon, portfolio_value
+                    returns, mean_return, std_return, confidence, time_horizon, portfolio_value
                 )
                 result["methods"]["parametric"] = var_param
 
             if method == "monte_carlo" or method == "all":
                 var_mc = self._calculate_monte_carlo_var(
-                    returns, confidence, time_horizon, portfolio_value, simulations
+                    mean_return, std_return, confidence, time_horizon, portfolio_value, simulations
                 )
                 result["methods"]["monte_carlo"] = var_mc
 
@@ -141,46 +333,50 @@ class VaRCalculatorTool:
             return {"error": f"VaR calculation failed: {str(e)}"}
 
     def _calculate_historical_var(
-        self, returns: pd.Series, confidence: float, horizon: int, portfolio_value: float
+        self, returns: np.ndarray, confidence: float, horizon: int, portfolio_value: float
     ) -> Dict:
         """Calculate Historical VaR"""
-        # Scale returns to time horizon
-        if horizon > 1:
-            scaled_returns = returns * np.sqrt(horizon)
-        else:
-            scaled_returns = returns
+        # Find percentile: select the index-th smallest return and the sum of
+        # the worse returns below it, without a full sort
+        index = int((1 - confidence) * len(returns))
+        var_unscaled, tail_sum = _historical_tail(returns, index)
 
-        # Sort returns and find percentile
-        sorted_returns = np.sort(scaled_returns)
-        index = int((1 - confidence) * len(sorted_returns))
-        var_return = sorted_returns[index]
+        # Scale to time horizon; a positive factor preserves the ordering, so
+        # only the selected statistics need scaling, not every return
+        scale = np.sqrt(horizon) if horizon > 1 else 1.0
+        var_return = var_unscaled * scale
 
         # Calculate VaR in USD
         var_usd = abs(var_return * portfolio_value)
 
-        # Calculate CVaR (Expected Shortfall)
-        cvar_return = sorted_returns[:index].mean()
+        # Calculate CVaR (Expected Shortfall); with no return beyond VaR
+        # (high confidence on a short period) the tail is the VaR itself
+        if index > 0:
+            cvar_return = tail_sum / index * scale
+        else:
+            cvar_return = var_return
         cvar_usd = abs(cvar_return * portfolio_value)
 
+        # Round the reported figures in one pass per precision
+        var_pct, cvar_pct = np.round(np.array([var_return, cvar_return]) * 100, 4).tolist()
+        var_usd_rounded, cvar_usd_rounded = np.round(np.array([var_usd, cvar_usd]), 2).tolist()
+
         return {
             "method": "Historical Simulation",
             "description": "Uses actual historical returns distribution",
-            "var_percent": float(round(var_return * 100, 4)),
-            "var_usd": float(round(var_usd, 2)),
-            "cvar_percent": float(round(cvar_return * 100, 4)),
-            "cvar_usd": float(round(cvar_usd, 2)),
+            "var_percent": var_pct,
+            "var_usd": var_usd_rounded,
+            "cvar_percent": cvar_pct,
+            "cvar_usd": cvar_usd_rounded,
             "interpretation": f"With {confidence*100}% confidence, maximum loss over {horizon} day(s) will not exceed ${var_usd:,.2f}",
             "worst_case": f"Expected loss in worst {(1-confidence)*100}% scenarios: ${cvar_usd:,.2f}"
         }
 
     def _calculate_parametric_var(
-        self, returns: pd.Series, confidence: float, horizon: int, portfolio_value: float
+        self, returns: np.ndarray, mean_return: float, std_return: float,
+        confidence: float, horizon: int, portfolio_value: float
     ) -> Dict:
         """Calculate Parametric VaR (Variance-Covariance method)"""
-        # Calculate mean and std of returns
-        mean_return = returns.mean()
-        std_return = returns.std()
-
         # Scale to time horizon
         if horizon > 1:
             mean_scaled = mean_return * horizon
@@ -189,8 +385,8 @@ class VaRCalculatorTool:
             mean_scaled = mean_return
             std_scaled = std_return
 
-        # Get z-score for confidence level
-        z_score = stats.norm.ppf(1 - confidence)
+        # Get z-score for confidence level and its density
+        z_score, phi_z = _norm_ppf_pdf(confidence)
 
         # Calculate VaR
         var_return = mean_scaled + z_score * std_scaled
@@ -198,23 +394,28 @@ class VaRCalculatorTool:
 
         # Calculate CVaR for normal distribution
         # CVaR = mean + std * (phi(z) / (1 - confidence))
-        phi_z = stats.norm.pdf(z_score)
         cvar_return = mean_scaled + std_scaled * (phi_z / (1 - confidence))
         cvar_usd = abs(cvar_return * portfolio_value)
 
         # Normality test
-        _, p_value = stats.normaltest(returns)
+        p_value = _normality_pvalue(returns, mean_return)
         is_normal = p_value > 0.05
 
+        # Round the reported figures in one pass per precision
+        var_pct, cvar_pct, mean_pct, std_pct = np.round(
+            np.array([var_return, cvar_return, mean_return, std_return]) * 100, 4
+        ).tolist()
+        var_usd_rounded, cvar_usd_rounded = np.round(np.array([var_usd, cvar_usd]), 2).tolist()
+
         return {
             "method": "Parametric (Variance-Covariance)",
             "description": "Assumes normal distribution of returns",
-            "var_percent": float(round(var_return * 100, 4)),
-            "var_usd": float(round(var_usd, 2)),
-            "cvar_percent": float(round(cvar_return * 100, 4)),
-            "cvar_usd": float(round(cvar_usd, 2)),
-            "mean_return": float(round(mean_return * 100, 4)),
-            "std_return": float(round(std_return * 100, 4)),
+            "var_percent": var_pct,
+            "var_usd": var_usd_rounded,
+            "cvar_percent": cvar_pct,
+            "cvar_usd": cvar_usd_rounded,
+            "mean_return": mean_pct,
+            "std_return": std_pct,
             "z_score": float(round(z_score, 4)),
             "normality_test": {
                 "is_normal": bool(is_normal),
@@ -225,52 +426,63 @@ class VaRCalculatorTool:
         }
 
     def _calculate_monte_carlo_var(
-        self, returns: pd.Series, confidence: float, horizon: int,
+        self, mean_return: float, std_return: float, confidence: float, horizon: int,
         portfolio_value: float, simulations: int
     ) -> Dict:
-        """Calculate Monte Carlo VaR"""
-        mean_return = returns.mean()
-        std_return = returns.std()
-
-        # Generate random scenarios
-        np.random.seed(42)  # For reproducibility
-        random_returns = np.random.normal(mean_return, std_return, simulations)
-
-        # Scale to time horizon
-        if horizon > 1:
-            scaled_returns = random_returns * np.sqrt(horizon)
-        else:
-            scaled_returns = random_returns
-
-        # Sort and find VaR
-        sorted_returns = np.sort(scaled_returns)
+        """Calculate Monte Carlo VaR from the sample mean and std of returns"""
+        from scipy.special import ndtri  # lazy, like scipy.stats for parametric VaR
+
+        # Generate random scenarios by stratified sampling with antithetic
+        # variates: the unit interval is cut into 2m equal-probability strata,
+        # one uniform draw per lower stratum is mapped through the inverse
+        # normal CDF, and each z is paired with -z for the mirrored upper
+        # stratum. Every tail stratum is guaranteed a sample, which makes the
+        # VaR estimate far less noisy than plain draws of the same size.
+        # Seeded for reproducibility.
+        self._mc_rng.bit_generator.state = self._mc_rng_state
+        m = (simulations + 1) // 2
+        buffer = self._mc_buffer if 2 * m <= self._mc_buffer.size else np.empty(2 * m)
+        lower, upper = buffer[:m], buffer[m:2 * m]
+        self._mc_rng.random(out=lower)
+        np.subtract(np.arange(1, m + 1, dtype=np.float64), lower, out=lower)
+        lower /= 2 * m
+        ndtri(lower, out=lower)
+        np.negative(lower, out=upper)
+
+        # Scale to time horizon, folded into the affine transform of the draws
+        scale = np.sqrt(horizon) if horizon > 1 else 1.0
+        scaled_returns = buffer[:simulations]
+        scaled_returns *= std_return * scale
+        scaled_returns += mean_return * scale
+
+        # Find VaR, CVaR and the percentiles for risk distribution from one
+        # selection of the worst scenarios
         index = int((1 - confidence) * simulations)
-        var_return = sorted_returns[index]
+        var_return, cvar_return, percentile_returns = _lower_tail_statistics(
+            scaled_returns, index, MC_RISK_PERCENTILES
+        )
         var_usd = abs(var_return * portfolio_value)
-
-        # Calculate CVaR
-        cvar_return = sorted_returns[:index].mean()
         cvar_usd = abs(cvar_return * portfolio_value)
 
-        # Calculate percentiles for risk distribution
-        percentiles = {
-            "95%": np.percentile(scaled_returns, 5),
-            "99%": np.percentile(scaled_returns, 1),
-            "99.9%": np.percentile(scaled_returns, 0.1)
-        }
+        # Round the reported figures in one pass per precision; the dollar
+        # losses are VaR, CVaR and then the 95/99/99.9% percentiles
+        var_pct, cvar_pct = np.round(np.array([var_return, cvar_return]) * 100, 4).tolist()
+        var_usd_rounded, cvar_usd_rounded, usd_95, usd_99, usd_999 = np.round(
+            np.concatenate(([var_usd, cvar_usd], np.abs(percentile_returns * portfolio_value))), 2
+        ).tolist()
 
         return {
             "method": "Monte Carlo Simulation",
             "description": "Uses random sampling to simulate potential outcomes",
-            "var_percent": float(round(var_return * 100, 4)),
-            "var_usd": float(round(var_usd, 2)),
-            "cvar_percent": float(round(cvar_return * 100, 4)),
-            "cvar_usd": float(round(cvar_usd, 2)),
+            "var_percent": var_pct,
+            "var_usd": var_usd_rounded,
+            "cvar_percent": cvar_pct,
+            "cvar_usd": cvar_usd_rounded,
             "simulations": int(simulations),
             "risk_percentiles": {
-                "95% confidence": float(round(abs(percentiles["95%"] * portfolio_value), 2)),
-                "99% confidence": float(round(abs(percentiles["99%"] * portfolio_value), 2)),
-                "99.9% confidence": float(round(abs(percentiles["99.9%"] * portfolio_value), 2))
+                "95% confidence": usd_95,
+                "99% confidence": usd_99,
+                "99.9% confidence": usd_999
             },
             "interpretation": f"Based on {simulations} simulations, {confidence*100}% confidence max loss is ${var_usd:,.2f}"
         }
@@ -0,0 +1,102 @@
+"""
+Tests for the portfolio risk analysis
+
+Checks execute_batch against separate execute() calls, that a bad candidate
+only fails its own result entry, and the drawdown kernel against NumPy.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the spoke root so ``app`` resolves to the Risk spoke package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.tools.portfolio_risk import (
+    PortfolioRiskTool, _max_drawdown, _max_drawdown_loop, _universe_moments
+)
+
+
+@pytest.fixture
+def tool(tmp_path):
+    """PortfolioRiskTool reading seeded synthetic price CSVs"""
+    rng = np.random.default_rng(3)
+    dates = pd.Index(pd.bdate_range("2023-01-02", periods=300), name="Date")
+    for symbol in ("AAA", "BBB", "CCC"):
+        close = 100 * np.cumprod(1 + rng.normal(0.0005, 0.01, len(dates)))
+        pd.DataFrame({"Close": close}, index=dates).to_csv(tmp_path / f"{symbol}.csv")
+
+    tool = PortfolioRiskTool()
+    tool.data_dir = tmp_path
+    return tool
+
+
+@pytest.mark.parametrize("rebalance", [False, True])
+def test_batch_matches_single_execute(tool, rebalance):
+    """Each batch entry equals the execute() result for that portfolio"""
+    portfolios = [
+        [{"symbol": "AAA", "weight": 0.6}, {"symbol": "BBB", "weight": 0.4}],
+        [{"symbol": "CCC", "weight": 0.3}, {"symbol": "BBB", "weight": 0.7}],
+        [{"symbol": "AAA", "weight": 1.0}],
+    ]
+
+    batch = asyncio.run(tool.execute_batch({"portfolios": portfolios, "rebalance": rebalance}))
+
+    assert len(batch["results"]) == len(portfolios)
+    for portfolio, result in zip(portfolios, batch["results"]):
+        single = asyncio.run(tool.execute({"portfolio": portfolio, "rebalance": rebalance}))
+        assert "error" not in single
+        assert result == single
+
+
+def test_execute_dispatches_portfolios_to_batch(tool):
+    """execute() with a "portfolios" list runs the batch analysis"""
+    portfolios = [[{"symbol": "AAA", "weight": 0.5}, {"symbol": "CCC", "weight": 0.5}]]
+
+    assert asyncio.run(tool.execute({"portfolios": portfolios})) == \
+        asyncio.run(tool.execute_batch({"portfolios": portfolios}))
+
+
+def test_batch_isolates_bad_portfolios(tool):
+    """Missing data and duplicate symbols only fail their own portfolio"""
+    good = [{"symbol": "AAA", "weight": 1.0}]
+    batch = asyncio.run(tool.execute_batch({"portfolios": [
+        good,
+        [{"symbol": "NOPE", "weight": 1.0}],
+        [{"symbol": "AAA", "weight": 0.5}, {"symbol": "aaa", "weight": 0.5}],
+        [{"symbol": "BBB", "weight": 0.5}, {"symbol": "CCC", "weight": 0.4}],
+    ]}))
+
+    results = batch["results"]
+    assert results[0] == asyncio.run(tool.execute({"portfolio": good}))
+    assert results[1] == {"error": "Data not available for: NOPE"}
+    assert results[2] == {"error": "Duplicate symbols in portfolio: AAA"}
+    assert results[3]["error"].startswith("Weights must sum to 1.0")
+
+
+def test_batch_reuses_universe_covariance(tool):
+    """A repeated batch over the same universe hits the covariance cache"""
+    portfolios = [[{"symbol": "AAA", "weight": 0.5}, {"symbol": "BBB", "weight": 0.5}]]
+
+    first = asyncio.run(tool.execute_batch({"portfolios": portfolios}))
+    hits = _universe_moments.cache_info().hits
+    second = asyncio.run(tool.execute_batch({"portfolios": portfolios}))
+
+    assert _universe_moments.cache_info().hits == hits + 1
+    assert second == first
+
+
+def test_max_drawdown_kernel_matches_numpy():
+    """The loop kernel (numba's input) agrees with the NumPy expression"""
+    returns = np.random.default_rng(5).normal(0.0003, 0.02, 4096)
+
+    cumulative = np.cumprod(1 + returns)
+    running_max = np.maximum.accumulate(cumulative)
+    expected = ((cumulative - running_max) / running_max).min()
+
+    assert _max_drawdown_loop(returns) == pytest.approx(expected, rel=1e-12)
+    assert _max_drawdown(returns) == pytest.approx(expected, rel=1e-12)
@@ -0,0 +1,88 @@
+"""
+Tests for the tail risk EVT analysis
+
+Checks the GPD maximum likelihood fit against scipy, the extreme VaR
+quantiles derived from it, and the fused loss statistics kernel.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import stats
+
+# Add the spoke root so ``app`` resolves to the Risk spoke package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.tools import tail_risk
+from app.tools.tail_risk import TailRiskTool, _fit_gpd_mle, _loss_stats, _loss_stats_loop
+
+
+def _gpd_loglik(sample: np.ndarray, xi: float, beta: float) -> float:
+    return float(stats.genpareto.logpdf(sample, xi, scale=beta).sum())
+
+
+@pytest.mark.parametrize("true_xi", [0.3, 0.1, -0.2])
+def test_gpd_mle_matches_scipy(true_xi):
+    """Grimshaw's profile MLE agrees with scipy's numerical fit"""
+    sample = stats.genpareto.rvs(
+        true_xi, scale=0.01, size=500, random_state=np.random.default_rng(7)
+    )
+
+    xi, beta = _fit_gpd_mle(sample)
+    ref_xi, _, ref_beta = stats.genpareto.fit(sample, floc=0)
+
+    assert xi == pytest.approx(ref_xi, abs=1e-3)
+    assert beta == pytest.approx(ref_beta, rel=1e-3)
+    # The exact root can only match or beat scipy's optimizer
+    assert _gpd_loglik(sample, xi, beta) >= _gpd_loglik(sample, ref_xi, ref_beta) - 1e-6
+
+
+def test_gpd_mle_rejects_degenerate_exceedances():
+    """No valid fit for all-zero exceedances, so callers fall back to moments"""
+    assert _fit_gpd_mle(np.zeros(20)) is None
+
+
+def test_extreme_var_quantiles_above_threshold():
+    """99% / 99.9% VaR are the GPD tail quantiles and increase past the threshold"""
+    rng = np.random.default_rng(11)
+    losses = stats.t.rvs(3, scale=0.01, size=1000, random_state=rng)
+    sorted_losses = np.sort(losses)
+
+    result = TailRiskTool()._extreme_value_analysis(losses, sorted_losses, 0.95)
+
+    assert result["fit_method"] == "maximum_likelihood"
+    threshold = result["threshold"]
+    var_99 = result["extreme_var"]["99_percent"]
+    var_999 = result["extreme_var"]["99_9_percent"]
+    assert threshold < var_99 < var_999
+
+    # Same values from the GPD percent point function:
+    # VaR_q = u + F^-1(1 - q / P(X > u))
+    u = np.percentile(losses, 95)
+    exceedances = losses[losses > u] - u
+    xi, beta = _fit_gpd_mle(exceedances)
+    prob_exceed = len(exceedances) / len(losses)
+    for confidence, reported in ((0.99, var_99), (0.999, var_999)):
+        expected = u + stats.genpareto.ppf(1 - (1 - confidence) / prob_exceed, xi, scale=beta)
+        assert reported == pytest.approx(expected * 100, abs=1e-4)
+
+
+@pytest.mark.parametrize("seed", [3, 4])
+def test_loss_stats_kernel_matches_numpy(seed, monkeypatch):
+    """The fused loop (numba's input) agrees with the NumPy branch of _loss_stats"""
+    losses = stats.t.rvs(4, scale=0.01, size=5000, random_state=np.random.default_rng(seed))
+
+    fused = _loss_stats_loop(losses)
+    if tail_risk.NUMBA_AVAILABLE:
+        assert _loss_stats(losses) == pytest.approx(fused, rel=1e-12)
+    monkeypatch.setattr(tail_risk, "NUMBA_AVAILABLE", False)
+    reference = _loss_stats(losses)
+
+    mean_loss, std_loss, count_3, count_4, count_5, max_loss = fused
+    assert mean_loss == pytest.approx(reference[0], rel=1e-12)
+    assert std_loss == pytest.approx(reference[1], rel=1e-12)
+    assert (count_3, count_4, count_5) == tuple(int(c) for c in reference[2:5])
+    assert count_3 > count_4 > count_5 > 0
+    assert max_loss == reference[5]
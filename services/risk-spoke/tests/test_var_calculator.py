@@ -0,0 +1,130 @@
+"""
+Tests for the VaR calculator
+
+Checks the hand-ported statistics against NumPy/scipy, the historical tail
+heap kernel, and the Monte Carlo VaR against the analytic normal figures.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import stats
+
+# Add the spoke root so ``app`` resolves to the Risk spoke package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.tools import var_calculator
+from app.tools.var_calculator import (
+    MC_BUFFER_SIZE, MC_RISK_PERCENTILES, NUMBA_MAX_TAIL_SIZE, VaRCalculatorTool,
+    _historical_tail, _historical_tail_loop, _lower_tail_statistics, _normality_pvalue
+)
+
+
+@pytest.mark.parametrize("df", [3, 5, 30])
+def test_normality_pvalue_matches_scipy(df):
+    """The ported omnibus test equals scipy.stats.normaltest"""
+    returns = stats.t.rvs(df, scale=0.01, size=252, random_state=np.random.default_rng(df))
+
+    assert _normality_pvalue(returns, returns.mean()) == pytest.approx(
+        stats.normaltest(returns).pvalue, rel=1e-9, abs=1e-300
+    )
+
+
+@pytest.mark.parametrize("index", [0, 1, 50, 500, 999])
+def test_lower_tail_statistics_match_sort(index):
+    """VaR, CVaR and percentiles equal np.sort / np.percentile"""
+    scenarios = np.random.default_rng(index).normal(0.0005, 0.02, 1000)
+    ordered = np.sort(scenarios)
+
+    var_return, cvar_return, percentiles = _lower_tail_statistics(
+        scenarios, index, MC_RISK_PERCENTILES
+    )
+
+    assert var_return == ordered[index]
+    expected_cvar = ordered[:index].mean() if index > 0 else ordered[0]
+    assert cvar_return == pytest.approx(expected_cvar, rel=1e-12)
+    np.testing.assert_allclose(
+        percentiles, np.percentile(scenarios, MC_RISK_PERCENTILES), rtol=1e-12
+    )
+
+
+@pytest.mark.parametrize("index", range(NUMBA_MAX_TAIL_SIZE + 1))
+def test_historical_tail_heap_matches_partition(index):
+    """The heap kernel (numba's input) selects the same tail as np.partition"""
+    rng = np.random.default_rng(index)
+    # Rounded returns, so ties across the VaR boundary are exercised too
+    returns = np.round(rng.standard_t(4, 252) * 0.01, 3)
+
+    partitioned = np.partition(returns, index)
+    expected_var, expected_sum = partitioned[index], partitioned[:index].sum()
+
+    var_return, tail_sum = _historical_tail_loop(returns, index)
+    assert var_return == expected_var
+    assert tail_sum == pytest.approx(expected_sum, rel=1e-12, abs=1e-15)
+    if var_calculator.NUMBA_AVAILABLE:
+        assert _historical_tail(returns, index) == pytest.approx((var_return, tail_sum), rel=1e-12)
+
+
+def test_monte_carlo_buffer_stays_bounded():
+    """Large runs use a per-call buffer; the kept one never grows"""
+    tool = VaRCalculatorTool()
+    buffer = tool._mc_buffer
+
+    default = tool._calculate_monte_carlo_var(0.0005, 0.02, 0.95, 1, 10000, 10000)
+    tool._calculate_monte_carlo_var(0.0005, 0.02, 0.95, 1, 10000, 4 * MC_BUFFER_SIZE + 1)
+
+    assert tool._mc_buffer is buffer
+    assert tool._mc_buffer.size == MC_BUFFER_SIZE
+    # A large run in between does not disturb later calls
+    assert tool._calculate_monte_carlo_var(0.0005, 0.02, 0.95, 1, 10000, 10000) == default
+    assert np.isfinite(default["var_usd"])
+
+
+@pytest.mark.parametrize("confidence, horizon", [(0.95, 1), (0.99, 1), (0.95, 10)])
+def test_monte_carlo_var_matches_normal_quantiles(confidence, horizon):
+    """Stratified antithetic draws reproduce the analytic normal VaR and CVaR"""
+    mean_return, std_return = 0.0005, 0.02
+    result = VaRCalculatorTool()._calculate_monte_carlo_var(
+        mean_return, std_return, confidence, horizon, 10000, 10000
+    )
+
+    scale = np.sqrt(horizon)
+    z = stats.norm.ppf(1 - confidence)
+    expected_var = (mean_return + std_return * z) * scale
+    expected_cvar = (mean_return - std_return * stats.norm.pdf(z) / (1 - confidence)) * scale
+    assert result["var_percent"] / 100 == pytest.approx(expected_var, rel=1e-3)
+    assert result["cvar_percent"] / 100 == pytest.approx(expected_cvar, rel=2e-3)
+
+    expected_percentiles = 10000 * np.abs(
+        (mean_return + std_return * stats.norm.ppf(MC_RISK_PERCENTILES / 100)) * scale
+    )
+    np.testing.assert_allclose(
+        list(result["risk_percentiles"].values()), expected_percentiles, rtol=1e-2
+    )
+
+
+def test_monte_carlo_var_pinned_figures():
+    """The seeded sampler keeps reporting the same figures"""
+    result = VaRCalculatorTool()._calculate_monte_carlo_var(0.0005, 0.02, 0.95, 1, 10000, 10000)
+
+    assert result["var_percent"] == -3.2392
+    assert result["var_usd"] == 323.92
+    assert result["cvar_percent"] == -4.0761
+    assert result["cvar_usd"] == 407.61
+    assert result["risk_percentiles"] == {
+        "95% confidence": 323.93,
+        "99% confidence": 460.21,
+        "99.9% confidence": 609.42
+    }
+
+
+def test_monte_carlo_cvar_defined_at_zero_index():
+    """With fewer scenarios than the tail needs, CVaR falls back to the VaR"""
+    # int((1 - 0.95) * 10) == 0, so no scenario lies strictly below the VaR
+    result = VaRCalculatorTool()._calculate_monte_carlo_var(0.0005, 0.02, 0.95, 1, 10000, 10)
+
+    assert np.isfinite(result["cvar_usd"])
+    assert result["cvar_usd"] == result["var_usd"]
+    assert result["cvar_percent"] == result["var_percent"]
@@ -4,9 +4,14 @@ Tests Market (13), Risk (8), and Portfolio (8) spoke tools
 """
 
 import asyncio
+import hashlib
 import json
+import os
 import sys
+import time
+import traceback
 from pathlib import Path
+from typing import Tuple
 
 # Add hub-server to path
 sys.path.insert(0, str(Path(__file__).parent / "services" / "hub-server"))
@@ -15,55 +20,180 @@ from mcp.server.stdio import stdio_server
 from mcp import types
 import mcp_server_integrated
 
+# Optional fast JSON decoder for tool responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Opt-in disk cache of successful responses, so repeated local runs don't
+# re-fetch the same upstream data. Leave unset in CI to always hit the tools.
+USE_CACHE = os.getenv("FINHUB_TEST_USE_CACHE") == "1"
+CACHE_TTL_SECONDS = 3600
+_CACHE_DIR = Path(__file__).parent / ".test_cache"
+
+
+def _cache_path(tool_name: str, arguments: dict) -> Path:
+    """Cache file for a (tool, canonical args) pair"""
+    key = hashlib.md5(
+        (tool_name + json.dumps(arguments, sort_keys=True)).encode()
+    ).hexdigest()
+    return _CACHE_DIR / f"{key}.json"
+
+
+def _read_cached(path: Path):
+    """Return the cached response text if present and fresh, else None"""
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_TTL_SECONDS:
+            return path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+    return None
+
+
+def _loads(text: str):
+    """Decode a tool response, with orjson when available"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN from the stdlib encoder fallback; json accepts it
+    return json.loads(text)
+
+
+def _preview(data, max_lines: int = 10) -> str:
+    """
+    First lines of the pretty-printed result.
+
+    Encodes incrementally and stops once max_lines are complete, so large
+    dashboard payloads are never serialized in full.
+    """
+    chunks = []
+    newlines = 0
+    truncated = False
+    for chunk in json.JSONEncoder(indent=2).iterencode(data):
+        chunks.append(chunk)
+        newlines += chunk.count('\n')
+        if newlines >= max_lines:
+            truncated = True
+            break
+
+    lines = ''.join(chunks).split('\n')[:max_lines]
+    if truncated:
+        lines.append("... (truncated)")
+    return '\n'.join(lines)
+
 
 async def test_tool(tool_name: str, arguments: dict, description: str):
-    """Test a single tool and return results"""
-    print(f"\n{'='*80}")
-    print(f"Testing: {description}")
-    print(f"Tool: {tool_name}")
-    print(f"Arguments: {json.dumps(arguments, indent=2)}")
-    print(f"{'='*80}")
+    """Test a single tool; returns (passed, report) so concurrent runs print in order"""
+    report = [
+        f"\n{'='*80}",
+        f"Testing: {description}",
+        f"Tool: {tool_name}",
+        f"Arguments: {json.dumps(arguments, indent=2)}",
+        f"{'='*80}",
+    ]
 
     try:
         # Call tool
-        import time
-        start = time.time()
-
-        result = await mcp_server_integrated.handle_call_tool(
-            tool_name, arguments
-        )
-
-        elapsed = time.time() - start
-
-        # Check result - handle_call_tool returns list of TextContent objects
-        if isinstance(result, list) and len(result) > 0:
-            content = result[0]
-            if hasattr(content, 'text'):
-                data = json.loads(content.text)
-
-                if 'error' in data:
-                    print(f"[FAIL] ({elapsed:.1f}s): {data['error']}")
-                    return False
-                else:
-                    print(f"[PASS] ({elapsed:.1f}s)")
-                    # Print first few lines of result
-                    result_str = json.dumps(data, indent=2)
-                    lines = result_str.split('\n')
-                    preview = '\n'.join(lines[:10])
-                    if len(lines) > 10:
-                        preview += f"\n... ({len(lines)-10} more lines)"
-                    print(f"Result preview:\n{preview}")
-                    return True
-
-        print(f"[WARN] UNEXPECTED RESPONSE ({elapsed:.1f}s)")
-        print(f"Result: {result}")
-        return False
+        start = time.perf_counter()
+
+        cache_path = _cache_path(tool_name, arguments) if USE_CACHE else None
+        text = _read_cached(cache_path) if cache_path else None
+        cached = text is not None
+
+        if not cached:
+            result = await mcp_server_integrated.handle_call_tool(
+                tool_name, arguments
+            )
+            # handle_call_tool returns list of TextContent objects
+            if isinstance(result, list) and len(result) > 0 and hasattr(result[0], 'text'):
+                text = result[0].text
+
+        elapsed = time.perf_counter() - start
+        source = ", cached" if cached else ""
+
+        # Check result
+        if text is not None:
+            data = _loads(text)
+
+            if 'error' in data:
+                report.append(f"[FAIL] ({elapsed:.1f}s{source}): {data['error']}")
+                return False, "\n".join(report)
+            else:
+                if cache_path and not cached:
+                    _CACHE_DIR.mkdir(exist_ok=True)
+                    cache_path.write_text(text, encoding="utf-8")
+                report.append(f"[PASS] ({elapsed:.1f}s{source})")
+                report.append(f"Result preview:\n{_preview(data)}")
+                return True, "\n".join(report)
+
+        report.append(f"[WARN] UNEXPECTED RESPONSE ({elapsed:.1f}s)")
+        report.append(f"Result: {result}")
+        return False, "\n".join(report)
 
     except Exception as e:
-        print(f"[ERROR] EXCEPTION: {type(e).__name__}: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        report.append(f"[ERROR] EXCEPTION: {type(e).__name__}: {e}")
+        # Innermost frames only; the full stack is mostly hub dispatch
+        tb = traceback.format_exception(type(e), e, e.__traceback__, limit=-3)
+        report.append("".join(tb).rstrip())
+        return False, "\n".join(report)
+
+
+async def run_spoke_tests(tests) -> int:
+    """
+    Run one spoke's tests concurrently so their network waits overlap.
+
+    Reports are printed in test order once all have finished; returns the
+    number of tests that passed.
+    """
+    outcomes = await asyncio.gather(
+        *(test_tool(tool_name, args, desc) for tool_name, args, desc in tests)
+    )
+    for _, report in outcomes:
+        print(report)
+    return sum(passed for passed, _ in outcomes)
+
+
+# Test manifests: (tool name, arguments, description) per spoke
+MARKET_TESTS: Tuple[Tuple[str, dict, str], ...] = (
+    ("stock_quote", {"symbol": "AAPL"}, "1/13: Stock Quote"),
+    ("crypto_price", {"symbol": "BTC"}, "2/13: Crypto Price"),
+    ("financial_news", {"query": "AI stocks", "limit": 5}, "3/13: Financial News"),
+    ("economic_indicator", {"series_id": "GDP"}, "4/13: Economic Indicator"),
+    ("market_overview", {}, "5/13: Market Overview"),
+    ("api_status", {}, "6/13: API Status"),
+    ("technical_analysis", {"symbol": "AAPL", "indicators": ["rsi", "macd"], "period": 30}, "7/13: Technical Analysis"),
+    ("pattern_recognition", {"symbol": "AAPL", "period": 60}, "8/13: Pattern Recognition"),
+    ("anomaly_detection", {"symbol": "AAPL", "period": 30, "sensitivity": "medium"}, "9/13: Anomaly Detection"),
+    ("stock_comparison", {"symbols": ["AAPL", "MSFT"], "period": 30}, "10/13: Stock Comparison"),
+    ("sentiment_analysis", {"symbol": "AAPL", "days": 7}, "11/13: Sentiment Analysis"),
+    ("alert_system", {"symbol": "AAPL", "alert_type": "price_target"}, "12/13: Alert System"),
+    ("unified_market_data", {"query_type": "stock_quote", "symbol": "AAPL"}, "13/13: Unified Market Data"),
+)
+
+RISK_TESTS: Tuple[Tuple[str, dict, str], ...] = (
+    ("risk_calculate_var", {"symbol": "AAPL", "method": "historical"}, "1/8: VaR Calculator"),
+    ("risk_calculate_metrics", {"symbol": "AAPL", "period": 252}, "2/8: Risk Metrics"),
+    ("risk_analyze_portfolio", {"portfolio": [{"symbol": "AAPL", "weight": 0.5}, {"symbol": "MSFT", "weight": 0.5}]}, "3/8: Portfolio Risk"),
+    ("risk_stress_test", {"portfolio": [{"symbol": "AAPL", "weight": 1.0}]}, "4/8: Stress Testing"),
+    ("risk_analyze_tail_risk", {"symbol": "AAPL", "period": 252}, "5/8: Tail Risk Analysis"),
+    ("risk_calculate_greeks", {"symbol": "AAPL", "option_type": "call"}, "6/8: Greeks Calculator"),
+    ("risk_check_compliance", {"entity_name": "Test Corp"}, "7/8: Compliance Check"),
+    ("risk_generate_dashboard", {"symbol": "AAPL"}, "8/8: Risk Dashboard"),
+)
+
+PORTFOLIO_TESTS: Tuple[Tuple[str, dict, str], ...] = (
+    ("portfolio_optimize", {"tickers": ["AAPL", "MSFT", "GOOGL"], "method": "max_sharpe"}, "1/8: Portfolio Optimizer"),
+    ("portfolio_rebalance", {"current_holdings": {"AAPL": 1000, "MSFT": 500}, "target_allocation": {"AAPL": 0.6, "MSFT": 0.4}}, "2/8: Portfolio Rebalancer"),
+    ("portfolio_analyze_performance", {"portfolio": [{"symbol": "AAPL", "shares": 10}]}, "3/8: Performance Analyzer"),
+    ("portfolio_backtest", {"strategy": "momentum", "start_date": "2023-01-01", "end_date": "2024-01-01"}, "4/8: Backtester"),
+    ("portfolio_analyze_factors", {"portfolio": [{"symbol": "AAPL", "weight": 0.5}]}, "5/8: Factor Analyzer"),
+    ("portfolio_allocate_assets", {"risk_tolerance": "moderate", "investment_horizon": 10}, "6/8: Asset Allocator"),
+    ("portfolio_optimize_tax", {"portfolio": [{"symbol": "AAPL", "shares": 100, "cost_basis": 150}]}, "7/8: Tax Optimizer"),
+    ("portfolio_generate_dashboard", {"portfolio": [{"symbol": "AAPL", "shares": 10}]}, "8/8: Portfolio Dashboard"),
+)
 
 
 async def main():
@@ -94,28 +224,9 @@ async def main():
     print("MARKET SPOKE TESTS (13 tools)")
     print("="*80)
 
-    market_tests = [
-        ("stock_quote", {"symbol": "AAPL"}, "1/13: Stock Quote"),
-        ("crypto_price", {"symbol": "BTC"}, "2/13: Crypto Price"),
-        ("financial_news", {"query": "AI stocks", "limit": 5}, "3/13: Financial News"),
-        ("economic_indicator", {"series_id": "GDP"}, "4/13: Economic Indicator"),
-        ("market_overview", {}, "5/13: Market Overview"),
-        ("api_status", {}, "6/13: API Status"),
-        ("technical_analysis", {"symbol": "AAPL", "indicators": ["rsi", "macd"], "period": 30}, "7/13: Technical Analysis"),
-        ("pattern_recognition", {"symbol": "AAPL", "period": 60}, "8/13: Pattern Recognition"),
-        ("anomaly_detection", {"symbol": "AAPL", "period": 30, "sensitivity": "medium"}, "9/13: Anomaly Detection"),
-        ("stock_comparison", {"symbols": ["AAPL", "MSFT"], "period": 30}, "10/13: Stock Comparison"),
-        ("sentiment_analysis", {"symbol": "AAPL", "days": 7}, "11/13: Sentiment Analysis"),
-        ("alert_system", {"symbol": "AAPL", "alert_type": "price_target"}, "12/13: Alert System"),
-        ("unified_market_data", {"query_type": "stock_quote", "symbol": "AAPL"}, "13/13: Unified Market Data"),
-    ]
-
-    for tool_name, args, desc in market_tests:
-        success = await test_tool(tool_name, args, desc)
-        if success:
-            results['market']['passed'] += 1
-        else:
-            results['market']['failed'] += 1
+    passed = await run_spoke_tests(MARKET_TESTS)
+    results['market']['passed'] += passed
+    results['market']['failed'] += len(MARKET_TESTS) - passed
 
     # ========================================================================
     # RISK SPOKE TESTS (8 tools)
@@ -125,23 +236,9 @@ async def main():
     print("RISK SPOKE TESTS (8 tools)")
     print("="*80)
 
-    risk_tests = [
-        ("risk_calculate_var", {"symbol": "AAPL", "method": "historical"}, "1/8: VaR Calculator"),
-        ("risk_calculate_metrics", {"symbol": "AAPL", "period": 252}, "2/8: Risk Metrics"),
-        ("risk_analyze_portfolio", {"portfolio": [{"symbol": "AAPL", "weight": 0.5}, {"symbol": "MSFT", "weight": 0.5}]}, "3/8: Portfolio Risk"),
-        ("risk_stress_test", {"portfolio": [{"symbol": "AAPL", "weight": 1.0}]}, "4/8: Stress Testing"),
-        ("risk_analyze_tail_risk", {"symbol": "AAPL", "period": 252}, "5/8: Tail Risk Analysis"),
-        ("risk_calculate_greeks", {"symbol": "AAPL", "option_type": "call"}, "6/8: Greeks Calculator"),
-        ("risk_check_compliance", {"entity_name": "Test Corp"}, "7/8: Compliance Check"),
-        ("risk_generate_dashboard", {"symbol": "AAPL"}, "8/8: Risk Dashboard"),
-    ]
-
-    for tool_name, args, desc in risk_tests:
-        success = await test_tool(tool_name, args, desc)
-        if success:
-            results['risk']['passed'] += 1
-        else:
-            results['risk']['failed'] += 1
+    passed = await run_spoke_tests(RISK_TESTS)
+    results['risk']['passed'] += passed
+    results['risk']['failed'] += len(RISK_TESTS) - passed
 
     # ========================================================================
     # PORTFOLIO SPOKE TESTS (8 tools)
@@ -151,23 +248,9 @@ async def main():
     print("PORTFOLIO SPOKE TESTS (8 tools)")
     print("="*80)
 
-    portfolio_tests = [
-        ("portfolio_optimize", {"tickers": ["AAPL", "MSFT", "GOOGL"], "method": "max_sharpe"}, "1/8: Portfolio Optimizer"),
-        ("portfolio_rebalance", {"current_holdings": {"AAPL": 1000, "MSFT": 500}, "target_allocation": {"AAPL": 0.6, "MSFT": 0.4}}, "2/8: Portfolio Rebalancer"),
-        ("portfolio_analyze_performance", {"portfolio": [{"symbol": "AAPL", "shares": 10}]}, "3/8: Performance Analyzer"),
-        ("portfolio_backtest", {"strategy": "momentum", "start_date": "2023-01-01", "end_date": "2024-01-01"}, "4/8: Backtester"),
-        ("portfolio_analyze_factors", {"portfolio": [{"symbol": "AAPL", "weight": 0.5}]}, "5/8: Factor Analyzer"),
-        ("portfolio_allocate_assets", {"risk_tolerance": "moderate", "investment_horizon": 10}, "6/8: Asset Allocator"),
-        ("portfolio_optimize_tax", {"portfolio": [{"symbol": "AAPL", "shares": 100, "cost_basis": 150}]}, "7/8: Tax Optimizer"),
-        ("portfolio_generate_dashboard", {"portfolio": [{"symbol": "AAPL", "shares": 10}]}, "8/8: Portfolio Dashboard"),
-    ]
-
-    for tool_name, args, desc in portfolio_tests:
-        success = await test_tool(tool_name, args, desc)
-        if success:
-            results['portfolio']['passed'] += 1
-        else:
-            results['portfolio']['failed'] += 1
+    passed = await run_spoke_tests(PORTFOLIO_TESTS)
+    results['portfolio']['passed'] += passed
+    results['portfolio']['failed'] += len(PORTFOLIO_TESTS) - passed
 
     # ========================================================================
     # SUMMARY
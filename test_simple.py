@@ -1,19 +1,28 @@
 """
 Simple direct test of each spoke's tools
 Tests without MCP server overhead
+
+Each spoke runs in its own interpreter (``--spoke <name>``) so the spokes'
+``app`` packages never collide and all four run concurrently.
 """
 
 import asyncio
+import json
 import sys
 from pathlib import Path
 
 # Test results
 results = {"hub": 0, "market": 0, "risk": 0, "portfolio": 0}
 
+def _add_service_path(service: str):
+    """Put one service directory at the front of sys.path"""
+    sys.path.insert(0, str(Path(__file__).parent / "services" / service))
+
+
 async def test_market():
     """Test Market spoke tools directly"""
     print("\n=== Testing Market Spoke ===")
-    sys.path.insert(0, str(Path(__file__).parent / "services" / "market-spoke"))
+    _add_service_path("market-spoke")
 
     try:
         from app.tools.unified_market_data import UnifiedMarketDataTool
@@ -33,21 +42,7 @@ async def test_market():
 async def test_risk():
     """Test Risk spoke tools directly"""
     print("\n=== Testing Risk Spoke ===")
-
-    # Clean sys.modules - remove all app.* modules from cache
-    modules_to_remove = [k for k in sys.modules.keys() if k.startswith('app')]
-    for module_name in modules_to_remove:
-        del sys.modules[module_name]
-
-    # Clean sys.path
-    for p in list(sys.path):
-        if "market-spoke" in p or "portfolio-spoke" in p:
-            sys.path.remove(p)
-
-    risk_spoke_path = str(Path(__file__).parent / "services" / "risk-spoke")
-    if risk_spoke_path in sys.path:
-        sys.path.remove(risk_spoke_path)
-    sys.path.insert(0, risk_spoke_path)
+    _add_service_path("risk-spoke")
 
     risk_tools = [
         ("var_calculator", "VaRCalculatorTool", {"symbol": "AAPL", "method": "historical"}),
@@ -60,19 +55,23 @@ async def test_risk():
         ("risk_dashboard", "RiskDashboardTool", {"symbol": "AAPL"}),
     ]
 
-    for module_name, class_name, args in risk_tools:
+    async def run_risk_tool(module_name, class_name, args):
         try:
             module = __import__(f"app.tools.{module_name}", fromlist=[class_name])
             tool_class = getattr(module, class_name)
             tool = tool_class()
             result = await tool.execute(args)
             if "error" not in result:
-                print(f"[PASS] {module_name}")
-                results["risk"] += 1
-            else:
-                print(f"[FAIL] {module_name}: {result['error']}")
+                return True, f"[PASS] {module_name}"
+            return False, f"[FAIL] {module_name}: {result['error']}"
         except Exception as e:
-            print(f"[ERROR] {module_name}: {type(e).__name__}: {e}")
+            return False, f"[ERROR] {module_name}: {type(e).__name__}: {e}"
+
+    # Run the tools concurrently, then report in the declared order
+    outcomes = await asyncio.gather(*(run_risk_tool(*spec) for spec in risk_tools))
+    for passed, line in outcomes:
+        print(line)
+        results["risk"] += passed
 
     print(f"\nRisk Spoke: {results['risk']}/8 tools passed")
 
@@ -80,21 +79,7 @@ async def test_risk():
 async def test_portfolio():
     """Test Portfolio spoke tools directly"""
     print("\n=== Testing Portfolio Spoke ===")
-
-    # Clean sys.modules - remove all app.* modules from cache
-    modules_to_remove = [k for k in sys.modules.keys() if k.startswith('app')]
-    for module_name in modules_to_remove:
-        del sys.modules[module_name]
-
-    # Clean sys.path
-    for p in list(sys.path):
-        if "risk-spoke" in p or "market-spoke" in p:
-            sys.path.remove(p)
-
-    portfolio_spoke_path = str(Path(__file__).parent / "services" / "portfolio-spoke")
-    if portfolio_spoke_path in sys.path:
-        sys.path.remove(portfolio_spoke_path)
-    sys.path.insert(0, portfolio_spoke_path)
+    _add_service_path("portfolio-spoke")
 
     portfolio_tools = [
         ("portfolio_optimizer", "portfolio_optimizer", {"tickers": ["AAPL", "MSFT"], "method": "max_sharpe"}),
@@ -123,18 +108,22 @@ async def test_portfolio():
         }),
     ]
 
-    for module_name, func_name, args in portfolio_tools:
+    async def run_portfolio_tool(module_name, func_name, args):
         try:
             module = __import__(f"app.tools.{module_name}", fromlist=[func_name])
             func = getattr(module, func_name)
             result = await func(**args)
             if "error" not in result:
-                print(f"[PASS] {module_name}")
-                results["portfolio"] += 1
-            else:
-                print(f"[FAIL] {module_name}: {result.get('error', result)}")
+                return True, f"[PASS] {module_name}"
+            return False, f"[FAIL] {module_name}: {result.get('error', result)}"
         except Exception as e:
-            print(f"[ERROR] {module_name}: {type(e).__name__}: {str(e)[:100]}")
+            return False, f"[ERROR] {module_name}: {type(e).__name__}: {str(e)[:100]}"
+
+    # Run the tools concurrently, then report in the declared order
+    outcomes = await asyncio.gather(*(run_portfolio_tool(*spec) for spec in portfolio_tools))
+    for passed, line in outcomes:
+        print(line)
+        results["portfolio"] += passed
 
     print(f"\nPortfolio Spoke: {results['portfolio']}/8 tools passed")
 
@@ -143,18 +132,8 @@ async def test_hub():
     """Test Hub management tools"""
     print("\n=== Testing Hub Management ===")
 
-    # Clean sys.modules
-    modules_to_remove = [k for k in sys.modules.keys() if k.startswith('app')]
-    for module_name in modules_to_remove:
-        del sys.modules[module_name]
-
-    # Clean sys.path
-    for p in list(sys.path):
-        if any(spoke in p for spoke in ["market-spoke", "risk-spoke", "portfolio-spoke"]):
-            sys.path.remove(p)
-
     # Import hub server
-    sys.path.insert(0, str(Path(__file__).parent / "services" / "hub-server"))
+    _add_service_path("hub-server")
     import mcp_server_integrated
 
     hub_tests = [
@@ -165,22 +144,19 @@ async def test_hub():
         ("hub_unregister_spoke", {"spoke_name": "test-spoke"}),
     ]
 
+    # One shared instance, so register/unregister act on the same registry
+    hub = mcp_server_integrated.hub_tools
+    dispatch = {
+        "hub_status": hub.hub_status,
+        "hub_list_all_tools": hub.list_all_tools,
+        "hub_search_tools": hub.search_tools,
+        "hub_register_spoke": hub.register_spoke,
+        "hub_unregister_spoke": hub.unregister_spoke,
+    }
+
     for tool_name, args in hub_tests:
         try:
-            # Get hub instance
-            hub = mcp_server_integrated.HubManager()
-
-            # Call the appropriate method
-            if tool_name == "hub_status":
-                result = await hub.hub_status(args)
-            elif tool_name == "hub_list_all_tools":
-                result = await hub.list_all_tools(args)
-            elif tool_name == "hub_search_tools":
-                result = await hub.search_tools(args)
-            elif tool_name == "hub_register_spoke":
-                result = await hub.register_spoke(args)
-            elif tool_name == "hub_unregister_spoke":
-                result = await hub.unregister_spoke(args)
+            result = await dispatch[tool_name](args)
 
             if "error" not in result:
                 print(f"[PASS] {tool_name}")
@@ -193,15 +169,42 @@ async def test_hub():
     print(f"\nHub Management: {results['hub']}/5 tools passed")
 
 
+SPOKE_TESTS = {
+    "hub": test_hub,
+    "market": test_market,
+    "risk": test_risk,
+    "portfolio": test_portfolio,
+}
+
+
+async def run_spoke_worker(name: str):
+    """Run one spoke's tests in a fresh interpreter; returns (passed, output)"""
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, __file__, "--spoke", name,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    stdout, _ = await proc.communicate()
+    lines = stdout.decode(errors="replace").rstrip("\n").split("\n")
+
+    # The worker's last line is {"passed": N}; anything else means it crashed
+    try:
+        passed = int(json.loads(lines[-1])["passed"])
+        lines = lines[:-1]
+    except (ValueError, KeyError, TypeError):
+        passed = 0
+    return passed, "\n".join(lines)
+
+
 async def main():
     print("="*80)
     print("SIMPLE DIRECT SPOKE TESTS")
     print("="*80)
 
-    await test_hub()
-    await test_market()
-    await test_risk()
-    await test_portfolio()
+    outcomes = await asyncio.gather(*(run_spoke_worker(name) for name in SPOKE_TESTS))
+    for name, (passed, output) in zip(SPOKE_TESTS, outcomes):
+        print(output)
+        results[name] = passed
 
     print("\n" + "="*80)
     print("SUMMARY")
@@ -215,4 +218,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if len(sys.argv) == 3 and sys.argv[1] == "--spoke":
+        spoke = sys.argv[2]
+        asyncio.run(SPOKE_TESTS[spoke]())
+        print(json.dumps({"passed": results[spoke]}))
+    else:
+        asyncio.run(main())